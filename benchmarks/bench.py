@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+# Benchmarks for pluralize() and singularize() in each language.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# Measures the throughput (words/sec) and the latency percentiles (microseconds per call)
+# of each function, for different kinds of words:
+# - early:    words that are inflected by one of the first rules (e.g., irregular plurals),
+# - late:     words that fall through most rules to the default rule,
+# - compound: compound words (e.g., mother-in-law, Bundesverfassungsgericht),
+# - genitive: genitive forms (English),
+# - custom-N: words not in a custom dictionary of N entries.
+# Results are written as JSON with sorted keys, so that runs on different commits can be compared:
+#
+#   python benchmarks/bench.py -o before.json
+#   python benchmarks/bench.py -o after.json
+#   python benchmarks/bench.py --compare before.json after.json
+#
+# With --threads, measures the throughput of each function called from 1, 2, 4, ... threads at once
+# (with and without a shared cache), and the speedup over 1 thread.
+# With the GIL, the speedup is at most 1.0; on a free-threaded build (e.g., python3.13t),
+# it should grow with the number of threads, up to the number of CPUs:
+#
+#   python3.13t benchmarks/bench.py --threads 1,2,4,8 -o threads.json
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import threading
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import grammar.english as en
+import grammar.german as de
+import grammar.dutch as nl
+import grammar.french as fr
+
+WORDS = {
+    (en, "pluralize"): {
+           "early": ["a", "this", "my", "I", "sheep", "fish", "child", "ox"],
+            "late": ["cat", "table", "computer", "elephant", "garden", "window", "government"],
+        "compound": ["mother-in-law", "attorney general", "kitchen knife", "man-of-war"],
+        "genitive": ["dog's", "child's", "boss'", "James's"],
+    },
+    (en, "singularize"): {
+           "early": ["bison", "news", "cookies", "children", "oxen", "geese"],
+            "late": ["cats", "tables", "computers", "elephants", "gardens", "windows"],
+        "compound": ["mothers-in-law", "men-of-war", "passers-by"],
+        "genitive": ["dogs'", "bosses'", "cats'"],
+    },
+    (de, "pluralize"): {
+           "early": [u"katze", u"zeitung", u"hund", u"bahn", u"bad"],
+            "late": [u"auto", u"kino", u"koffein", u"pizza", u"uhu"],
+        "compound": [u"Haustürschlüssel", u"Bundesverfassungsgericht", u"Straßenbahnhaltestelle"],
+    },
+    (de, "singularize"): {
+           "early": [u"katzen", u"zeitungen", u"hunde", u"bahnen", u"bäder"],
+            "late": [u"autos", u"kinos", u"pizzas", u"uhus", u"xyz"],
+        "compound": [u"Haustürschlüssel", u"Bundesverfassungsgerichte", u"Straßenbahnhaltestellen"],
+    },
+    (nl, "pluralize"): {
+           "early": ["dag", "fee", "kind", "been", "stad"],
+            "late": ["raam", "fles", "hand", "boom", "vis"],
+        "compound": ["fietsenmaker", "ziekenhuisbed", "voetbalwedstrijd"],
+    },
+    (nl, "singularize"): {
+           "early": ["steden", "centra", "auto's", "broers"],
+            "late": ["ramen", "flessen", "handen", "bomen", "ogen"],
+        "compound": ["fietsenmakers", "ziekenhuisbedden", "voetbalwedstrijden"],
+    },
+    (fr, "pluralize"): {
+           "early": ["travail", "bleu", "pneu", "vitrail"],
+            "late": ["chaise", "livre", "table", "maison"],
+        "compound": ["arc-en-ciel", "grand-mère", "chef-d'oeuvre"],
+    },
+    (fr, "singularize"): {
+           "early": ["parisiennes", "passantes", "danseuses"],
+            "late": ["chevaux", "studii", "maxima", "bijou"],
+        "compound": ["arc-en-ciel", "grand-mère", "chef-d'oeuvre"],
+    },
+}
+
+CUSTOM = (10, 1000, 100000)
+
+def percentile(a, p):
+    """ Returns the p-th percentile (0-100) of the given sorted list.
+    """
+    return a[min(len(a) - 1, int(round(p / 100.0 * (len(a) - 1))))]
+
+def measure(f, words, n=10000, **kwargs):
+    """ Returns a dict with the throughput and latency of f(word, **kwargs),
+        for n calls (cycling through the given words).
+    """
+    words = (words * (n // len(words) + 1))[:n]
+    # Warm up (e.g., for rules that are compiled when first used).
+    for w in words[:100]:
+        f(w, **kwargs)
+    # Throughput.
+    t = time.perf_counter()
+    for w in words:
+        f(w, **kwargs)
+    t = time.perf_counter() - t
+    # Latency.
+    a = []
+    clock = time.perf_counter_ns
+    for w in words:
+        t0 = clock()
+        f(w, **kwargs)
+        a.append(clock() - t0)
+    a.sort()
+    return {
+        "words_per_second": round(n / t),
+                  "p50_us": round(percentile(a, 50) / 1000.0, 3),
+                  "p90_us": round(percentile(a, 90) / 1000.0, 3),
+                  "p99_us": round(percentile(a, 99) / 1000.0, 3),
+                       "n": n
+    }
+
+def commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+            cwd = os.path.dirname(os.path.abspath(__file__)),
+         stderr = subprocess.DEVNULL).decode("utf-8").strip()
+    except Exception:
+        return None
+
+def run(n=10000, languages=None):
+    """ Returns a dict of "language.function.kind" => measurements.
+    """
+    r = {}
+    for (module, name), kinds in sorted(WORDS.items(), key=lambda x: (x[0][0].__name__, x[0][1])):
+        lang = module.__name__.split(".")[-1]
+        if languages and lang not in languages:
+            continue
+        f = getattr(module, name)
+        for kind, words in sorted(kinds.items()):
+            r["%s.%s.%s" % (lang, name, kind)] = measure(f, words, n)
+        words = kinds["late"]
+        for size in CUSTOM:
+            custom = dict(("custom%i" % i, "custom%i" % i) for i in range(size))
+            r["%s.%s.custom-%i" % (lang, name, size)] = measure(f, words, n, custom=custom)
+    return r
+
+def measure_threads(f, words, threads=1, n=10000):
+    """ Returns a dict with the total throughput of f(word), when each of the given number
+        of threads calls it n times (cycling through the given words).
+    """
+    words = (words * (n // len(words) + 1))[:n]
+    for w in words[:100]:
+        f(w)
+    barrier = threading.Barrier(threads + 1)
+    def run():
+        barrier.wait()
+        for w in words:
+            f(w)
+        barrier.wait()
+    a = [threading.Thread(target=run) for i in range(threads)]
+    for t in a:
+        t.start()
+    barrier.wait()
+    t = time.perf_counter()
+    barrier.wait()
+    t = time.perf_counter() - t
+    for t0 in a:
+        t0.join()
+    return {
+        "words_per_second": round(n * threads / t),
+                 "threads": threads,
+                       "n": n
+    }
+
+def scaling(threads=(1, 2, 4, 8), n=10000, languages=None, cache=10000):
+    """ Returns a dict of "language.function.threads-N" (and "...threads-N-cache") => measurements,
+        with the speedup over 1 thread.
+    """
+    r = {}
+    for (module, name), kinds in sorted(WORDS.items(), key=lambda x: (x[0][0].__name__, x[0][1])):
+        lang = module.__name__.split(".")[-1]
+        if languages and lang not in languages:
+            continue
+        f = getattr(module, name)
+        words = [w for kind, a in sorted(kinds.items()) for w in a]
+        # Each run starts with no cache (or a new one), and the caller's cache is restored after.
+        c = f.cache
+        for size in (0, cache):
+            f.cache_disable()
+            if size:
+                f.cache_enable(size)
+            try:
+                base = None
+                for k in threads:
+                    m = measure_threads(f, words, k, n)
+                    base = base or m["words_per_second"]
+                    m["speedup"] = round(m["words_per_second"] / float(base), 2)
+                    r["%s.%s.threads-%i%s" % (lang, name, k, size and "-cache" or "")] = m
+            finally:
+                f.cache = c
+    return r
+
+def gil():
+    """ Returns False on a free-threaded build of Python with the GIL disabled.
+    """
+    f = getattr(sys, "_is_gil_enabled", None)
+    return f() if f is not None else True
+
+def compare(path1, path2, threshold=10.0):
+    """ Prints the change in words/sec between two JSON files,
+        and returns the number of benchmarks that are slower by more than threshold %.
+    """
+    r1 = json.load(open(path1))["results"]
+    r2 = json.load(open(path2))["results"]
+    slower = 0
+    for k in sorted(set(r1) & set(r2)):
+        a = r1[k]["words_per_second"]
+        b = r2[k]["words_per_second"]
+        d = 100.0 * (b - a) / a
+        flag = ""
+        if d < -threshold:
+            flag = " <<"
+            slower += 1
+        print("%-40s %12i %12i %+8.1f%%%s" % (k, a, b, d, flag))
+    return slower
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmarks pluralize() and singularize().")
+    p.add_argument("-n", type=int, default=10000, help="number of calls per benchmark")
+    p.add_argument("-l", "--language", action="append", help="english, german, dutch or french")
+    p.add_argument("-o", "--output", help="JSON output file (default: stdout)")
+    p.add_argument("--threads", metavar="1,2,4,8",
+        help="measure the thread scaling for the given numbers of threads, instead")
+    p.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+        help="compare two JSON output files")
+    p.add_argument("--threshold", type=float, default=10.0,
+        help="with --compare, exit with status 1 if a benchmark is slower by more than this %%")
+    o = p.parse_args(argv)
+    if o.compare:
+        return compare(o.compare[0], o.compare[1], o.threshold) and 1 or 0
+    r = {
+        "meta": {
+              "commit": commit(),
+              "python": platform.python_version(),
+      "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+                "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "gil": gil(),
+                "cpus": os.cpu_count(),
+        },
+    }
+    if o.threads:
+        r["results"] = scaling([int(k) for k in o.threads.split(",")], o.n, o.language)
+    else:
+        r["results"] = run(o.n, o.language)
+    s = json.dumps(r, indent=2, sort_keys=True)
+    if o.output:
+        with open(o.output, "w") as f:
+            f.write(s + "\n")
+    else:
+        print(s)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Pluralization and singularization of English, German, Dutch and French words.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# The language modules are imported when first used (PEP 562), so that "import grammar" is fast,
+# e.g., in short-lived processes that only need one language:
+#
+#   import grammar
+#   grammar.german.pluralize("Katze") # imports grammar.german
+#
+# The rules in each module are compiled when first used, too.
+
+__all__ = [
+    "english",
+    "german",
+    "dutch",
+    "french",
+    "cache",
+    "parallel",
+    "aio",
+    "server",
+    "instrument",
+    "vectorized",
+    "lexicon",
+    "fst",
+    "cascade",
+    "evaluate",
+    "memory",
+    "tagged",
+    "overrides",
+    "inverse",
+    "normalize",
+    "hooks"
+]
+
+def __getattr__(name):
+    if name in __all__:
+        # Importing a submodule also sets it as an attribute of the package.
+        __import__(__name__ + "." + name)
+        return globals()[name]
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def stats():
+    """ Returns the statistics of the rules used by pluralize() and singularize(),
+        for the languages in which instrumentation is enabled (see grammar.instrument).
+    """
+    from . import instrument
+    return instrument.stats()
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
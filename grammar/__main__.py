@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# Command-line inflection of words in files or standard input, one word (or row) per line.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# Lines are read lazily and inflected in chunks (see grammar.parallel), and results are written
+# as soon as a chunk is done, so memory use is bounded for large files in shell pipelines:
+#
+#   cat words.txt | python -m grammar pluralize -l nl > plurals.txt
+#   python -m grammar singularize -l de -c 2 --workers 8 --cache-size 100000 dump.tsv
+
+import sys
+import argparse
+import fileinput
+import itertools
+
+from .parallel import Inflector, LANGUAGES, PLURALIZE, SINGULARIZE
+
+def parser():
+    p = argparse.ArgumentParser(prog="python -m grammar",
+        description="Pluralizes or singularizes each line in the given files (or standard input).")
+    p.add_argument("op", choices=(PLURALIZE, SINGULARIZE))
+    p.add_argument("files", nargs="*", metavar="FILE",
+        help="input files, or - for standard input (default)")
+    p.add_argument("-l", "--language", default="en",
+        help="%s (default: en)" % ", ".join(sorted(LANGUAGES)))
+    p.add_argument("-c", "--column", type=int, default=0, metavar="N",
+        help="inflect the N-th field of each line (1 = first), instead of the whole line")
+    p.add_argument("-d", "--delimiter", default="\t",
+        help="field delimiter for --column (default: tab)")
+    p.add_argument("-p", "--pos", default=None,
+        help="part-of-speech tag passed to pluralize() or singularize() (default: NN)")
+    p.add_argument("-w", "--workers", type=int, default=1, metavar="N",
+        help="number of worker processes (default: 1)")
+    p.add_argument("--threads", action="store_true",
+        help="use worker threads instead of processes (for free-threaded Python)")
+    p.add_argument("--chunk-size", type=int, default=10000, metavar="N",
+        help="number of lines per chunk (default: 10000)")
+    p.add_argument("--cache-size", type=int, default=0, metavar="N",
+        help="cache the N most recently inflected words (default: 0 = no cache)")
+    p.add_argument("--encoding", default="utf-8")
+    return p
+
+def main(argv=None, stdout=None):
+    o = parser().parse_intermixed_args(argv)
+    stdout = stdout or sys.stdout
+    kwargs = {}
+    if o.pos:
+        kwargs["pos"] = o.pos
+    try:
+        f = Inflector(o.language, o.op,
+               workers = o.workers,
+             chunksize = o.chunk_size,
+                 cache = o.cache_size,
+               threads = o.threads, **kwargs)
+    except ValueError as e:
+        parser().error(str(e))
+    def field(row):
+        if o.column > 0:
+            row = row.split(o.delimiter)
+            return len(row) >= o.column and row[o.column-1] or ""
+        return row
+    def replace(row, w):
+        if o.column > 0:
+            row = row.split(o.delimiter)
+            row[o.column-1] = w
+            return o.delimiter.join(row)
+        return w
+    if hasattr(sys.stdin, "reconfigure"):
+        sys.stdin.reconfigure(encoding=o.encoding)
+    rows = fileinput.input(o.files, openhook=fileinput.hook_encoded(o.encoding))
+    rows = (row.rstrip("\r\n") for row in rows)
+    # The rows are buffered by tee() until the inflection of the row's chunk is done.
+    rows, a = itertools.tee(rows)
+    try:
+        with f:
+            for row, w in zip(rows, f.imap(field(row) for row in a)):
+                # Empty lines (or fields) are left unchanged.
+                stdout.write((field(row) and replace(row, w) or row) + "\n")
+        stdout.flush()
+    except BrokenPipeError:
+        # For example: python -m grammar pluralize words.txt | head
+        sys.stderr.close()
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Inflection in asyncio applications, with micro-batching of concurrent requests.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# In an asyncio service (e.g., aiohttp), calling pluralize() inline blocks the event loop.
+# An AsyncInflector collects the words of concurrent requests for a few milliseconds
+# (or until max_batch words are waiting) and inflects them as one batch with pluralize_many()
+# or singularize_many(), so that each unique word in the batch is inflected only once.
+# With an executor (e.g., a ThreadPoolExecutor), batches are inflected outside the event loop:
+#
+#   from grammar.aio import AsyncInflector
+#   inflector = AsyncInflector("en", "pluralize", max_batch=1000, max_delay=0.002)
+#   async def handler(request):
+#       return await inflector(request.query["word"]) # "children"
+
+import time
+import asyncio
+import functools
+
+from .parallel import function, PLURALIZE
+
+class AsyncInflector(object):
+
+    def __init__(self, lang="en", op=PLURALIZE, max_batch=1000, max_delay=0.002, executor=None, **kwargs):
+        """ Inflects words from concurrent coroutines in batches of at most max_batch words,
+            waiting at most max_delay seconds for a batch to fill up.
+            With an executor (concurrent.futures.Executor), batches are inflected in the executor,
+            otherwise on the event loop.
+            Optional keyword arguments are passed to pluralize() or singularize(), e.g., pos.
+        """
+        self.lang = lang
+        self.op = op
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay
+        self.executor = executor
+        self.kwargs = kwargs
+        self._function = function(lang, op, many=True) # Raises ValueError.
+        self._function1 = function(lang, op)
+        self._pending = [] # [(word, future)]
+        self._timer = None
+        self._tasks = set()
+        self.reset()
+
+    def reset(self):
+        """ Resets the statistics.
+        """
+        self.words = 0
+        self.batches = 0
+        self.seconds = 0.0
+
+    @property
+    def stats(self):
+        """ Returns a dict with the number of words and batches inflected,
+            the mean batch size, and the time spent inflecting.
+        """
+        return {
+                 "words": self.words,
+               "batches": self.batches,
+            "batch_size": self.batches and self.words / self.batches or 0.0,
+               "seconds": self.seconds,
+               "pending": len(self._pending)
+        }
+
+    def __call__(self, word):
+        """ Returns an awaitable for the inflection of the given word.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((word, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush)
+        return future
+
+    inflect = __call__
+
+    async def map(self, words):
+        """ Returns a list with the inflection of each word in the given iterable.
+        """
+        return await asyncio.gather(*[self(w) for w in words])
+
+    def _inflect(self, words):
+        """ Returns a list of (inflection, exception)-tuples for the given list of words.
+        """
+        t = time.perf_counter()
+        try:
+            return [(w, None) for w in self._function(words, **self.kwargs)]
+        except Exception:
+            # Inflect word by word, so that an invalid word (e.g., None) only fails its own request.
+            a = []
+            for w in words:
+                try:
+                    a.append((self._function1(w, **self.kwargs), None))
+                except Exception as e:
+                    a.append((None, e))
+            return a
+        finally:
+            self.seconds += time.perf_counter() - t
+
+    def _resolve(self, batch, results=None, error=None):
+        for i, (w, future) in enumerate(batch):
+            if future.done(): # Cancelled.
+                continue
+            if error is None:
+                v, e = results[i]
+            else:
+                v, e = None, error
+            if e is not None:
+                future.set_exception(e)
+            else:
+                future.set_result(v)
+
+    async def _run(self, batch, words):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, functools.partial(self._inflect, words))
+        except Exception as e:
+            self._resolve(batch, error=e)
+        else:
+            self._resolve(batch, results)
+
+    def flush(self):
+        """ Inflects the words that are waiting now, instead of after max_delay.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        words = [w for w, future in batch]
+        self.words += len(words)
+        self.batches += 1
+        if self.executor is None:
+            self._resolve(batch, self._inflect(words))
+        else:
+            task = asyncio.ensure_future(self._run(batch, words))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def close(self):
+        """ Inflects the words that are waiting, and waits until all batches are done.
+        """
+        self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+# Caching for the pluralize() and singularize() functions of each language.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# Real text follows Zipf's law: a few thousand words make up most of it,
+# so the same words are inflected over and over.
+# Each pluralize() and singularize() function can keep a bounded cache of recent results,
+# which is disabled by default:
+#
+#   import grammar.german as gg
+#   gg.pluralize.cache_enable(10000)
+#   gg.pluralize("Katze")
+#   gg.pluralize.cache_info() # CacheInfo(hits=0, misses=1, evictions=0, maxsize=10000, size=1)
+#
+# Results are keyed on all arguments (e.g., pos, classical, gender, role),
+# or only on the word if the others are defaults. Calls with a custom dictionary are not cached.
+# Words are normalized before they are looked up (see grammar.normalize),
+# so that "Katze", "KATZE" and "katze" share one cached result.
+
+import threading
+import functools
+
+from collections import OrderedDict, namedtuple
+
+from .normalize import fold, restore
+
+CacheInfo = namedtuple("CacheInfo", ("hits", "misses", "evictions", "maxsize", "size"))
+
+#### LRU CACHE #####################################################################################
+
+class LRUCache(object):
+
+    def __init__(self, maxsize=10000):
+        """ A thread-safe dictionary of at most maxsize items,
+            where the least recently used item is removed first.
+        """
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0 # Incremented by discard().
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                v = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return v
+
+    def set(self, key, value, generation=None):
+        """ Sets the value of the given key, unless the given generation is not the current one
+            (i.e., the value was computed before discard() was called).
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, test):
+        """ Removes the items for which test(key) is True, and returns the number of items removed.
+        """
+        with self._lock:
+            self.generation += 1
+            keys = [k for k in self._items if test(k)]
+            for k in keys:
+                del self._items[k]
+            return len(keys)
+
+    def clear(self):
+        """ Removes all items and resets the counters.
+        """
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+#### MEMOIZE #######################################################################################
+
+_MISSING = object()
+
+class Memoized(object):
+
+    def __init__(self, function, normalize=None):
+        """ A wrapper for an inflection function, with an optional LRU cache (disabled by default).
+            With normalize=True (or a function like grammar.normalize.fold()), the function is called
+            with the normalized word, and its result is given the case of the word.
+        """
+        functools.update_wrapper(self, function)
+        self.function = function
+        self.normalize = fold if normalize is True else normalize or None
+        self.cache = None
+        # The names and default values of the positional arguments (without importing inspect).
+        code = function.__code__
+        names = code.co_varnames[:code.co_argcount]
+        defaults = function.__defaults__ or ()
+        self._index = dict((x, i) for i, x in enumerate(names))
+        self._name = names[0] if names else None # The word.
+        self._defaults = [_MISSING] * (len(names) - len(defaults)) + list(defaults)
+        self._tail = tuple(self._defaults[1:])
+        self._word = len(names) > 0 and _MISSING not in self._tail
+
+    def key(self, args, kwargs):
+        """ Returns a hashable tuple of all argument values (including defaults),
+            or None if an argument is not hashable, or is a non-empty dict (e.g., custom),
+            which would cost more to hash and store with each item than the call itself.
+            An empty dict is keyed as None.
+            If all arguments but the word are defaults, the key is the word (saving a tuple per item).
+        """
+        if self._word and not kwargs and len(args) == 1 and type(args[0]) is str:
+            return args[0]
+        a = list(args) + self._defaults[len(args):]
+        try:
+            for k, v in kwargs.items():
+                a[self._index[k]] = v
+        except (KeyError, IndexError):
+            return None
+        for i, v in enumerate(a):
+            if isinstance(v, dict):
+                if v:
+                    return None
+                a[i] = None
+        a = tuple(a)
+        try:
+            hash(a)
+        except TypeError:
+            return None
+        if self._word and type(a[0]) is str and a[1:] == self._tail:
+            return a[0]
+        return a
+
+    def __call__(self, *args, **kwargs):
+        word = None
+        if self.normalize is not None:
+            w = args[0] if args else kwargs.get(self._name)
+            # Most words are lowercase ASCII, which is their normalized form.
+            if type(w) is str and not (w.isascii() and w.islower()):
+                word, w = w, self.normalize(w)
+                if w == word:
+                    word = None
+                else:
+                    # A custom dict is matched on the word as given, then on the normalized word,
+                    # and its value is returned as is.
+                    i = self._index.get("custom", len(args))
+                    custom = args[i] if len(args) > i else kwargs.get("custom")
+                    if custom is not None:
+                        if word in custom:
+                            return custom[word]
+                        if w in custom:
+                            return custom[w]
+                    if args:
+                        args = (w,) + args[1:]
+                    else:
+                        kwargs = dict(kwargs)
+                        kwargs[self._name] = w
+        cache = self.cache
+        k = None if cache is None else self.key(args, kwargs)
+        if k is None:
+            v = self.function(*args, **kwargs)
+        else:
+            g = cache.generation
+            v = cache.get(k, _MISSING)
+            if v is _MISSING:
+                v = self.function(*args, **kwargs)
+                cache.set(k, v, g)
+        if word is not None:
+            return restore(v, word)
+        return v
+
+    def cache_discard(self, words):
+        """ Removes the cached results for the given words (a set, or a function that returns True
+            for a word), with any other arguments, and returns the number of items removed.
+        """
+        if self.cache is None:
+            return 0
+        test = words if callable(words) else words.__contains__
+        return self.cache.discard(lambda k: test(k if type(k) is str else k[0]))
+
+    def cache_enable(self, maxsize=10000):
+        """ Enables the cache with the given maximum number of items, or resizes it.
+        """
+        if self.cache is None:
+            self.cache = LRUCache(maxsize)
+        else:
+            self.cache.resize(maxsize)
+
+    def cache_disable(self):
+        self.cache = None
+
+    def cache_clear(self):
+        if self.cache is not None:
+            self.cache.clear()
+
+    def cache_info(self):
+        """ Returns a (hits, misses, evictions, maxsize, size)-tuple, or None if the cache is disabled.
+        """
+        if self.cache is not None:
+            return self.cache.info()
+
+def memoize(function=None, normalize=None):
+    """ Returns the given function wrapped in a Memoized object,
+        or a decorator if no function is given, e.g., @memoize(normalize=True).
+    """
+    if function is None:
+        return lambda function: Memoized(function, normalize)
+    return Memoized(function, normalize)
+
+#### MANY ##########################################################################################
+
+def many(function, words, *args, **kwargs):
+    """ Returns a list with function(word, *args, **kwargs) for each word in the given iterable,
+        in the same order, where each unique word is inflected only once.
+    """
+    words = words if isinstance(words, (list, tuple)) else list(words)
+    m = dict((w, function(w, *args, **kwargs)) for w in dict.fromkeys(words))
+    return list(map(m.__getitem__, words))
+
+#### MODULE ########################################################################################
+
+def functions(module):
+    """ Returns a dict of name => Memoized function for the given language module.
+    """
+    return dict((k, v) for k, v in vars(module).items() if isinstance(v, Memoized))
+
+def enable(module, maxsize=10000):
+    """ Enables the cache of each function in the given language module, e.g., grammar.english.
+    """
+    for f in functions(module).values():
+        f.cache_enable(maxsize)
+
+def disable(module):
+    for f in functions(module).values():
+        f.cache_disable()
+
+def clear(module):
+    for f in functions(module).values():
+        f.cache_clear()
+
+def info(module):
+    """ Returns a dict of function name => CacheInfo for the given language module.
+    """
+    return dict((k, f.cache_info()) for k, f in functions(module).items())
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+# Rule cascades, compiled to Python functions, and reordered by rule frequency.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# A cascade is an ordered list of rules, where the first rule that matches a word returns its output,
+# e.g., grammar.dutch.plural_rules. Each rule is a (name, condition, output)-tuple,
+# where the condition is a dict with optional keys:
+# - words   : the name of a set (or dict) of words that contains the word,
+# - suffixes: a tuple of suffixes, one of which the word ends with,
+# - exclude : a tuple of suffixes, none of which the word ends with,
+# - test    : a function that returns True for a word that matches,
+# and the output is a function that returns the output for a word (e.g., lambda w: w + "en").
+# The cascade is compiled into a function that tries the rules in order (see compile()).
+#
+# On real text, a few rules match most words, and these may come late in the cascade.
+# Two rules are disjoint if no word can match both. A rule may be tested before an earlier rule
+# if they are disjoint, without changing the output of the cascade (the first matching rule
+# is still the same). optimize() reorders the rules so that rules with the most hits come first,
+# within these constraints. The hits of each rule are counted on a list of words (see profile()),
+# or taken from grammar.stats() (see recorded()), and can be saved and loaded at startup:
+#
+#   from grammar import cascade
+#   cascade.save(cascade.profile("nl", words), "profile.json")
+#   cascade.load("profile.json") # reorders the cascades in grammar.dutch
+#
+# Disjointness is proven from the words and suffixes of the rules (a test can be anything,
+# so it is assumed to be true). Rules with neither words nor suffixes are never moved.
+
+import re
+import sys
+
+from . import hooks
+from .parallel import module, function, PLURALIZE
+from .normalize import fold
+
+# The language modules import this module, so json and argparse are imported when first needed.
+
+# The module functions that run a cascade, and the rules they use.
+CASCADES = {
+    "german": {
+        "_plural_rules": "plural_rules"
+    },
+    "dutch": {
+        "_plural_rules": "plural_rules"
+    }
+}
+
+OWNER, PROFILE = \
+    "cascade", "cascade.profile"
+
+#### COMPILE #######################################################################################
+
+def _and(f, g):
+    return lambda w: f(w) and g(w)
+
+def predicate(rule, namespace):
+    """ Returns a function that returns True if the given rule matches a given word.
+        The words of the rule are looked up in the given namespace (e.g., the globals() of a module).
+    """
+    name, c, output = rule
+    a = []
+    if c.get("words"):
+        a.append(namespace[c["words"]].__contains__)
+    if c.get("suffixes"):
+        suffixes = tuple(c["suffixes"])
+        a.append(lambda w: w.endswith(suffixes))
+    if c.get("exclude"):
+        exclude = tuple(c["exclude"])
+        a.append(lambda w: not w.endswith(exclude))
+    if c.get("test"):
+        a.append(c["test"])
+    if not a:
+        return lambda w: True
+    f = a[0]
+    for g in a[1:]:
+        f = _and(f, g)
+    return f
+
+def compile(rules, namespace):
+    """ Returns a function that returns the output of the first rule in the given list
+        that matches a given word, or None. Names in the rules are looked up in the given namespace
+        (e.g., the globals() of a language module).
+    """
+    # The conditions are tested inline (not with predicate()), to save a call per rule,
+    # and only the rules that can match the last letter of the word are tried, in order.
+    a = []
+    for name, c, output in rules:
+        a.append((
+            namespace[c["words"]] if c.get("words") else None,
+            tuple(c.get("suffixes") or ()),
+            tuple(c.get("exclude") or ()),
+            c.get("test"),
+            output
+        ))
+    def candidates(ch):
+        return tuple(r for r in a if not r[1] or any(s[-1:] in ("", ch) for s in r[1]))
+    index = dict((ch, candidates(ch)) for r in a for ch in set(s[-1:] for s in r[1]) if ch)
+    default = candidates(None)
+    def cascade(w):
+        for words, suffixes, exclude, test, output in index.get(w[-1:], default):
+            if words is not None and w not in words:
+                continue
+            if suffixes and not w.endswith(suffixes):
+                continue
+            if exclude and w.endswith(exclude):
+                continue
+            if test is not None and not test(w):
+                continue
+            return output(w)
+    return cascade
+
+#### OPTIMIZE ######################################################################################
+
+def _suffixes_disjoint(c1, c2):
+    # A word that ends with two suffixes ends with the longest,
+    # which must not end with a suffix that either rule excludes.
+    exclude = tuple(c1.get("exclude") or ()) + tuple(c2.get("exclude") or ())
+    for a in c1["suffixes"]:
+        for b in c2["suffixes"]:
+            x = a.endswith(b) and a or b.endswith(a) and b or None
+            if x is not None and not x.endswith(exclude):
+                return False
+    return True
+
+def disjoint(rule1, rule2, namespace):
+    """ Returns True if no word can match both rules (False if this can't be proven).
+    """
+    c1, c2 = rule1[1], rule2[1]
+    for r1, r2 in ((rule1, rule2), (rule2, rule1)):
+        if r1[1].get("words"):
+            f1 = predicate(r1, namespace)
+            f2 = predicate(r2, namespace)
+            if not any(f1(w) and f2(w) for w in namespace[r1[1]["words"]]):
+                return True
+    if c1.get("suffixes") and c2.get("suffixes"):
+        return _suffixes_disjoint(c1, c2)
+    return False
+
+def optimize(rules, hits, namespace):
+    """ Returns the given list of rules, reordered so that rules with more hits come first
+        (hits is a dict of rule name => count), where a rule only moves before an earlier rule
+        if they are disjoint, so that the first matching rule for any word is the same.
+    """
+    n = len(rules)
+    h = [hits.get(rule[0], 0) for rule in rules]
+    before = [set(i for i in range(j) if not disjoint(rules[i], rules[j], namespace)) for j in range(n)]
+    # The priority of a rule is the most hits of the rule itself, or of a rule that must come after it.
+    p = list(h)
+    for j in reversed(range(n)):
+        for i in before[j]:
+            p[i] = max(p[i], p[j])
+    order = []
+    done = set()
+    while len(order) < n:
+        a = [j for j in range(n) if j not in done and before[j] <= done]
+        j = min(a, key=lambda j: (-p[j], -h[j], j))
+        order.append(j)
+        done.add(j)
+    return [rules[j] for j in order]
+
+#### PROFILE #######################################################################################
+
+def _cascades(lang):
+    m = module(lang)
+    name = m.__name__.split(".")[-1]
+    if name not in CASCADES:
+        raise ValueError("no rule cascades for language: %r" % lang)
+    return m, name, CASCADES[name]
+
+def profile(lang, words, **kwargs):
+    """ Returns a dict of {language: {rules: {rule name: hits}}} for the given iterable of words,
+        counting the rule that matches each word in pluralize() (with the given arguments).
+    """
+    m, name, cascades = _cascades(lang)
+    r = {}
+    f = function(lang, PLURALIZE)
+    words = list(words)
+    for k, v in cascades.items():
+        rules = getattr(m, v)
+        tests = [predicate(rule, vars(m)) for rule in rules]
+        hits = dict((rule[0], 0) for rule in rules)
+        counts = {}
+        # Count the words that reach the cascade (i.e., that pluralize() passes to it),
+        # with a layer on top of any others (see grammar.hooks).
+        def counter(g):
+            def count(w):
+                counts[w] = counts.get(w, 0) + 1
+                return g(w)
+            count.__wrapped__ = g
+            return count
+        hooks.install(m, k, PROFILE, counter)
+        try:
+            for w in words:
+                f.function(fold(w), **kwargs)
+        finally:
+            hooks.uninstall(m, k, PROFILE)
+        for w, n in counts.items():
+            for rule, test in zip(rules, tests):
+                if test(w):
+                    hits[rule[0]] += n
+                    break
+        r[v] = hits
+    return {name: r}
+
+def recorded(lang, stats=None):
+    """ Returns a profile (see profile()) from the statistics of grammar.instrument,
+        e.g., after inflecting a sample of real text with instrumentation enabled.
+    """
+    from . import instrument
+    m, name, cascades = _cascades(lang)
+    stats = stats or instrument.stats()
+    r = {}
+    for k, v in cascades.items():
+        names = [rule[0] for rule in getattr(m, v)]
+        hits = dict((x, 0) for x in names)
+        for s in stats.get("%s.%s" % (name, PLURALIZE), {}).get("rules", ()):
+            x = re.match(r"^%s\[(\d+)\]" % v, s["rule"])
+            if x is not None:
+                hits[names[int(x.group(1))]] += s["hits"]
+        r[v] = hits
+    return {name: r}
+
+#### INSTALL #######################################################################################
+
+def install(profile):
+    """ Reorders the cascades of each language in the given profile (see profile()).
+    """
+    for name, tables in profile.items():
+        m, name, cascades = _cascades(name)
+        for k, v in cascades.items():
+            if v in tables:
+                rules = optimize(getattr(m, v), tables[v], vars(m))
+                f = compile(rules, vars(m))
+                hooks.install(m, k, OWNER, lambda g, f=f: f)
+
+def uninstall(lang):
+    """ Restores the original order of the cascades in the given language module.
+    """
+    m = module(lang)
+    for k in CASCADES.get(m.__name__.split(".")[-1], {}):
+        hooks.uninstall(m, k, OWNER)
+
+def save(profile, path):
+    import json
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2, sort_keys=True)
+
+def load(path):
+    """ Reorders the cascades with the profile in the given JSON file, and returns the profile.
+    """
+    import json
+    with open(path) as f:
+        profile = json.load(f)
+    install(profile)
+    return profile
+
+def main(argv=None):
+    import json
+    import argparse
+    p = argparse.ArgumentParser(prog="python -m grammar.cascade",
+        description="Counts the rules that match a list of words (one per line), for optimize().")
+    p.add_argument("input", help="word list, or - for standard input")
+    p.add_argument("-l", "--language", default="nl", help="%s (default: nl)" % ", ".join(sorted(CASCADES)))
+    p.add_argument("-o", "--output", help="JSON output file (default: stdout)")
+    o = p.parse_args(argv)
+    f = o.input == "-" and sys.stdin or open(o.input, encoding="utf-8")
+    r = profile(o.language, (w.strip() for w in f if w.strip()))
+    if o.output:
+        save(r, o.output)
+    else:
+        print(json.dumps(r, indent=2, sort_keys=True))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
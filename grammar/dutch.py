@@ -17,6 +17,10 @@
 # 79% for pluralize()
 # 91% for singularize()
 import re
+
+from .cache import memoize, many
+from . import cascade
+
 VERB, NOUN, ADJECTIVE, ADVERB = "VB", "NN", "JJ", "RB"
 
 VOWELS = ("a", "e", "i", "o", "u")
@@ -45,80 +49,77 @@ plural_irregular = {
          "vlo": "vlooien"
 }
 
-def pluralize(word, pos=NOUN, custom={}):
+# The rules for nouns, in order: the first rule that matches the lowercase word w returns the plural.
+# Each rule is a (name, condition, plural)-tuple, compiled into a function (see grammar.cascade),
+# where the condition has optional words, suffixes, exclude (suffixes) and test (function).
+plural_rules = [
+    ("irregular-en"   , {"words": "plural_irregular_en"}   , lambda w: w + "en"           ), # dag => dagen
+    ("irregular-een"  , {"words": "plural_irregular_een"}  , lambda w: w + "ën"           ), # fee => feeën
+    ("irregular-eren" , {"words": "plural_irregular_eren"} , lambda w: w + "eren"         ), # blad => bladeren
+    ("irregular-deren", {"words": "plural_irregular_deren"}, lambda w: w + "deren"        ), # been => beenderen
+    ("irregular"      , {"words": "plural_irregular"}      , lambda w: plural_irregular[w]),
+    # Words ending in -icus get -ici: academicus => academici
+    ("icus", {"suffixes": ("icus",)}, lambda w: w[:-2] + "i"),
+    # Words ending in -s usually get -sen: les => lessen.
+    ("sen", {"suffixes": ("es", "as", "nis", "ris", "vis")}, lambda w: w + "sen"),
+    # Words ending in -s usually get -zen: huis => huizen.
+    ("zen", {"suffixes": ("s",), "exclude": ("us", "ts", "mens")}, lambda w: w[:-1] + "zen"),
+    # Words ending in -f usually get -ven: brief => brieven.
+    ("ven", {"suffixes": ("f",)}, lambda w: w[:-1] + "ven"),
+    # Words ending in -um get -ums: museum => museums.
+    ("ums", {"suffixes": ("um",)}, lambda w: w + "s"),
+    # Words ending in unstressed -ee or -ie get -ën: bacterie => bacteriën
+    ("ies", {"suffixes": ("ie",)}, lambda w: w + "s"),
+    ("eën", {"suffixes": ("ee", "ie")}, lambda w: w[:-1] + "ën"),
+    # Words ending in -heid get -heden: mogelijkheid => mogelijkheden
+    ("heden", {"suffixes": ("heid",)}, lambda w: w[:-4] + "heden"),
+    # Words ending in -e -el -em -en -er -ie get -s: broer => broers.
+    ("s", {"suffixes": ("é", "e", "el", "em", "en", "er", "eu", "ie", "ue", "ui", "eau", "ah")}, lambda w: w + "s"),
+    # Words ending in a vowel get 's: auto => auto's.
+    ("'s", {"suffixes": VOWELS + ("y",)}, lambda w: w + "'s"),
+    # Words ending in -or always get -en: motor => motoren.
+    ("or", {"suffixes": ("or",)}, lambda w: w + "en"),
+    # Words ending in -ij get -en: boerderij => boerderijen.
+    ("ij", {"suffixes": ("ij",)}, lambda w: w + "en"),
+    # Words ending in two consonants get -en: hand => handen.
+    ("consonants", {"test": lambda w: len(w) > 1 and not is_vowel(w[-1]) and not is_vowel(w[-2])}, lambda w: w + "en"),
+    # Words ending in one consonant with a short sound: fles => flessen.
+    ("short", {"test": lambda w: len(w) > 2 and not is_vowel(w[-1]) and not is_vowel(w[-3])}, lambda w: w + w[-1] + "en"),
+    # Words ending in one consonant with a long sound: raam => ramen.
+    ("long", {"test": lambda w: len(w) > 2 and not is_vowel(w[-1]) and w[-2] == w[-3]}, lambda w: w[:-2] + w[-1] + "en"),
+    ("en", {}, lambda w: w + "en")
+]
+
+_plural_rules = cascade.compile(plural_rules, globals())
+
+@memoize(normalize=True)
+def pluralize(word, pos=NOUN, custom=None):
     """ Returns the plural of a given word.
         For example: stad => steden.
         The custom dictionary is for user-defined replacements.
     """
-    if word in list(custom.keys()):
+    if custom is not None and word in custom:
         return custom[word]
-    w = word.lower()
+    w = word
     if pos == NOUN:
-        if w in plural_irregular_en:    # dag => dagen
-            return w + "en"
-        if w in plural_irregular_een:   # fee => feeën
-            return w + "ën"
-        if w in plural_irregular_eren:  # blad => bladeren
-            return w + "eren"
-        if w in plural_irregular_deren: # been => beenderen
-            return w + "deren"
-        if w in plural_irregular:
-            return plural_irregular[w]
-        # Words ending in -icus get -ici: academicus => academici
-        if w.endswith("icus"):
-            return w[:-2] + "i"
-        # Words ending in -s usually get -sen: les => lessen.
-        if w.endswith(("es", "as", "nis", "ris", "vis")):
-            return w + "sen"
-        # Words ending in -s usually get -zen: huis => huizen.
-        if w.endswith("s") and not w.endswith(("us", "ts", "mens")):
-            return w[:-1] + "zen"
-        # Words ending in -f usually get -ven: brief => brieven.
-        if w.endswith("f"):
-            return w[:-1] + "ven"
-        # Words ending in -um get -ums: museum => museums.
-        if w.endswith("um"):
-            return w + "s"
-        # Words ending in unstressed -ee or -ie get -ën: bacterie => bacteriën
-        if w.endswith("ie"):
-            return w + "s"
-        if w.endswith(("ee","ie")):
-            return w[:-1] + "ën"
-        # Words ending in -heid get -heden: mogelijkheid => mogelijkheden
-        if w.endswith("heid"):
-            return w[:-4] + "heden"
-        # Words ending in -e -el -em -en -er -ie get -s: broer => broers.
-        if w.endswith(("é", "e", "el", "em", "en", "er", "eu", "ie", "ue", "ui", "eau", "ah")):
-            return w + "s"
-        # Words ending in a vowel get 's: auto => auto's.
-        if w.endswith(VOWELS) or w.endswith("y") and not w.endswith("e"):
-            return w + "'s"
-        # Words ending in -or always get -en: motor => motoren.
-        if w.endswith("or"):
-            return w + "en"
-        # Words ending in -ij get -en: boerderij => boerderijen.
-        if w.endswith("ij"):
-            return w + "en"
-        # Words ending in two consonants get -en: hand => handen.
-        if len(w) > 1 and not is_vowel(w[-1]) and not is_vowel(w[-2]):
-            return w + "en"
-        # Words ending in one consonant with a short sound: fles => flessen.
-        if len(w) > 2 and not is_vowel(w[-1]) and not is_vowel(w[-3]):
-            return w + w[-1] + "en"
-        # Words ending in one consonant with a long sound: raam => ramen.
-        if len(w) > 2 and not is_vowel(w[-1]) and w[-2] == w[-3]:
-            return w[:-2] + w[-1] + "en"
-        return w + "en"
+        return _plural_rules(w)
     return w
 
+def pluralize_many(words, pos=NOUN, custom=None):
+    """ Returns a list of plurals for the given iterable of words, see pluralize().
+        Each unique word is inflected only once.
+    """
+    return many(pluralize, words, pos, custom)
+
 #### SINGULARIZE ###################################################################################
 
 singular_irregular = dict((v,k) for k,v in plural_irregular.items())
 
-def singularize(word, pos=NOUN, custom={}):
-    if word in list(custom.keys()):
+@memoize(normalize=True)
+def singularize(word, pos=NOUN, custom=None):
+    if custom is not None and word in custom:
         return custom[word]
-    w = word.lower()
+    w = word
     if pos == NOUN and w in singular_irregular:
         return singular_irregular[w]
     if pos == NOUN and w.endswith(("ën", "en", "s", "i")):
@@ -188,4 +189,10 @@ def singularize(word, pos=NOUN, custom={}):
             if len(w) > 2 and not is_vowel(w[-1]) and is_vowel(w[-2]) and not is_vowel(w[-3]):
                 return w[:-1] + w[-2] + w[-1]
             return w
-    return w
\ No newline at end of file
+    return w
+
+def singularize_many(words, pos=NOUN, custom=None):
+    """ Returns a list of singulars for the given iterable of words, see singularize().
+        Each unique word is inflected only once.
+    """
+    return many(singularize, words, pos, custom)
@@ -19,6 +19,10 @@
 import os
 import sys
 import re
+import threading
+
+from .cache import memoize, many
+from .normalize import fold
 
 try:
     MODULE = os.path.dirname(os.path.realpath(__file__))
@@ -31,11 +35,130 @@ VOWELS = "aeiouy"
 re_vowel = re.compile(r"a|e|i|o|u|y", re.I)
 is_vowel = lambda ch: ch in VOWELS
 
+# The rules of pluralize() and singularize() are compiled with _regex(),
+# which grammar.instrument replaces to count the rules that are tried, and the rule that matches.
+_regex = re.compile
+
+# The functions are safe to call from several threads.
+# Rules that are compiled when first needed are compiled once, while holding _lock,
+# and stored in a dict (or a global) that is read without locking after that.
+# Compiled tables are tuples, which are never changed.
+_lock = threading.RLock()
+
+def _compile_once(compiled, key, compile, *args):
+    """ Returns compiled[key], after setting it to compile(*args) if it is not yet set.
+    """
+    with _lock:
+        v = compiled.get(key)
+        if v is None:
+            v = compiled[key] = compile(*args)
+        return v
+
+#### SUFFIX DISPATCH ###############################################################################
+# Most rules below are ordered lists of regular expressions, where the first one that matches wins.
+# Most of these expressions are anchored at the end of the word (e.g., "([csx])is$"),
+# so only a few of them can match a word with a given ending (e.g., "-is").
+# For performance, each ordered list is split into smaller ordered lists, one for each word ending,
+# that contain only those expressions that can possibly match. Lists are created when first needed.
+
+SPECIAL = set("()[]{}.*+?|^$\\")
+
+def branches(pattern):
+    """ Returns the list of top-level alternatives in the given regular expression.
+    """
+    a, i, depth, charset = [], 0, 0, False
+    for j, ch in enumerate(pattern):
+        if j > 0 and pattern[j-1] == "\\" and (j < 2 or pattern[j-2] != "\\"):
+            continue
+        if charset:
+            charset = ch != "]"
+        elif ch == "[":
+            charset = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            a.append(pattern[i:j])
+            i = j + 1
+    a.append(pattern[i:])
+    return a
+
+def suffixes(regex):
+    """ Returns the set of literal suffixes with which any match of the given regular expression ends,
+        e.g., "([csx])is$" => set(["is"]), or set([""]) if this can't be determined.
+        For case-insensitive expressions, the suffixes are lowercase.
+    """
+    a = set()
+    for p in branches(regex.pattern):
+        if not p.endswith("$") or p.endswith("\\$"):
+            return set([""])
+        p = p[:-1]
+        i = len(p)
+        while i > 0 and p[i-1] not in SPECIAL:
+            i -= 1
+        if i > 0 and p[i-1] == "\\":
+            i += 1 # Escaped character, e.g., "\\d".
+        a.add(p[i:])
+    if regex.flags & re.IGNORECASE:
+        a = set(x.lower() for x in a)
+    return a
+
+def suffix_dispatch(rules):
+    """ Returns a function that, for a given string, returns the index of the first regular expression
+        in the given list that has a match in the string (cf. re.search()), or None.
+    """
+    rules = [(i, r, suffixes(r), r.flags & re.IGNORECASE) for i, r in enumerate(rules)]
+    subsets = {}
+    def candidate(e, a, ignorecase):
+        # Case-insensitive matching of non-ASCII characters is hard to predict, e.g., "ſ" == "s".
+        if ignorecase:
+            if not e.isascii():
+                return True
+            e = e.lower()
+        return any(e.endswith(x[-2:]) or x.endswith(e) for x in a)
+    def subset(e):
+        # $ also matches before a trailing newline.
+        if "\n" in e:
+            return tuple((i, r) for i, r, a, ignorecase in rules)
+        return tuple((i, r) for i, r, a, ignorecase in rules if candidate(e, a, ignorecase))
+    def match(s):
+        e = s[-2:]
+        try:
+            a = subsets[e]
+        except KeyError:
+            a = subsets.setdefault(e, subset(e))
+        for i, r in a:
+            if r.search(s) is not None:
+                return i
+    return match
+
+def endswith_index(suffixes):
+    """ Returns a function that, for a given string, returns the first suffix in the given list
+        that the string ends with, or None.
+    """
+    index = {}
+    for i, x in enumerate(suffixes):
+        index.setdefault(len(x), {}).setdefault(x, (i, x))
+    index = tuple(sorted(index.items()))
+    def match(s):
+        n = len(s)
+        m = None
+        for k, a in index:
+            if k > n:
+                break
+            x = a.get(s[n-k:])
+            if x is not None and (m is None or x[0] < m[0]):
+                m = x
+        if m is not None:
+            return m[1]
+    return match
+
 #### ARTICLE #######################################################################################
 # Based on the Ruby Linguistics module by Michael Granger:
 # http://www.deveiate.org/projects/Linguistics/wiki/English
 
-RE_ARTICLE = [(re.compile(x[0]), x[1]) for x in (
+RE_ARTICLE = [
     ("euler|hour(?!i)|heir|honest|hono", "an"),       # exceptions: an hour, an honor
     # Abbreviations:
     # strings of capitals starting with a vowel-sound consonant followed by another consonant,
@@ -51,19 +174,58 @@ RE_ARTICLE = [(re.compile(x[0]), x[1]) for x in (
     (r"^[aeiou]"             , "an"), # vowels: an owl
     (r"y(b[lor]|cl[ea]|fere|gg|p[ios]|rou|tt)", "an"), # y like "i": an yclept, a year
     (r""                     , "a" )  # guess "a"
-)]
+]
 
 def definite_article(word):
     return "the"
 
+# For performance, the rules are compiled when first needed, once for each first character of a word:
+# a rule anchored at the start (e.g., "^[aeiou]") is left out if it can't match the first character,
+# and rules after a rule that always matches (e.g., "^[^aeiouy]" for "b") are left out.
+# Consecutive rules with the same article are then combined into one regular expression.
+RE_ARTICLE_DISPATCH = {}
+
+def article_rules(ch):
+    """ Returns a (rules, default)-tuple for words starting with the given character,
+        with an ordered list of (regular expression, article)-tuples to test,
+        and the article if none of them matches.
+    """
+    a = []
+    for p, article in RE_ARTICLE:
+        m = re.match(r"\^(\[[^\]]*\]|\w)(?![?*+{])", p)
+        if m is not None and len(branches(p)) == 1:
+            if re.match(m.group(1), ch) is None:
+                continue
+            terminal = m.end() == len(p)
+        else:
+            terminal = p == ""
+        if a and a[-1][1] == article:
+            a[-1][0].append(p)
+        else:
+            a.append(([p], article))
+        if terminal:
+            break
+    else:
+        terminal = False
+    rules = tuple((re.compile("|".join("(?:%s)" % p for p in patterns)), article) for patterns, article in a)
+    if terminal:
+        return rules[:-1], rules[-1][1]
+    return rules, None
+
 def indefinite_article(word):
     """ Returns the indefinite article for a given word.
         For example: indefinite_article("university") => "a" university.
     """
     word = word.split(" ")[0]
-    for rule, article in RE_ARTICLE:
+    ch = word[:1]
+    try:
+        rules, default = RE_ARTICLE_DISPATCH[ch]
+    except KeyError:
+        rules, default = _compile_once(RE_ARTICLE_DISPATCH, ch, article_rules, ch)
+    for rule, article in rules:
         if rule.search(word) is not None:
             return article
+    return default
 
 DEFINITE, INDEFINITE = \
     "definite", "indefinite"
@@ -80,6 +242,12 @@ def referenced(word, article=INDEFINITE):
     """
     return "%s %s" % (_article(word, article), word)
 
+def referenced_many(words, article=INDEFINITE):
+    """ Returns a list with the article + the word for each word in the given iterable.
+        Each unique word is handled only once.
+    """
+    return many(referenced, words, article)
+
 #print referenced("hour")
 #print referenced("FBI")
 #print referenced("bear")
@@ -162,7 +330,6 @@ plural_rules = [
      (     r"sheep$", "sheep"      , None, False),
      (      r"deer$", "deer"       , None, False),
      (       r"pox$", "pox"        , None, False),
-     (r"([A-Z].*)ese$", "\\1ese"   , None, False),
      (      r"itis$", "itis"       , None, False),
      (r"(fruct|gluc|galact|lact|ket|malt|rib|sacchar|cellul)ose$", "\\1ose", None, False)
     ), # 5) Irregular plural forms (e.g., mongoose, oxen).
@@ -239,9 +406,8 @@ plural_rules = [
      (       r"arf$", "arves"      , None, False),
      (r"([nlw]i)fe$", "\\1ves"     , None, False),
     ), # 11) -y takes -ys if preceded by a vowel, -ies otherwise
-       #     (e.g., storeys, Marys, stories).
+       #     (e.g., storeys, stories).
     ((r"([aeiou])y$", "\\1ys"      , None, False),
-     (r"([A-Z].*)y$", "\\1ys"      , None, False),
      (         r"y$", "ies"        , None, False)
     ), # 12) -o sometimes takes -os, -oes otherwise.
        #     -o is preceded by a vowel takes -os
@@ -257,9 +423,6 @@ plural_rules = [
     ((          r"$", "s"          , None, False),)
 ]
 
-# For performance, compile the regular expressions once:
-plural_rules = [[(re.compile(r[0]), r[1], r[2], r[3]) for r in grp] for grp in plural_rules]
-
 # Suffix categories.
 plural_categories = {
     "uninflected": [
@@ -272,7 +435,13 @@ plural_categories = {
         "clippers"   , "gallows"    , "mackerel"     , "scissors"   ,
         "cod"        , "graffiti"   , "measles"      , "series"     ,
         "contretemps",                "mews"         , "shears"     ,
-        "corps"      ,                "mumps"        , "species"
+        "corps"      ,                "mumps"        , "species"      ,
+        # Nationalities and languages in -ese (Chinese => Chinese).
+        "balinese"   , "burmese"    , "chinese"      , "japanese"   , "portuguese"   ,
+        "cantonese"  , "congolese"  , "javanese"     , "lebanese"   , "senegalese"   ,
+        "faroese"    , "genoese"    , "maltese"      , "milanese"   , "sinhalese"    ,
+        "guyanese"   , "nepalese"   , "siamese"      , "sudanese"   , "taiwanese"    ,
+        "togolese"   , "viennese"   , "vietnamese"   , "bhutanese"  , "surinamese"
         ],
     "uncountable": [
         "advice"     , "fruit"      , "ketchup"      , "meat"       , "sand"         ,
@@ -369,13 +538,66 @@ plural_categories = {
         ]
 }
 
-def pluralize(word, pos=NOUN, custom={}, classical=True):
+# For performance, the rule groups are flattened and compiled once for each combination
+# of (classical, adjective), when first needed, and general rules are looked up by word ending (see suffix_dispatch()).
+# Rules that pertain to a category of words are only tested for words in that category,
+# using a dict of word => frozenset of categories instead of the lists.
+def plural_categories_index(categories):
+    """ Returns a dict of word => frozenset of categories, for the given dict of category => words.
+    """
+    index = {}
+    for category, words in categories.items():
+        for w in words:
+            index.setdefault(w, set()).add(category)
+    # Words with the same categories share one frozenset (most words have one category).
+    shared = {}
+    for w, c in index.items():
+        c = frozenset(c)
+        index[w] = shared.setdefault(c, c)
+    return index
+
+plural_category_index = plural_categories_index(plural_categories)
+
+def plural_rules_compile(classical=True, adjective=False):
+    """ Returns a (rules, match, categorized)-tuple, where rules is the ordered list of
+        (suffix, inflection, category)-tuples that apply, match() returns the index of
+        the first general rule that matches a word (or len(rules)),
+        and categorized is the ordered list of (index, suffix, inflection, category)-tuples.
+    """
+    rules = []
+    for i in (adjective and (0, 1) or range(len(plural_rules))):
+        for suffix, inflection, category, classic in plural_rules[i]:
+            if not classic or classical:
+                rules.append((_regex(suffix), inflection, category))
+    rules = tuple(rules)
+    general = tuple(j for j, (suffix, inflection, category) in enumerate(rules) if category is None)
+    categorized = tuple((j,) + r for j, r in enumerate(rules) if r[2] is not None)
+    f = suffix_dispatch([rules[j][0] for j in general])
+    def match(word):
+        i = f(word)
+        if i is None:
+            return len(rules)
+        return general[i]
+    return rules, match, categorized
+
+plural_rules_compiled = {}
+
+# Words are lowercased before the rules see them (see grammar.normalize), except the pronoun I.
+# A capitalized word may be a proper noun (Mary => Marys) or not (Party => Parties),
+# so names are given in the custom dict, or as overrides (see grammar.overrides).
+def _plural_fold(word):
+    if word == "I":
+        return word
+    return fold(word)
+
+@memoize(normalize=_plural_fold)
+def pluralize(word, pos=NOUN, custom=None, classical=True):
     """ Returns the plural of a given word, e.g., child => children.
         Handles nouns and adjectives, using classical inflection by default
         (i.e., where "matrix" pluralizes to "matrices" and not "matrixes").
         The custom dictionary is for user-defined replacements.
     """
-    if word in custom:
+    if custom is not None and word in custom:
         return custom[word]
     # Recurse genitives.
     # Remove the apostrophe and any trailing -s,
@@ -400,24 +622,33 @@ def pluralize(word, pos=NOUN, custom={}, classical=True):
         else:
             return word.replace(w[-1], pluralize(w[-1], pos, custom, classical))
     # Only a very few number of adjectives inflect.
-    n = list(range(len(plural_rules)))
-    if pos.startswith(ADJECTIVE):
-        n = [0, 1]
+    k = (bool(classical), pos.startswith(ADJECTIVE))
+    try:
+        rules, match, categorized = plural_rules_compiled[k]
+    except KeyError:
+        rules, match, categorized = _compile_once(plural_rules_compiled, k, plural_rules_compile, *k)
     # Apply pluralization rules.
-    for i in n:
-        for suffix, inflection, category, classic in plural_rules[i]:
-            # A general rule, or a classic rule in classical mode.
-            if category is None:
-                if not classic or (classic and classical):
-                    if suffix.search(word) is not None:
-                        return suffix.sub(inflection, word)
-            # A rule pertaining to a specific category of words.
-            if category is not None:
-                if word in plural_categories[category] and (not classic or (classic and classical)):
-                    if suffix.search(word) is not None:
-                        return suffix.sub(inflection, word)
+    # A general rule, or a classic rule in classical mode.
+    i = match(word)
+    # A rule pertaining to a specific category of words, if it precedes the general rule.
+    c = plural_category_index.get(word)
+    if c is not None:
+        for j, suffix, inflection, category in categorized:
+            if j > i:
+                break
+            if category in c and suffix.search(word) is not None:
+                return suffix.sub(inflection, word)
+    if i < len(rules):
+        suffix, inflection, category = rules[i]
+        return suffix.sub(inflection, word)
     return word
 
+def pluralize_many(words, pos=NOUN, custom=None, classical=True):
+    """ Returns a list of plurals for the given iterable of words, see pluralize().
+        Each unique word is inflected only once.
+    """
+    return many(pluralize, words, pos, custom, classical)
+
 #print pluralize("part-of-speech")
 #print pluralize("child")
 #print pluralize("dog's")
@@ -450,25 +681,25 @@ def pluralize(word, pos=NOUN, custom={}, classical=True):
 # THIS SOFTWARE.
 
 singular_rules = [
-    (r'(?i)(.)ae$'            , '\\1a'    ),
-    (r'(?i)(.)itis$'          , '\\1itis' ),
-    (r'(?i)(.)eaux$'          , '\\1eau'  ),
-    (r'(?i)(quiz)zes$'        , '\\1'     ),
-    (r'(?i)(matr)ices$'       , '\\1ix'   ),
-    (r'(?i)(ap|vert|ind)ices$', '\\1ex'   ),
-    (r'(?i)^(ox)en'           , '\\1'     ),
-    (r'(?i)(alias|status)es$' , '\\1'     ),
-    (r'(?i)([octop|vir])i$'   ,  '\\1us'  ),
-    (r'(?i)(cris|ax|test)es$' , '\\1is'   ),
-    (r'(?i)(shoe)s$'          , '\\1'     ),
-    (r'(?i)(o)es$'            , '\\1'     ),
-    (r'(?i)(bus)es$'          , '\\1'     ),
-    (r'(?i)([m|l])ice$'       , '\\1ouse' ),
-    (r'(?i)(x|ch|ss|sh)es$'   , '\\1'     ),
-    (r'(?i)(m)ovies$'         , '\\1ovie' ),
-    (r'(?i)(.)ombies$'        , '\\1ombie'),
-    (r'(?i)(s)eries$'         , '\\1eries'),
-    (r'(?i)([^aeiouy]|qu)ies$', '\\1y'    ),
+    (r'(.)ae$'                , '\\1a'    ),
+    (r'(.)itis$'              , '\\1itis' ),
+    (r'(.)eaux$'              , '\\1eau'  ),
+    (r'(quiz)zes$'            , '\\1'     ),
+    (r'(matr)ices$'           , '\\1ix'   ),
+    (r'(ap|vert|ind)ices$'    , '\\1ex'   ),
+    (r'^(ox)en'               , '\\1'     ),
+    (r'(alias|status)es$'     , '\\1'     ),
+    (r'([octop|vir])i$'       ,  '\\1us'  ),
+    (r'(cris|ax|test)es$'     , '\\1is'   ),
+    (r'(shoe)s$'              , '\\1'     ),
+    (r'(o)es$'                , '\\1'     ),
+    (r'(bus)es$'              , '\\1'     ),
+    (r'([m|l])ice$'           , '\\1ouse' ),
+    (r'(x|ch|ss|sh)es$'       , '\\1'     ),
+    (r'(m)ovies$'             , '\\1ovie' ),
+    (r'(.)ombies$'            , '\\1ombie'),
+    (r'(s)eries$'             , '\\1eries'),
+    (r'([^aeiouy]|qu)ies$'    , '\\1y'    ),
 	# -f, -fe sometimes take -ves in the plural
 	# (e.g., lives, wolves).
     (r"([aeo]l)ves$"          , "\\1f"    ),
@@ -476,29 +707,26 @@ singular_rules = [
     (r"arves$"                , "arf"     ),
     (r"erves$"                , "erve"    ),
     (r"([nlw]i)ves$"          , "\\1fe"   ),
-    (r'(?i)([lr])ves$'        , '\\1f'    ),
+    (r'([lr])ves$'            , '\\1f'    ),
     (r"([aeo])ves$"           , "\\1ve"   ),
-    (r'(?i)(sive)s$'          , '\\1'     ),
-    (r'(?i)(tive)s$'          , '\\1'     ),
-    (r'(?i)(hive)s$'          , '\\1'     ),
-    (r'(?i)([^f])ves$'        , '\\1fe'   ),
+    (r'(sive)s$'              , '\\1'     ),
+    (r'(tive)s$'              , '\\1'     ),
+    (r'(hive)s$'              , '\\1'     ),
+    (r'([^f])ves$'            , '\\1fe'   ),
     # -ses suffixes.
-    (r'(?i)(^analy)ses$'      , '\\1sis'  ),
-    (r'(?i)((a)naly|(b)a|(d)iagno|(p)arenthe|(p)rogno|(s)ynop|(t)he)ses$', '\\1\\2sis'),
-    (r'(?i)(.)opses$'         , '\\1opsis'),
-    (r'(?i)(.)yses$'          , '\\1ysis' ),
-    (r'(?i)(h|d|r|o|n|b|cl|p)oses$', '\\1ose'),
-    (r'(?i)(fruct|gluc|galact|lact|ket|malt|rib|sacchar|cellul)ose$', '\\1ose'),
-    (r'(?i)(.)oses$'          , '\\1osis' ),
+    (r'(^analy)ses$'          , '\\1sis'  ),
+    (r'((a)naly|(b)a|(d)iagno|(p)arenthe|(p)rogno|(s)ynop|(t)he)ses$', '\\1\\2sis'),
+    (r'(.)opses$'             , '\\1opsis'),
+    (r'(.)yses$'              , '\\1ysis' ),
+    (r'(h|d|r|o|n|b|cl|p)oses$', '\\1ose'),
+    (r'(fruct|gluc|galact|lact|ket|malt|rib|sacchar|cellul)ose$', '\\1ose'),
+    (r'(.)oses$'              , '\\1osis' ),
     # -a
-    (r'(?i)([ti])a$'          , '\\1um'   ),
-    (r'(?i)(n)ews$'           , '\\1ews'  ),
-    (r'(?i)s$'                , ''        ),
+    (r'([ti])a$'              , '\\1um'   ),
+    (r'(n)ews$'               , '\\1ews'  ),
+    (r's$'                    , ''        ),
 ]
 
-# For performance, compile the regular expressions only once:
-singular_rules = [(re.compile(r[0]), r[1]) for r in singular_rules]
-
 singular_uninflected = set((
     "bison"      , "debris"   , "headquarters", "pincers"    , "trout"     ,
     "bream"      , "diabetes" , "herpes"      , "pliers"     , "tuna"      ,
@@ -574,10 +802,37 @@ singular_irregular = {
             "zoa": "zoon",
 }
 
-def singularize(word, pos=NOUN, custom={}):
+# For performance, the word lists are indexed once:
+# - a word is uninflected if it is the ending of a word in singular_uninflected or singular_uncountable,
+#   so all endings of these words are stored in a set,
+# - words in singular_ie and singular_irregular are looked up by word ending (see endswith_index()),
+# - the regular expressions that replace irregular plural endings are compiled when first needed,
+# - singular_rules are compiled when first needed, and looked up by word ending (see suffix_dispatch()).
+# Changes to the lists after import are not picked up.
+singular_uninflected_endings = set(x[i:]
+    for x in singular_uninflected | singular_uncountable
+        for i in range(len(x) + 1))
+singular_ie_ending = endswith_index([x + "s" for x in singular_ie])
+singular_irregular_ending = endswith_index(list(singular_irregular))
+singular_irregular_compiled = {}
+singular_rules_compiled = None
+
+def singular_rules_compile():
+    """ Returns a (rules, match)-tuple, where rules is the list of compiled (suffix, inflection)-tuples,
+        and match() returns the index of the first rule that matches a word (or None).
+    """
+    global singular_rules_compiled
+    with _lock:
+        if singular_rules_compiled is None:
+            rules = tuple((_regex(suffix), inflection) for suffix, inflection in singular_rules)
+            singular_rules_compiled = (rules, suffix_dispatch([suffix for suffix, inflection in rules]))
+        return singular_rules_compiled
+
+@memoize(normalize=True)
+def singularize(word, pos=NOUN, custom=None):
     """ Returns the singular of a given word.
     """
-    if word in custom:
+    if custom is not None and word in custom:
         return custom[word]
     # Recurse compound words (e.g. mothers-in-law).
     if "-" in word:
@@ -587,26 +842,31 @@ def singularize(word, pos=NOUN, custom={}):
     # dogs' => dog's
     if word.endswith("'"):
         return singularize(word[:-1]) + "'s"
-    w = word.lower()
-    for x in singular_uninflected:
-        if x.endswith(w):
-            return word
-    for x in singular_uncountable:
-        if x.endswith(w):
-            return word
-    for x in singular_ie:
-        if w.endswith(x+"s"):
-            return w
-    for x in singular_irregular:
-        if w.endswith(x):
-            return re.sub('(?i)'+x+'$', singular_irregular[x], word)
-    for suffix, inflection in singular_rules:
+    if word in singular_uninflected_endings:
+        return word
+    if singular_ie_ending(word) is not None:
+        return word
+    x = singular_irregular_ending(word)
+    if x is not None:
+        try:
+            r = singular_irregular_compiled[x]
+        except KeyError:
+            r = _compile_once(singular_irregular_compiled, x, _regex, x + "$")
+        return r.sub(singular_irregular[x], word)
+    rules, match = singular_rules_compiled or singular_rules_compile()
+    i = match(word)
+    if i is not None:
+        suffix, inflection = rules[i]
         m = suffix.search(word)
-        g = m and m.groups() or []
-        if m:
-            for k in range(len(g)):
-                if g[k] is None:
-                    inflection = inflection.replace('\\' + str(k + 1), '')
-            return suffix.sub(inflection, word)
+        g = m.groups()
+        for k in range(len(g)):
+            if g[k] is None:
+                inflection = inflection.replace('\\' + str(k + 1), '')
+        return suffix.sub(inflection, word)
     return word
 
+def singularize_many(words, pos=NOUN, custom=None):
+    """ Returns a list of singulars for the given iterable of words, see singularize().
+        Each unique word is inflected only once.
+    """
+    return many(singularize, words, pos, custom)
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# Accuracy and throughput of pluralize() and singularize() on a corpus of (singular, plural)-pairs.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# The corpus (e.g., CELEX word forms) is a CSV file with a singular and a plural column.
+# It is read once, in chunks, and each chunk is inflected in both directions
+# with pluralize_many() and singularize_many(), so memory use is bounded for large corpora:
+#
+#   python -m grammar.evaluate wordforms-nl-celex.csv -l nl --singular 3 --plural 4
+#
+#   from grammar.evaluate import pairs, evaluate
+#   r = evaluate(pairs("wordforms-nl-celex.csv"), lang="nl")
+#   r["pluralize"]["accuracy"] # 0.79
+#
+# With rules=True, the rule that decided each output is counted as correct or wrong
+# (see grammar.instrument), e.g., to find the rules that make the most errors.
+# This is much slower, so words/sec is not representative then.
+
+import io
+import sys
+import csv
+import json
+import time
+import argparse
+
+from itertools import islice
+
+from .parallel import module, function, chunks, LANGUAGES, PLURALIZE, SINGULARIZE
+from .normalize import restore
+from . import instrument
+
+def pairs(path, singular=3, plural=4, delimiter=",", header=True, encoding="utf-8"):
+    """ Yields (singular, plural)-tuples from the given columns (1 = first) of the given CSV file,
+        skipping the first row if header=True, and rows without both columns.
+    """
+    with io.open(path, encoding=encoding, newline="") as f:
+        rows = csv.reader(f, delimiter=delimiter)
+        if header:
+            rows = islice(rows, 1, None)
+        for row in rows:
+            if len(row) >= max(singular, plural):
+                yield row[singular-1], row[plural-1]
+
+class Direction(object):
+
+    def __init__(self, op, errors=10):
+        """ The accuracy, throughput, rules and errors of pluralize() or singularize().
+        """
+        self.op = op
+        self.words = 0
+        self.correct = 0
+        self.seconds = 0.0
+        self.rules = {}  # rule => [correct, wrong]
+        self.errors = [] # [(input, expected, output)]
+        self.max_errors = errors
+
+    def update(self, inputs, expected, outputs, rules=None):
+        for i, (x, y, z) in enumerate(zip(inputs, expected, outputs)):
+            ok = y == z
+            self.words += 1
+            self.correct += ok
+            if rules is not None:
+                self.rules.setdefault(rules[i], [0, 0])[not ok] += 1
+            if not ok and len(self.errors) < self.max_errors:
+                self.errors.append((x, y, z))
+
+    @property
+    def report(self):
+        r = {
+                    "words": self.words,
+                  "correct": self.correct,
+                 "accuracy": self.words and float(self.correct) / self.words or 0.0,
+                  "seconds": self.seconds,
+         "words_per_second": self.seconds and self.words / self.seconds or 0.0,
+                   "errors": self.errors
+        }
+        if self.rules:
+            r["rules"] = dict((k, {"correct": v[0], "wrong": v[1]}) for k, v in self.rules.items())
+        return r
+
+def _inflect(lang, op, words, rules, kwargs):
+    """ Returns a (outputs, rules, seconds)-tuple for the given list of words.
+    """
+    if not rules:
+        f = function(lang, op, many=True)
+        t = time.perf_counter()
+        a = f(words, **kwargs)
+        return a, None, time.perf_counter() - t
+    # Each unique word is inflected (and traced) once, normalized as pluralize() would
+    # (see grammar.normalize), but without the cache.
+    g = function(lang, op)
+    f = g.function
+    normalize = g.normalize or (lambda w: w)
+    m = {}
+    t = time.perf_counter()
+    for w in dict.fromkeys(words):
+        v = normalize(w) if isinstance(w, str) else w
+        x = f(v, **kwargs)
+        m[w] = (x if v == w else restore(x, w), instrument.rule())
+    t = time.perf_counter() - t
+    return [m[w][0] for w in words], [m[w][1] for w in words], t
+
+def evaluate(pairs, lang="en", chunksize=10000, cache=0, rules=False, errors=10, **kwargs):
+    """ Returns a dict with the accuracy, throughput and errors of pluralize() and singularize()
+        for the given iterable of (singular, plural)-tuples, read only once.
+        With cache > 0, the cache of each function is enabled (see grammar.cache).
+        With rules=True, the number of correct and wrong outputs of each rule is counted.
+        Optional keyword arguments are passed to pluralize() and singularize(), e.g., pos.
+    """
+    m = module(lang)
+    for op in (PLURALIZE, SINGULARIZE):
+        if cache:
+            function(lang, op).cache_enable(cache)
+    enabled = instrument.enabled(lang)
+    if rules and not enabled:
+        instrument.enable(lang)
+    try:
+        d1 = Direction(PLURALIZE, errors)
+        d2 = Direction(SINGULARIZE, errors)
+        for chunk in chunks(pairs, chunksize):
+            sg = [x[0] for x in chunk]
+            pl = [x[1] for x in chunk]
+            for d, inputs, expected in ((d1, sg, pl), (d2, pl, sg)):
+                outputs, r, t = _inflect(lang, d.op, inputs, rules, kwargs)
+                d.seconds += t
+                d.update(inputs, expected, outputs, r)
+    finally:
+        if rules and not enabled:
+            instrument.disable(lang)
+    return {
+        "language": m.__name__.split(".")[-1],
+           "pairs": d1.words,
+       PLURALIZE: d1.report,
+     SINGULARIZE: d2.report
+    }
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m grammar.evaluate",
+        description="Reports the accuracy and words/sec of pluralize() and singularize() on a CSV file.")
+    p.add_argument("input", help="CSV file with a singular and a plural column")
+    p.add_argument("-l", "--language", default="en",
+        help="%s (default: en)" % ", ".join(sorted(LANGUAGES)))
+    p.add_argument("-s", "--singular", type=int, default=3, metavar="N",
+        help="singular column (1 = first, default: 3)")
+    p.add_argument("-p", "--plural", type=int, default=4, metavar="N",
+        help="plural column (1 = first, default: 4)")
+    p.add_argument("-d", "--delimiter", default=",", help="(default: ,)")
+    p.add_argument("--no-header", action="store_true", help="the first row is not a header")
+    p.add_argument("--cache-size", type=int, default=0, metavar="N",
+        help="cache the N most recently inflected words (default: 0 = no cache)")
+    p.add_argument("--rules", action="store_true", help="count correct and wrong outputs per rule (slow)")
+    p.add_argument("--errors", type=int, default=10, metavar="N", help="report N errors (default: 10)")
+    p.add_argument("--json", action="store_true", help="write the report as JSON")
+    o = p.parse_args(argv)
+    r = evaluate(pairs(o.input, o.singular, o.plural, o.delimiter, not o.no_header),
+        lang = o.language,
+       cache = o.cache_size,
+       rules = o.rules,
+      errors = o.errors)
+    if o.json:
+        print(json.dumps(r, indent=2, sort_keys=True, ensure_ascii=False))
+        return 0
+    print("%s: %i pairs" % (r["language"], r["pairs"]))
+    for op in (PLURALIZE, SINGULARIZE):
+        x = r[op]
+        print("%s(): %.4f accuracy (%i/%i), %.0f words/sec" % (
+            op, x["accuracy"], x["correct"], x["words"], x["words_per_second"]))
+        for k, v in sorted(x.get("rules", {}).items(), key=lambda kv: -kv[1]["wrong"]):
+            print("  %6i wrong %6i correct  %s" % (v["wrong"], v["correct"], k))
+        for e in x["errors"]:
+            print("  %s => %s (expected %s)" % (e[0], e[2], e[1]))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,8 @@
 
 import re
 
+from .cache import memoize, many
+
 VERB, NOUN, ADJECTIVE, ADVERB = "VB", "NN", "JJ", "RB"
 
 VOWELS = ("a", "e", "i", "o", "u")
@@ -31,31 +33,67 @@ plural_irregular = {
     "vitrail": "vitraux"
 }
 
-def pluralize(word, pos=NOUN, custom={}):
+# Inflection rules for the word ending, in order: (suffix, inflection).
+plural_inflections = [
+    ("ais", "aises"), ("ois", "oises"), # anglais => anglaises
+    (  "s", "s"    ), (  "x", "x"    ), # prix => prix
+    ( "al", "aux"  ),                   # journal => journaux
+    ( "au", "aux"  ), ( "eu", "eux"  ), # château => châteaux
+    (   "", "s"    )                    # chaise => chaises
+]
+
+def _plural_suffix(w):
+    """ Returns the word with the first matching suffix in plural_inflections replaced, or None.
+    """
+    for a, b in plural_inflections:
+        if w.endswith(a):
+            return w[:len(w)-len(a)] + b
+
+@memoize(normalize=True)
+def pluralize(word, pos=NOUN, custom=None):
     """ Returns the plural of a given word.
         The custom dictionary is for user-defined replacements.
     """
-    if word in custom:
+    if custom is not None and word in custom:
         return custom[word]
-    w = word.lower()
+    w = word
     if w in plural_irregular:
         return plural_irregular[w]
-    if w.endswith(("ais", "ois")):
-        return w + "es"
-    if w.endswith(("s", "x")):
-        return w
-    if w.endswith("al"):
-        return w[:-2] + "aux"
-    if w.endswith(("au", "eu")):
-        return w + "x"
-    return w + "s"
+    x = _plural_suffix(w)
+    if x is not None:
+        return x
+    return w
+
+def pluralize_many(words, pos=NOUN, custom=None):
+    """ Returns a list of plurals for the given iterable of words, see pluralize().
+        Each unique word is inflected only once.
+    """
+    return many(pluralize, words, pos, custom)
 
 #### SINGULARIZE ###################################################################################
 
-def singularize(word, pos=NOUN, custom={}):
-    if word in custom:
+singular_inflections = [
+    ( "nnes", "n"  ), # parisiennes => parisien
+    ( "ntes", "nt" ), # passantes => passant
+    ("euses", "eur"), # danseuses => danseur
+    (    "s", ""   ),
+    (  "aux", "au" ), ("eux", "eu"), ("oux", "ou"),
+    (   "ii", "io" ),
+    (   "ia", "ium"), ( "ma", "mum")
+]
+
+def _singular_suffix(w):
+    """ Returns the word with the first matching suffix in singular_inflections replaced, or None.
+    """
+    for a, b in singular_inflections:
+        if w.endswith(a):
+            return w[:len(w)-len(a)] + b
+
+@memoize(normalize=True)
+def singularize(word, pos=NOUN, custom=None):
+    if custom is not None and word in custom:
         return custom[word]
-    w = word.lower()
+    w = word
     # Common articles, determiners, pronouns:
     if pos in ("DT", "PRP", "PRP$", "WP", "RB", "IN"):
         if w == "du" : return "de"
@@ -69,20 +107,15 @@ def singularize(word, pos=NOUN, custom={}):
         if w == "vos": return "votre"
         if w.endswith(("'", u"’")):
             return w[:-1] + "e"
-    if w.endswith("nnes"):  # parisiennes => parisien
-        return w[:-3]
-    if w.endswith("ntes"):  # passantes => passant
-        return w[:-2]
-    if w.endswith("euses"): # danseuses => danseur
-        return w[:-3] + "r"
-    if w.endswith("s"):
-        return w[:-1]
-    if w.endswith(("aux", "eux", "oux")):
-        return w[:-1]
-    if w.endswith("ii"):
-        return w[:-1] + "o"
-    if w.endswith(("ia", "ma")):
-        return w[:-1] + "um"
+    x = _singular_suffix(w)
+    if x is not None:
+        return x
     if "-" in w:
         return singularize(w.split("-")[0]) + "-" + "-".join(w.split("-")[1:])
     return w
+
+def singularize_many(words, pos=NOUN, custom=None):
+    """ Returns a list of singulars for the given iterable of words, see singularize().
+        Each unique word is inflected only once.
+    """
+    return many(singularize, words, pos, custom)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Finite-state transducers for ordered suffix inflection rules.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# German and French inflect a word ending with ordered lists of (suffix, inflection)-rules,
+# e.g., grammar.german.plural_inflections, where the first rule with a matching suffix wins.
+# A Transducer compiles such a list into a deterministic automaton over the reversed word:
+# each state is a word ending, and stores the first rule that matches any word with that ending.
+# Inflection is then a single right-to-left pass over the word, independent of the number of rules.
+#
+# The transducers are an optional backend for the language modules:
+#
+#   from grammar import fst
+#   fst.install("de")             # compile (or fst.install("de", "german.fst") to load)
+#   fst.save("de", "german.fst")  # write the compiled transducers (JSON)
+#   fst.uninstall("de")
+#
+# Dutch and English are not supported: their rules also depend on word lists,
+# vowel patterns or regular expressions, not only on a fixed suffix.
+
+import json
+
+from . import hooks
+from .parallel import module
+
+FORMAT = 1
+
+# The module functions that look up a word ending, and the rules they use.
+RULES = {
+    "german": {
+          "_plural_suffix": "plural_inflections",
+        "_singular_suffix": "singular_inflections"
+    },
+    "french": {
+          "_plural_suffix": "plural_inflections",
+        "_singular_suffix": "singular_inflections"
+    }
+}
+
+class Transducer(object):
+
+    def __init__(self, rules=()):
+        """ A deterministic transducer compiled from an ordered list of (suffix, inflection)-rules.
+            For a given word, returns the word with the suffix of the first matching rule
+            replaced by its inflection, or None.
+        """
+        self.rules = [(len(a), b) for a, b in rules]
+        self.transitions = [{}] # state => {character: state}
+        self.output = [-1]      # state => index of first matching rule (-1 = none).
+        for i, (a, b) in enumerate(rules):
+            s = 0
+            for ch in reversed(a):
+                t = self.transitions[s].get(ch)
+                if t is None:
+                    t = self.transitions[s][ch] = len(self.transitions)
+                    self.transitions.append({})
+                    self.output.append(-1)
+                s = t
+            if self.output[s] == -1:
+                self.output[s] = i
+        # A word with a given ending also ends with every shorter ending,
+        # so each state takes the first rule of its parent state, if that comes earlier.
+        queue = [0]
+        for s in queue:
+            for t in self.transitions[s].values():
+                if self.output[s] != -1 and (self.output[t] == -1 or self.output[s] < self.output[t]):
+                    self.output[t] = self.output[s]
+                queue.append(t)
+
+    def __call__(self, word):
+        transitions, output = self.transitions, self.output
+        s = 0
+        for ch in reversed(word):
+            t = transitions[s].get(ch)
+            if t is None:
+                break
+            s = t
+        i = output[s]
+        if i >= 0:
+            n, b = self.rules[i]
+            return word[:len(word)-n] + b
+
+    def __len__(self):
+        return len(self.transitions)
+
+    def __getstate__(self):
+        return (FORMAT, self.rules, self.transitions, self.output)
+
+    def __setstate__(self, state):
+        if state[0] != FORMAT:
+            raise ValueError("unsupported transducer format: %r" % state[0])
+        rules, transitions, output = state[1:]
+        if len(transitions) != len(output):
+            raise ValueError("invalid transducer")
+        self.rules = [(n, b) for n, b in rules] # JSON has no tuples.
+        self.transitions = transitions
+        self.output = output
+
+def compile(lang):
+    """ Returns a dict of function name => Transducer for the given language (e.g., "de").
+    """
+    m = module(lang)
+    name = m.__name__.split(".")[-1]
+    if name not in RULES:
+        raise ValueError("no transducers for language: %r" % lang)
+    return dict((k, Transducer(getattr(m, v))) for k, v in RULES[name].items())
+
+def save(lang, path):
+    """ Writes the compiled transducers for the given language to the given file (JSON).
+    """
+    a = dict((k, f.__getstate__()) for k, f in compile(lang).items())
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(a, f, ensure_ascii=False, separators=(",", ":"))
+
+def load(path):
+    """ Returns the dict of function name => Transducer in the given file.
+        Raises ValueError if the file has a different format.
+    """
+    with open(path, encoding="utf-8") as f:
+        a = json.load(f)
+    r = {}
+    for k, state in a.items():
+        r[k] = Transducer()
+        r[k].__setstate__(state)
+    return r
+
+OWNER = "fst"
+
+def install(lang, path=None):
+    """ Makes the given language module use transducers (compiled, or loaded from the given file)
+        to look up word endings.
+    """
+    m = module(lang)
+    a = path and load(path) or compile(lang)
+    for k, f in a.items():
+        hooks.install(m, k, OWNER, lambda g, f=f: f)
+
+def uninstall(lang):
+    """ Restores the default suffix lookup in the given language module.
+    """
+    m = module(lang)
+    for k in RULES.get(m.__name__.split(".")[-1], {}):
+        hooks.uninstall(m, k, OWNER)
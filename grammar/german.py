@@ -19,6 +19,9 @@
 # 72% for pluralize()
 # 84% for singularize() (for nominative)
 
+from .cache import memoize, many
+from . import cascade
+
 VERB, NOUN, ADJECTIVE, ADVERB = "VB", "NN", "JJ", "RB"
 
 #### ARTICLE #######################################################################################
@@ -86,58 +89,157 @@ plural_inflections = [
     ("zer",  "zer"   ), ("zug", u"züge" ), (u"ück", u"ücke" )
 ]
 
-def pluralize(word, pos=NOUN, gender=MALE, role=SUBJECT, custom={}):
+#### SUFFIX INDEX ##################################################################################
+# For performance, the (suffix, inflection)-lists are indexed once, by suffix length.
+# A lookup then takes one dict lookup per distinct suffix length (i.e., 1-3),
+# instead of a w.endswith() for each of the ~200 entries in the list.
+# If more than one suffix matches, the one listed first wins, exactly as in a linear scan.
+# The index is built at import time: changes to the lists afterwards are not picked up.
+
+def suffix_index(inflections):
+    """ Returns a function that, for a given word, returns the word with the first matching suffix
+        in the given list of (suffix, inflection)-tuples replaced, or None.
+    """
+    # The index maps each suffix to its position in the list (a small int, which takes no memory).
+    inflections = tuple(inflections)
+    index = {}
+    for i, (a, b) in enumerate(inflections):
+        index.setdefault(len(a), {}).setdefault(a, i)
+    index = tuple(sorted(index.items()))
+    def inflect(w):
+        n = len(w)
+        m = None
+        for k, suffixes in index:
+            if k > n:
+                break
+            i = suffixes.get(w[n-k:])
+            if i is not None and (m is None or i < m):
+                m = i
+        if m is not None:
+            a, b = inflections[m]
+            return w[:n-len(a)] + b
+    return inflect
+
+_plural_suffix = suffix_index(plural_inflections)
+
+#### COMPOUND NOUNS ################################################################################
+# German compound nouns inflect like their last noun, the head: Haustürschlüssel => Schlüssel.
+# The suffix rules only see the last few letters of a compound, so for known heads
+# the head is inflected, and the rest of the compound is kept: Bundesgerichte, Haustürschlüssel.
+# The longest known head wins, and at least 2 letters must precede it (Traum is not T + Raum).
+# A head with inflection None is inflected by the rules when it is first needed, and then cached,
+# so that it serves all compounds with this head.
+# The indices are built at import time: call index_compound_heads() after changing the dict.
+
+compound_heads = {
+    u"amt"       : u"ämter"     , u"antrag"    : u"anträge"   , u"arbeit"    : u"arbeiten"  ,
+    u"bahn"      : u"bahnen"    , u"baum"      : u"bäume"     , u"bericht"   : u"berichte"  ,
+    u"bild"      : u"bilder"    , u"brief"     : u"briefe"    , u"bruder"    : u"brüder"    ,
+    u"buch"      : u"bücher"    , u"dach"      : u"dächer"    , u"dorf"      : u"dörfer"    ,
+    u"fach"      : u"fächer"    , u"feld"      : u"felder"    , u"fenster"   : u"fenster"   ,
+    u"flug"      : u"flüge"     , u"frau"      : u"frauen"    , u"fuß"       : u"füße"      ,
+    u"gans"      : u"gänse"     , u"garten"    : u"gärten"    , u"gast"      : u"gäste"     ,
+    u"geld"      : u"gelder"    , u"gericht"   : u"gerichte"  , u"gesetz"    : u"gesetze"   ,
+    u"glas"      : u"gläser"    , u"hafen"     : u"häfen"     , u"hand"      : u"hände"     ,
+    u"haus"      : u"häuser"    , u"hof"       : u"höfe"      , u"kind"      : u"kinder"    ,
+    u"kopf"      : u"köpfe"     , u"kraft"     : u"kräfte"    , u"kreis"     : u"kreise"    ,
+    u"licht"     : u"lichter"   , u"markt"     : u"märkte"    , u"maus"      : u"mäuse"     ,
+    u"mutter"    : u"mütter"    , u"nacht"     : u"nächte"    , u"plan"      : u"pläne"     ,
+    u"platz"     : u"plätze"    , u"preis"     : u"preise"    , u"raum"      : u"räume"     ,
+    u"recht"     : u"rechte"    , u"saal"      : u"säle"      , u"sack"      : u"säcke"     ,
+    u"schiff"    : u"schiffe"   , u"schlüssel" : u"schlüssel" , u"schrank"   : u"schränke"  ,
+    u"spiel"     : u"spiele"    , u"stadt"     : u"städte"    , u"stand"     : u"stände"    ,
+    u"straße"    : u"straßen"   , u"stück"     : u"stücke"    , u"stuhl"     : u"stühle"    ,
+    u"tisch"     : u"tische"    , u"tochter"   : u"töchter"   , u"topf"      : u"töpfe"     ,
+    u"tür"       : u"türen"     , u"turm"      : u"türme"     , u"vater"     : u"väter"     ,
+    u"vertrag"   : u"verträge"  , u"vogel"     : u"vögel"     , u"wand"      : u"wände"     ,
+    u"weg"       : u"wege"      , u"werk"      : u"werke"     , u"wurst"     : u"würste"    ,
+    u"zeit"      : u"zeiten"    , u"zimmer"    : u"zimmer"    , u"zug"       : u"züge"      ,
+    u"gesellschaft": u"gesellschaften", u"wirtschaft": u"wirtschaften"
+}
+
+def compound_index(heads, inflect=None, prefix=2):
+    """ Returns a function that, for a given word, returns the word with its longest head
+        in the given dict of head => inflection inflected, or None.
+        Heads with inflection None are inflected with the given function (once).
+    """
+    index = {}
+    for h in sorted(heads, key=len, reverse=True):
+        index[h[-3:]] = index.get(h[-3:], ()) + (h,)
+    cache = dict(heads)
+    def inflect_compound(w):
+        a = index.get(w[-3:])
+        if a is not None:
+            for h in a:
+                k = len(w) - len(h)
+                if (k == 0 or k >= prefix) and w.endswith(h):
+                    x = cache[h]
+                    if x is None:
+                        x = cache[h] = inflect(h)
+                    return w[:k] + x
+    return inflect_compound
+
+def index_compound_heads():
+    """ Rebuilds the compound indices of pluralize() and singularize() from compound_heads.
+    """
+    global _plural_compound, _singular_compound
+    _plural_compound = compound_index(compound_heads, lambda h: _plural_suffix(h) or _plural_rules(h))
+    _singular_compound = compound_index(dict((v, k) for k, v in compound_heads.items() if v is not None))
+
+# Default rules (baseline = 69%), in order: the first rule that matches the lowercase word w
+# returns the plural. Each rule is a (name, condition, plural)-tuple, compiled into a function
+# (see grammar.cascade), where the condition has optional words, suffixes, exclude and test.
+plural_rules = [
+    ("ge"  , {"test": lambda w: w.startswith("ge")}, lambda w: w),
+    ("gie" , {"suffixes": ("gie",)}, lambda w: w),
+    ("en"  , {"suffixes": ("e",)}, lambda w: w + "n"),
+    ("ium" , {"suffixes": ("ien",)}, lambda w: w[:-2] + "um"),
+    ("-"   , {"suffixes": ("au", "ein", "eit", "er", "en", "el", "chen", "mus", u"tät", "tik", "tum", "u")}, lambda w: w),
+    ("-en" , {"suffixes": ("ant", "ei", "enz", "ion", "ist", "or", "schaft", "tur", "ung")}, lambda w: w + "en"),
+    ("nen" , {"suffixes": ("in",)}, lambda w: w + "nen"),
+    ("se"  , {"suffixes": ("nis",)}, lambda w: w + "se"),
+    ("er"  , {"suffixes": ("eld", "ild", "ind")}, lambda w: w + "er"),
+    ("s"   , {"suffixes": ("o",)}, lambda w: w + "s"),
+    ("a"   , {"suffixes": ("a",)}, lambda w: w[:-1] + "en"),
+    # Inflect common umlaut vowels: Kopf => Köpfe.
+    ("umlaut", {"suffixes": ("all", "and", "ang", "ank", "atz", "auf", "ock", "opf", "uch", "uss")},
+        lambda w: w[:-3] + w[-3].replace("a", u"ä").replace("o", u"ö").replace("u", u"ü") + w[-2:] + "e"),
+    ("ag"  , {"suffixes": ("ag",)}, lambda w: w[:-2] + u"äge"),
+    ("ann" , {"suffixes": ("ann",)}, lambda w: w[:-3] + u"änner"),
+    ("aum" , {"suffixes": ("aum",)}, lambda w: w[:-3] + u"äume"),
+    ("aus" , {"suffixes": ("aus",)}, lambda w: w[:-3] + u"äuser"),
+    ("zug" , {"suffixes": ("zug",)}, lambda w: w[:-3] + u"züge"),
+    ("e"   , {}, lambda w: w + "e")
+]
+
+_plural_rules = cascade.compile(plural_rules, globals())
+
+index_compound_heads()
+
+@memoize(normalize=True)
+def pluralize(word, pos=NOUN, gender=MALE, role=SUBJECT, custom=None):
     """ Returns the plural of a given word.
         The inflection is based on probability rather than gender and role.
     """
-    w = word.lower()
-    if word in custom:
+    w = word
+    if custom is not None and word in custom:
         return custom[word]
     if pos == NOUN:
-        for a, b in plural_inflections:
-            if w.endswith(a):
-                return w[:-len(a)] + b
-        # Default rules (baseline = 69%).
-        if w.startswith("ge"):
-            return w
-        if w.endswith("gie"):
-            return w
-        if w.endswith("e"):
-            return w + "n"
-        if w.endswith("ien"):
-            return w[:-2] + "um"
-        if w.endswith(("au", "ein", "eit", "er", "en", "el", "chen", "mus", u"tät", "tik", "tum", "u")):
-            return w
-        if w.endswith(("ant", "ei", "enz", "ion", "ist", "or", "schaft", "tur", "ung")):
-            return w + "en"
-        if w.endswith("in"):
-            return w + "nen"
-        if w.endswith("nis"):
-            return w + "se"
-        if w.endswith(("eld", "ild", "ind")):
-            return w + "er"
-        if w.endswith("o"):
-            return w + "s"
-        if w.endswith("a"):
-            return w[:-1] + "en"
-        # Inflect common umlaut vowels: Kopf => Köpfe.
-        if w.endswith(("all", "and", "ang", "ank", "atz", "auf", "ock", "opf", "uch", "uss")):
-            umlaut = w[-3]
-            umlaut = umlaut.replace("a", u"ä")
-            umlaut = umlaut.replace("o", u"ö")
-            umlaut = umlaut.replace("u", u"ü")
-            return w[:-3] + umlaut + w[-2:] + "e"
-        for a, b in (
-          ("ag",  u"äge"),
-          ("ann", u"änner"),
-          ("aum", u"äume"),
-          ("aus", u"äuser"),
-          ("zug", u"züge")):
-            if w.endswith(a):
-                return w[:-len(a)] + b
-        return w + "e"
+        x = _plural_compound(w)
+        if x is not None:
+            return x
+        x = _plural_suffix(w)
+        if x is not None:
+            return x
+        return _plural_rules(w)
     return w
 
+def pluralize_many(words, pos=NOUN, gender=MALE, role=SUBJECT, custom=None):
+    """ Returns a list of plurals for the given iterable of words, see pluralize().
+        Each unique word is inflected only once.
+    """
+    return many(pluralize, words, pos, gender, role, custom)
+
 #### SINGULARIZE ###################################################################################
 
 singular_inflections = [
@@ -187,23 +289,29 @@ singular_inflections = [
     (   "ver", "ver"), (   "zer",  "zer"),
 ]
 
+_singular_suffix = suffix_index(singular_inflections)
+
 singular = {
-    u"Löwen": u"Löwe",
+    u"löwen": u"löwe",
 }
 
-def singularize(word, pos=NOUN, gender=MALE, role=SUBJECT, custom={}):
+@memoize(normalize=True)
+def singularize(word, pos=NOUN, gender=MALE, role=SUBJECT, custom=None):
     """ Returns the singular of a given word.
         The inflection is based on probability rather than gender and role.
     """
-    w = word.lower()
-    if word in custom:
+    w = word
+    if custom is not None and word in custom:
         return custom[word]
     if word in singular:
         return singular[word]
     if pos == NOUN:
-        for a, b in singular_inflections:
-            if w.endswith(a):
-                return w[:-len(a)] + b
+        x = _singular_compound(w)
+        if x is not None:
+            return x
+        x = _singular_suffix(w)
+        if x is not None:
+            return x
         # Default rule: strip known plural suffixes (baseline = 51%).
         for suffix in ("nen", "en", "n", "e", "er", "s"):
             if w.endswith(suffix):
@@ -214,3 +322,9 @@ def singularize(word, pos=NOUN, gender=MALE, role=SUBJECT, custom={}):
             return w + "e"
         return w
     return w
+
+def singularize_many(words, pos=NOUN, gender=MALE, role=SUBJECT, custom=None):
+    """ Returns a list of singulars for the given iterable of words, see singularize().
+        Each unique word is inflected only once.
+    """
+    return many(singularize, words, pos, gender, role, custom)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Layers of replacements for the functions and rules of the language modules.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# Several modules replace a function or a table in a language module, and restore it later:
+# - grammar.overrides wraps pluralize.function (exceptions loaded at runtime),
+# - grammar.instrument wraps pluralize.function, and replaces tables (statistics),
+# - grammar.fst replaces the suffix lookup (transducers),
+# - grammar.cascade replaces the compiled cascade (reordered rules).
+# Each of these is a layer on the attribute, installed by its owner on top of the layers below:
+#
+#   hooks.install(grammar.english.pluralize, "function", "overrides", lambda f: wrap(f))
+#   hooks.uninstall(grammar.english.pluralize, "function", "overrides")
+#
+# A layer is a function that takes the value below it and returns the value that replaces it
+# (a wrapper, or a new value that ignores the value below, e.g., a transducer).
+# Removing a layer removes only that layer, in any order: the layers above it are rebuilt
+# on the value below it (the layers below are kept as they are),
+# and the original value is restored when no layers are left.
+
+import threading
+
+_lock = threading.RLock()
+_hooks = {} # (id(object), attribute) => Hook
+
+class Hook(object):
+
+    def __init__(self, object, attribute):
+        """ The layers installed on the given attribute of the given object (e.g., a module).
+        """
+        self.object = object
+        self.attribute = attribute
+        self.original = getattr(object, attribute)
+        self.layers = [] # [(owner, layer)], from bottom to top.
+        self.values = [] # The value of each layer.
+
+    def owners(self):
+        return [owner for owner, layer in self.layers]
+
+    def build(self, i=0):
+        """ Rebuilds the layers from the given index upwards (the layers below are kept).
+        """
+        del self.values[i:]
+        v = self.values[-1] if self.values else self.original
+        for owner, layer in self.layers[i:]:
+            v = layer(v)
+            self.values.append(v)
+        setattr(self.object, self.attribute, v)
+
+def install(object, attribute, owner, layer):
+    """ Sets (or replaces) the layer of the given owner on the given attribute.
+        A replaced layer keeps its place among the other layers.
+    """
+    with _lock:
+        k = (id(object), attribute)
+        h = _hooks.get(k)
+        if h is None:
+            h = _hooks[k] = Hook(object, attribute)
+        i = h.owners().index(owner) if owner in h.owners() else len(h.layers)
+        h.layers[i:i+1] = [(owner, layer)]
+        h.build(i)
+
+def uninstall(object, attribute, owner):
+    """ Removes the layer of the given owner from the given attribute, keeping the other layers.
+        Returns True if a layer was removed.
+    """
+    with _lock:
+        k = (id(object), attribute)
+        h = _hooks.get(k)
+        if h is None or owner not in h.owners():
+            return False
+        i = h.owners().index(owner)
+        del h.layers[i]
+        if h.layers:
+            h.build(i)
+        else:
+            setattr(object, attribute, h.original)
+            del _hooks[k]
+        return True
+
+def installed(object, attribute, owner):
+    """ Returns True if the given owner has a layer on the given attribute.
+    """
+    h = _hooks.get((id(object), attribute))
+    return h is not None and owner in h.owners()
+
+def owners(object, attribute):
+    """ Returns the list of owners of the layers on the given attribute, from bottom to top.
+    """
+    h = _hooks.get((id(object), attribute))
+    return h.owners() if h is not None else []
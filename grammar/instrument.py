@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+# Statistics of the rules that decide the output of pluralize() and singularize().
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# To find out which rules are used most (e.g., to reorder them), or why a word is slow or wrong,
+# instrumentation can be enabled for each language module:
+#
+#   import grammar
+#   grammar.instrument.enable("en")
+#   grammar.english.pluralize("child")
+#   grammar.stats()["english.pluralize"]["rules"][0]
+#   # {"rule": "plural_rules[5]: child$ => children", "hits": 1, "evaluated": 6.0, "seconds": ...}
+#   grammar.instrument.reset()
+#   grammar.instrument.disable()
+#
+# For each call of pluralize() or singularize(), the rule that decides the output is either:
+# - a rule in a table (e.g., grammar.english.singular_rules, grammar.dutch.plural_rules),
+# - a return statement (e.g., in grammar.dutch.singularize()),
+# and the statistics count, for each rule:
+# - hits: the number of calls decided by the rule,
+# - evaluated: the mean number of conditions (if-statements) and table rules evaluated in such a call,
+# - seconds: the time spent in such calls (including recursive calls, e.g., for compound words).
+# Calls answered by the cache (see grammar.cache) are not counted.
+# When enabled, the functions run much slower (with sys.settrace()).
+# When disabled, the original functions and rules are restored, so there is no overhead.
+# Instrumentation is a layer on the functions and rules (see grammar.hooks), so it can be enabled
+# and disabled in any order with grammar.overrides, grammar.fst and grammar.cascade.
+
+import re
+import sys
+import ast
+import time
+import inspect
+import textwrap
+import linecache
+import threading
+
+from . import hooks
+from .parallel import module, LANGUAGES, PLURALIZE, SINGULARIZE
+from .fst import RULES
+from .cascade import CASCADES, predicate
+
+_lock = threading.Lock()
+_local = threading.local()
+_counts = {} # "english.pluralize" => {rule: [hits, evaluated, seconds]}
+
+OWNER = "instrument"
+
+class Call(object):
+
+    __slots__ = ("frame", "rule", "line", "tried", "evaluated")
+
+    def __init__(self):
+        """ The state of one (traced) call of pluralize() or singularize().
+        """
+        self.frame = None     # The frame of the call.
+        self.rule = None      # The table rule that matched.
+        self.line = None      # The line of the return statement.
+        self.tried = set()    # The regular expressions that were tried.
+        self.evaluated = 0    # The number of conditions and table rules evaluated.
+
+def _current():
+    stack = getattr(_local, "stack", None)
+    if stack:
+        return stack[-1]
+
+def _record(name, rule, evaluated, seconds):
+    with _lock:
+        a = _counts.setdefault(name, {}).setdefault(rule, [0, 0, 0.0])
+        a[0] += 1
+        a[1] += evaluated
+        a[2] += seconds
+
+#### FUNCTIONS #####################################################################################
+
+def conditions(function):
+    """ Returns the set of line numbers of if-statements in the given function.
+    """
+    code = function.__code__
+    tree = ast.parse(textwrap.dedent(inspect.getsource(function)))
+    return set(node.lineno + code.co_firstlineno - 1
+        for node in ast.walk(tree) if isinstance(node, ast.If))
+
+def traced(function, name):
+    """ Returns a wrapper for the given function that records the rule that decides each call.
+    """
+    code = function.__code__
+    lines = conditions(function)
+    labels = {}
+    def label(line):
+        if line not in labels:
+            labels[line] = "line %s: %s" % (line, linecache.getline(code.co_filename, line).strip())
+        return labels[line]
+    def trace_call(frame, event, arg):
+        c = _current()
+        if c is None or c.frame is not None or frame.f_code is not code:
+            return None
+        c.frame = frame
+        def trace(frame, event, arg):
+            if event == "line":
+                if frame.f_lineno in lines:
+                    c.evaluated += 1
+            elif event == "return":
+                c.line = frame.f_lineno
+            return trace
+        return trace
+    def wrapper(*args, **kwargs):
+        stack = _local.__dict__.setdefault("stack", [])
+        c = Call()
+        stack.append(c)
+        f = sys.gettrace()
+        sys.settrace(trace_call)
+        t = time.perf_counter()
+        try:
+            v = function(*args, **kwargs)
+        finally:
+            t = time.perf_counter() - t
+            sys.settrace(f)
+            stack.pop()
+        rule = c.rule or label(c.line)
+        _record(name, rule, c.evaluated + len(c.tried), t)
+        _local.rule = rule
+        return v
+    wrapper.__wrapped__ = function
+    return wrapper
+
+#### RULES #########################################################################################
+
+class Regex(object):
+
+    def __init__(self, regex, label):
+        """ A compiled regular expression that counts calls to search() (rules tried)
+            and to sub() (the rule that matched) in the current call.
+        """
+        self.regex = regex
+        self.label = label
+        self.pattern = regex.pattern
+        self.flags = regex.flags
+
+    def search(self, *args, **kwargs):
+        c = _current()
+        if c is not None:
+            c.tried.add(self)
+        return self.regex.search(*args, **kwargs)
+
+    def sub(self, *args, **kwargs):
+        c = _current()
+        if c is not None:
+            c.rule = self.label
+        return self.regex.sub(*args, **kwargs)
+
+class Pattern(str):
+    """ A regular expression pattern with a label, e.g., "plural_rules[14]: $ => s".
+    """
+    label = None
+
+def labelled(pattern, label):
+    p = Pattern(pattern)
+    p.label = label
+    return p
+
+def labelled_rules(rules, name):
+    """ Returns a copy of the given table in grammar.english (plural_rules or singular_rules),
+        with labelled patterns.
+    """
+    def label(i, r):
+        return (labelled(r[0], "%s[%i]: %s => %s" % (name, i, r[0], r[1])),) + tuple(r[1:])
+    if name == "plural_rules":
+        return [[label(i, r) for r in a] for i, a in enumerate(rules)]
+    return [label(i, r) for i, r in enumerate(rules)]
+
+def regex(m):
+    """ Returns a replacement for re.compile() in grammar.english.
+    """
+    irregular = dict((k + "$", "singular_irregular: %s => %s" % (k, v))
+        for k, v in m.singular_irregular.items())
+    def compile(pattern):
+        label = getattr(pattern, "label", None) or irregular.get(pattern, pattern)
+        return Regex(re.compile(pattern), label)
+    return compile
+
+def suffix_rules(inflections, name):
+    """ Returns a replacement for the suffix lookup of the given list of (suffix, inflection)-rules
+        (see grammar.german.suffix_index()), that tries the rules one by one.
+    """
+    labels = ["%s[%i]: -%s => -%s" % (name, i, a, b) for i, (a, b) in enumerate(inflections)]
+    def inflect(w):
+        c = _current()
+        for i, (a, b) in enumerate(inflections):
+            if w.endswith(a):
+                if c is not None:
+                    c.evaluated += i + 1
+                    c.rule = labels[i]
+                return w[:len(w)-len(a)] + b
+        if c is not None:
+            c.evaluated += len(inflections)
+    return inflect
+
+def cascade_rules(rules, name, namespace):
+    """ Returns a replacement for the compiled cascade of the given rules (see grammar.cascade),
+        that tries the rules one by one (in the original order).
+    """
+    labels = ["%s[%i]: %s" % (name, i, rule[0]) for i, rule in enumerate(rules)]
+    tests = [(predicate(rule, namespace), rule[2]) for rule in rules]
+    def inflect(w):
+        c = _current()
+        for i, (test, output) in enumerate(tests):
+            if test(w):
+                if c is not None:
+                    c.evaluated += i + 1
+                    c.rule = labels[i]
+                return output(w)
+        if c is not None:
+            c.evaluated += len(tests)
+    return inflect
+
+def _clear(m):
+    # Rules in grammar.english are compiled when first needed (again).
+    if hasattr(m, "_regex"):
+        m.plural_rules_compiled.clear()
+        m.singular_rules_compiled = None
+        m.singular_irregular_compiled.clear()
+
+#### INSTRUMENT ####################################################################################
+
+def _layers(m):
+    """ Returns a list of (object, attribute, layer) for the given language module.
+    """
+    name = m.__name__.split(".")[-1]
+    a = []
+    for op in (PLURALIZE, SINGULARIZE):
+        a.append((getattr(m, op), "function", lambda f, k="%s.%s" % (name, op): traced(f, k)))
+    for k, v in RULES.get(name, {}).items():
+        a.append((m, k, lambda f, v=v: suffix_rules(getattr(m, v), v)))
+    for k, v in CASCADES.get(name, {}).items():
+        a.append((m, k, lambda f, v=v: cascade_rules(getattr(m, v), v, vars(m))))
+    if hasattr(m, "_regex"):
+        for k in ("plural_rules", "singular_rules"):
+            a.append((m, k, lambda rules, k=k: labelled_rules(rules, k)))
+        a.append((m, "_regex", lambda f: regex(m)))
+    return a
+
+def enable(*languages):
+    """ Enables instrumentation of pluralize() and singularize() in the given languages (or all).
+    """
+    for lang in languages or sorted(LANGUAGES):
+        m = module(lang)
+        if enabled(lang):
+            continue
+        for x, k, f in _layers(m):
+            hooks.install(x, k, OWNER, f)
+        _clear(m)
+
+def disable(*languages):
+    """ Disables instrumentation in the given languages (or all), restoring the original functions
+        (or the layers installed by other modules, see grammar.hooks).
+    """
+    for lang in languages or sorted(LANGUAGES):
+        m = module(lang)
+        if not enabled(lang):
+            continue
+        for x, k, f in _layers(m):
+            hooks.uninstall(x, k, OWNER)
+        _clear(m)
+
+def enabled(lang):
+    return hooks.installed(getattr(module(lang), PLURALIZE), "function", OWNER)
+
+def rule():
+    """ Returns the rule that decided the last (instrumented) call in this thread, or None.
+    """
+    return getattr(_local, "rule", None)
+
+def reset():
+    """ Resets the statistics.
+    """
+    with _lock:
+        _counts.clear()
+
+def stats():
+    """ Returns a dict of "language.function" => {"calls", "seconds", "rules"},
+        where rules is a list of dicts with the rule, hits, mean number of conditions
+        and rules evaluated, and seconds, sorted by most hits first.
+    """
+    r = {}
+    with _lock:
+        for name, rules in _counts.items():
+            a = [{
+                     "rule": k,
+                     "hits": v[0],
+                "evaluated": float(v[1]) / v[0],
+                  "seconds": v[2]
+            } for k, v in rules.items()]
+            a.sort(key=lambda x: (-x["hits"], x["rule"]))
+            r[name] = {
+                  "calls": sum(x["hits"] for x in a),
+                "seconds": sum(x["seconds"] for x in a),
+                  "rules": a
+            }
+    return r
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Singularization by inverting pluralize(): generate candidate singulars, and verify them.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# singularize() has its own rules, which do not always agree with pluralize(),
+# e.g., pluralize(singularize(w)) != w for some plurals w. For consistent round-trips
+# (e.g., to normalize search queries), Inverse returns a singular s for which pluralize(s) == w:
+# 1) the output of singularize(w), if pluralize() maps it back to w (true for most words),
+# 2) a candidate generated by undoing a suffix edit of pluralize() (e.g., -ies => -y, -ves => -f),
+#    tried from the longest plural ending, if pluralize() maps it back to w,
+# 3) otherwise, the output of singularize(w).
+# The suffix edits are learned by running pluralize() on the words and suffixes in the rules
+# of the language module (and on more words with learn()).
+# Words that do not end with a learned plural ending are not plurals, and skip 1-2.
+# Results are cached:
+#
+#   from grammar.inverse import Inverse
+#   singularize = Inverse("en")
+#   singularize("wolves") # "wolf"
+
+import re
+
+from .parallel import module, function, PLURALIZE, SINGULARIZE
+from .cache import LRUCache, _MISSING
+from .normalize import fold, restore
+
+def edit(singular, plural):
+    """ Returns a (singular ending, plural ending)-tuple, after their longest common prefix,
+        e.g., ("wolf", "wolves") => ("f", "ves").
+    """
+    a, b = singular.lower(), plural.lower()
+    i = 0
+    n = min(len(a), len(b))
+    while i < n and a[i] == b[i]:
+        i += 1
+    return a[i:], b[i:]
+
+def vocabulary(m):
+    """ Returns the set of words in the rules of the given language module (lists, sets, dicts),
+        and of the literal endings of its regular expressions (e.g., "([^aeiouy]|qu)y$" => "y").
+    """
+    words = set()
+    stack = [v for k, v in vars(m).items() if not k.startswith("_") and isinstance(v, (list, tuple, set, dict))]
+    while stack:
+        v = stack.pop()
+        if isinstance(v, dict):
+            stack.extend(v.keys())
+            stack.extend(v.values())
+        elif isinstance(v, (list, tuple, set, frozenset)):
+            stack.extend(v)
+        elif isinstance(v, str):
+            if v.isalpha():
+                words.add(v)
+            else:
+                x = re.search(r"(\w+)\$$", v)
+                if x is not None:
+                    words.add(x.group(1))
+    # Endings (e.g., "y", "aal") are also tried after a few stems.
+    for w in list(words):
+        if len(w) <= 4:
+            words.update(stem + w for stem in ("b", "ka", "tr"))
+    return words
+
+class Inverse(object):
+
+    def __init__(self, lang="en", cache=100000, **kwargs):
+        """ A singularize() function that returns singulars that pluralize() maps back to the word,
+            caching at most the given number of results.
+            Optional keyword arguments are passed to pluralize() and singularize(), e.g., pos.
+        """
+        self.lang = lang
+        self.kwargs = kwargs
+        self._pluralize = function(lang, PLURALIZE) # Raises ValueError.
+        self._singularize = function(lang, SINGULARIZE)
+        self._edits = {}  # plural ending => {singular ending: count}
+        self._index = ()  # ((length, {plural ending: [singular ending]}), ...), longest first
+        self.cache = LRUCache(cache)
+        self.learn(vocabulary(module(lang)))
+
+    def learn(self, words):
+        """ Learns the suffix edits of pluralize() for the given iterable of (singular) words.
+        """
+        for w in words:
+            if w:
+                a, b = edit(w, self._pluralize(w, **self.kwargs))
+                if b:
+                    e = self._edits.setdefault(b, {})
+                    e[a] = e.get(a, 0) + 1
+        index = {}
+        for b, e in self._edits.items():
+            index.setdefault(len(b), {})[b] = sorted(e, key=lambda a: (-e[a], a))
+        self._index = tuple(sorted(index.items(), reverse=True))
+        self.cache.clear()
+
+    def candidates(self, word):
+        """ Returns a list of candidate singulars (normalized, see grammar.normalize)
+            for the given plural, undoing the longest plural endings first.
+        """
+        v = fold(word)
+        n = len(v)
+        a = []
+        for k, edits in self._index:
+            if k <= n:
+                for x in edits.get(v[n-k:], ()):
+                    a.append(v[:n-k] + x)
+        return a
+
+    def __call__(self, word):
+        """ Returns the singular of the given word, for which pluralize() returns the word, if any.
+        """
+        v = self.cache.get(word, _MISSING)
+        if v is not _MISSING:
+            return v
+        s = self._singularize(word, **self.kwargs)
+        a = self.candidates(word)
+        if a:
+            w = fold(word)
+            if fold(self._pluralize(s, **self.kwargs)) != w:
+                for x in a:
+                    if self._pluralize(x, **self.kwargs) == w:
+                        s = restore(x, word)
+                        break
+        self.cache.set(word, s)
+        return s
+
+    singularize = __call__
+
+    def singularize_many(self, words):
+        """ Returns a list of singulars for the given iterable of words.
+        """
+        return [self(w) for w in words]
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# Precomputed, memory-mapped lookup tables of word => plural (or singular).
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# For a known vocabulary, pluralize() and singularize() always return the same output.
+# build() runs the rules once over a list of words and writes the results to a file,
+# which Lexicon maps into memory (read-only), so that all processes on a host share one copy.
+# Words are stored and looked up in their normalized form (see grammar.normalize), so "Katze" and
+# "katze" share one entry. Words that are not in the file are inflected with the rules:
+#
+#   from grammar.lexicon import build, Lexicon
+#   build(open("nouns.txt").read().split(), "de-pluralize.lex", lang="de", op="pluralize")
+#   lexicon = Lexicon("de-pluralize.lex")
+#   lexicon("Katze") # "Katzen"
+#
+# File layout (native byte order, 4-byte aligned):
+# - header: magic, byte order, length + JSON (language, operation, arguments, number of words n),
+# - hash table: m = 2**k >= 2n slots with the index + 1 of a word (0 = empty slot),
+# - key offsets: n + 1 offsets in the keys blob, for the words in sorted order,
+# - value offsets: n + 1 offsets in the values blob,
+# - keys blob, values blob (UTF-8).
+# A lookup hashes the word (CRC-32), and probes the table from slot hash % m onwards (linear probing).
+
+import io
+import sys
+import mmap
+import json
+import zlib
+import struct
+import argparse
+
+from array import array
+
+from .parallel import function, LANGUAGES, PLURALIZE, SINGULARIZE
+from .normalize import restore
+
+MAGIC = b"GLEX"
+
+def _hash(b):
+    return zlib.crc32(b)
+
+def _align(f):
+    f.write(b"\0" * (-f.tell() % 4))
+
+def build(words, path, lang="en", op=PLURALIZE, **kwargs):
+    """ Writes the plural or singular of each unique word in the given iterable to the given file,
+        using pluralize() or singularize() with the given optional arguments (e.g., pos).
+        Returns the number of words.
+    """
+    f = function(lang, op)
+    # Words are stored in their normalized form (see grammar.normalize), as the cache does.
+    normalize = f.normalize or (lambda w: w)
+    words = set(normalize(w) for w in words)
+    entries = sorted((w.encode("utf-8"), f(w, **kwargs).encode("utf-8")) for w in words)
+    n = len(entries)
+    m = 1
+    while m < n * 2:
+        m *= 2
+    table = array("I", [0]) * m
+    for i, (k, v) in enumerate(entries):
+        j = _hash(k) % m
+        while table[j]:
+            j = (j + 1) % m
+        table[j] = i + 1
+    ko = array("I", [0])
+    vo = array("I", [0])
+    for k, v in entries:
+        ko.append(ko[-1] + len(k))
+        vo.append(vo[-1] + len(v))
+    header = json.dumps({
+        "language": lang,
+        "operation": op,
+        "arguments": kwargs,
+        "words": n,
+        "slots": m
+    }).encode("utf-8")
+    with open(path, "wb") as fp:
+        fp.write(MAGIC)
+        fp.write(sys.byteorder == "little" and b"<" or b">")
+        _align(fp)
+        fp.write(struct.pack("=I", len(header)))
+        fp.write(header)
+        _align(fp)
+        table.tofile(fp)
+        ko.tofile(fp)
+        vo.tofile(fp)
+        fp.write(b"".join(k for k, v in entries))
+        fp.write(b"".join(v for k, v in entries))
+    return n
+
+class Lexicon(object):
+
+    def __init__(self, path):
+        """ A read-only, memory-mapped table of words built with build(),
+            that inflects unknown words with the rules.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:4] != MAGIC:
+            raise ValueError("not a lexicon file: %r" % path)
+        if mm[4:5] != (sys.byteorder == "little" and b"<" or b">"):
+            raise ValueError("lexicon file has a different byte order: %r" % path)
+        i = 8
+        n, = struct.unpack_from("=I", mm, i)
+        i += 4
+        header = json.loads(mm[i:i+n].decode("utf-8"))
+        i += n + (-(i + n) % 4)
+        self.lang = header["language"]
+        self.op = header["operation"]
+        self.kwargs = header["arguments"]
+        self._function = function(self.lang, self.op)
+        self._normalize = self._function.normalize
+        n = self._n = header["words"]
+        m = self._m = header["slots"]
+        mv = self._view = memoryview(mm)
+        self._table = mv[i:i + m * 4].cast("I")
+        i += m * 4
+        self._ko = mv[i:i + (n + 1) * 4].cast("I")
+        i += (n + 1) * 4
+        self._vo = mv[i:i + (n + 1) * 4].cast("I")
+        i += (n + 1) * 4
+        self._keys = i
+        self._values = i + self._ko[n]
+
+    def _find(self, word):
+        # The word is normalized, and the stored inflection is given the case of the word.
+        w = word
+        if self._normalize is not None and not (w.isascii() and w.islower()):
+            w = self._normalize(w)
+        v = self._get(w)
+        if v is not None and w != word:
+            v = restore(v, word)
+        return v
+
+    def _get(self, word):
+        k = word.encode("utf-8")
+        m = self._m
+        j = _hash(k) % m
+        while True:
+            i = self._table[j]
+            if i == 0:
+                return None
+            i -= 1
+            a = self._keys + self._ko[i]
+            b = self._keys + self._ko[i+1]
+            if self._mmap[a:b] == k:
+                return self._mmap[self._values + self._vo[i]:self._values + self._vo[i+1]].decode("utf-8")
+            j = (j + 1) % m
+
+    def get(self, word, default=None):
+        """ Returns the inflection of the given word from the table, or the default.
+        """
+        v = self._find(word)
+        return default if v is None else v
+
+    def __getitem__(self, word):
+        v = self._find(word)
+        if v is None:
+            raise KeyError(word)
+        return v
+
+    def __contains__(self, word):
+        return self._find(word) is not None
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        """ Yields the words in the table, in sorted (UTF-8) order.
+        """
+        for i in range(self._n):
+            yield self._mmap[self._keys + self._ko[i]:self._keys + self._ko[i+1]].decode("utf-8")
+
+    def __call__(self, word):
+        """ Returns the inflection of the given word, from the table or else from the rules.
+        """
+        v = self._find(word)
+        if v is None:
+            v = self._function(word, **self.kwargs)
+        return v
+
+    def close(self):
+        self._table.release()
+        self._ko.release()
+        self._vo.release()
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m grammar.lexicon",
+        description="Builds a lexicon file from a list of words (one per line).")
+    p.add_argument("op", choices=(PLURALIZE, SINGULARIZE))
+    p.add_argument("input", help="word list, or - for standard input")
+    p.add_argument("output", help="lexicon file")
+    p.add_argument("-l", "--language", default="en",
+        help="%s (default: en)" % ", ".join(sorted(LANGUAGES)))
+    p.add_argument("-p", "--pos", default=None,
+        help="part-of-speech tag passed to pluralize() or singularize() (default: NN)")
+    o = p.parse_args(argv)
+    kwargs = o.pos and {"pos": o.pos} or {}
+    f = o.input == "-" and sys.stdin or io.open(o.input, encoding="utf-8")
+    words = (w.strip() for w in f)
+    n = build((w for w in words if w), o.output, o.language, o.op, **kwargs)
+    print("%s words written to %s" % (n, o.output))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
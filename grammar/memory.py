@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Memory used by the rules, word lists and caches of each language module.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# With many worker processes per host, each process holds its own copy of the rules
+# (after fork(), pages are copied as soon as reference counts change).
+# report() measures the module-level tables of a language module, in bytes,
+# counting objects shared by several tables (e.g., interned strings) only once:
+#
+#   python -m grammar.memory -l en
+#
+#   from grammar import memory
+#   memory.report("en")["total"] # 212000
+#   memory.report("en")["tables"]["singular_irregular"]
+#
+# The size of an object is sys.getsizeof() of the object and the objects it contains
+# (containers, instance attributes, closures of functions defined in the module).
+# Code objects, modules and classes are not counted.
+
+import sys
+import types
+import argparse
+
+from .parallel import module, LANGUAGES
+from .cache import Memoized, LRUCache
+
+_SKIP = (types.ModuleType, type, types.CodeType, types.BuiltinFunctionType)
+
+def sizeof(obj, seen=None, name=None):
+    """ Returns the size of the given object in bytes, including the objects it contains
+        that are not in the given set of ids (which is updated).
+        Functions are only counted if they are defined in the module with the given name.
+    """
+    seen = set() if seen is None else seen
+    n = 0
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        if id(x) in seen or isinstance(x, _SKIP):
+            continue
+        if isinstance(x, types.FunctionType):
+            if x.__module__ != name:
+                continue
+            seen.add(id(x))
+            stack.extend(c.cell_contents for c in x.__closure__ or () if _has_contents(c))
+            stack.extend(x.__defaults__ or ())
+            continue
+        seen.add(id(x))
+        n += sys.getsizeof(x)
+        if isinstance(x, dict):
+            stack.extend(x.keys())
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple, set, frozenset)):
+            stack.extend(x)
+        elif isinstance(x, Memoized):
+            stack.append(x.cache)
+        elif isinstance(x, LRUCache):
+            stack.append(x._items)
+        elif hasattr(x, "__dict__"):
+            stack.append(x.__dict__)
+        elif hasattr(type(x), "__slots__"):
+            stack.extend(getattr(x, k) for k in type(x).__slots__ if hasattr(x, k))
+    return n
+
+def _has_contents(cell):
+    try:
+        cell.cell_contents
+    except ValueError: # Empty cell.
+        return False
+    return True
+
+def report(lang):
+    """ Returns a dict with the total size in bytes of the tables in the given language module,
+        and a dict of name => size for each table, where shared objects are counted once
+        (in the largest table first). Caches are reported separately.
+    """
+    m = module(lang)
+    name = m.__name__
+    seen = set(id(v) for v in vars(sys.modules["builtins"]).values())
+    tables = {}
+    caches = {}
+    # Measure tables on their own first, to count shared objects in the largest table.
+    a = [(k, v) for k, v in vars(m).items() if not k.startswith("__")]
+    a.sort(key=lambda kv: (-sizeof(kv[1], set(seen), name), kv[0]))
+    for k, v in a:
+        if isinstance(v, Memoized):
+            caches[k] = sizeof(v.cache, seen, name)
+            seen.add(id(v))
+            v = v.function
+        n = sizeof(v, seen, name)
+        if n:
+            tables[k] = n
+    return {
+        "language": name.split(".")[-1],
+           "total": sum(tables.values()),
+          "tables": tables,
+          "caches": caches
+    }
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m grammar.memory",
+        description="Reports the memory used by the rules and word lists of each language.")
+    p.add_argument("-l", "--language", action="append",
+        help="%s (default: all)" % ", ".join(sorted(LANGUAGES)))
+    p.add_argument("-n", type=int, default=10, help="report the N largest tables (default: 10)")
+    o = p.parse_args(argv)
+    for lang in o.language or sorted(LANGUAGES):
+        r = report(lang)
+        print("%s: %i bytes" % (r["language"], r["total"]))
+        for k, v in sorted(r["tables"].items(), key=lambda kv: -kv[1])[:o.n]:
+            print("  %8i  %s" % (v, k))
+        for k, v in sorted(r["caches"].items()):
+            print("  %8i  %s (cache)" % (v, k))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Normalization of words before inflection (Unicode form, case), and restoration of their case after.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# The rules of each language are written for lowercase words in NFC form (e.g., "ä" is one character,
+# not "a" + a combining diaeresis, as in text from macOS file names or some PDF extractors).
+# pluralize() and singularize() normalize a word once, before the cache and the rules see it
+# (see grammar.cache.Memoized), so that the case and Unicode variants of a word share one cache entry:
+# - lowercase ASCII words are passed as is (the common case, which is fast),
+# - other ASCII words are lowercased,
+# - other words are composed (NFC) and lowercased.
+# The inflection of the normalized word is then given the case of the word:
+#
+#   grammar.german.pluralize("Katze")           # "Katzen"
+#   grammar.english.pluralize("FBI")            # "FBIs"
+#   grammar.english.pluralize("Mother-In-Law")  # "Mothers-In-Law"
+#
+# Words are lowercased with str.lower() rather than str.casefold(), which maps "ß" to "ss"
+# (German Straße => Straßen, not strassen).
+# A custom dict is matched on the word as given, then on the normalized word (case-insensitive),
+# and its value is returned as is (it is not given the case of the word).
+
+import unicodedata
+
+def fold(word):
+    """ Returns the given word in lowercase NFC form.
+    """
+    if word.isascii():
+        return word.lower()
+    return unicodedata.normalize("NFC", word).lower()
+
+def restore(inflected, word):
+    """ Returns the given inflection of fold(word) with the case of the given word:
+        the letters that come from the word keep its case, in the common start and end
+        (MacBook-Pro => MacBook-Pros) and where letters are replaced (KOPF => KÖPFe),
+        while added letters stay lowercase (FBI => FBIs, not FBIS).
+    """
+    if not word.isascii():
+        word = unicodedata.normalize("NFC", word)
+    w = word.lower()
+    if w == word or not inflected:
+        return inflected
+    if word[1:] == w[1:]: # Katze => Katzen
+        return inflected[0].upper() + inflected[1:]
+    a = list(inflected)
+    if len(w) == len(word): # Not for İ => i̇.
+        n = min(len(w), len(a))
+        i = 0
+        while i < n and w[i] == a[i]:
+            i += 1
+        j = 0
+        while j < n - i and w[-j-1] == a[-j-1]:
+            j += 1
+        # The common start, the replaced letters in the middle (if any), the common end.
+        for k in range(min(len(w), len(a)) - j):
+            if word[k] != w[k]:
+                a[k] = a[k].upper()
+        for k in range(1, j + 1):
+            if word[-k] != w[-k]:
+                a[-k] = a[-k].upper()
+    elif word.isupper():
+        return inflected.upper()
+    if word[0] != w[0]:
+        a[0] = a[0].upper()
+    return "".join(a)
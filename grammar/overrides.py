@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# Registry of user-defined inflections (e.g., brand names, product codes) for each language.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# The custom argument of pluralize() and singularize() is a dict that is passed with each call.
+# For a large, shared set of overrides, a registry can be loaded once for each language and function,
+# from a UTF-8 text file with one tab-separated override per line:
+#
+#   iPhone      iPhones
+#   *-pro       *-pros        (suffix: MacBook-pro => MacBook-pros)
+#   # comment
+#
+# Words are matched on their normalized form (see grammar.normalize), exact overrides first,
+# then the longest suffix. The inflection is given the case of the word (IPHONE => IPHONES).
+# A custom argument in a call takes precedence over the registry.
+#
+#   from grammar import overrides
+#   overrides.load("brands.tsv", "en", "pluralize")
+#   overrides.load("brands.tsv", "en", "singularize", inverse=True)
+#   grammar.english.pluralize("iPhone") # "iPhones"
+#
+# Calling load() again replaces the overrides in one step (calls see either the old or the new ones),
+# and removes only the cached results (see grammar.cache) of the words whose override changed.
+
+import io
+
+from . import hooks
+from .parallel import module, function, PLURALIZE, SINGULARIZE
+from .normalize import fold, restore
+
+class Overrides(object):
+
+    def __init__(self, exact=None, suffixes=None):
+        """ A dict of word => inflection, and a dict of suffix => inflected suffix,
+            indexed by suffix length (longest first), with normalized words and suffixes.
+        """
+        self.exact = dict((fold(k), v) for k, v in (exact or {}).items())
+        self.suffixes = dict((fold(k), v) for k, v in (suffixes or {}).items())
+        index = {}
+        for a, b in self.suffixes.items():
+            index.setdefault(len(a), {})[a] = b
+        self._index = tuple(sorted(index.items(), reverse=True))
+
+    def get(self, word):
+        """ Returns the inflection of the given word (with the case of the word), or None.
+        """
+        x = self._get(fold(word))
+        if x is not None:
+            return restore(x, word)
+
+    def _get(self, word):
+        x = self.exact.get(word)
+        if x is not None:
+            return x
+        n = len(word)
+        for k, suffixes in self._index:
+            if k <= n:
+                x = suffixes.get(word[n-k:])
+                if x is not None:
+                    return word[:n-k] + x
+
+    def changes(self, other):
+        """ Returns a (words, suffixes)-tuple of the words and suffixes
+            that have a different inflection in the given Overrides.
+        """
+        def diff(a, b):
+            return set(k for k in set(a) | set(b) if a.get(k) != b.get(k))
+        return diff(self.exact, other.exact), tuple(diff(self.suffixes, other.suffixes))
+
+    def __len__(self):
+        return len(self.exact) + len(self.suffixes)
+
+def read(path, inverse=False, encoding="utf-8"):
+    """ Returns the Overrides in the given file (with the columns swapped if inverse=True).
+    """
+    exact = {}
+    suffixes = {}
+    with io.open(path, encoding=encoding) as f:
+        for i, s in enumerate(f):
+            s = s.rstrip("\r\n")
+            if not s.strip() or s.startswith("#"):
+                continue
+            a = s.split("\t")
+            if len(a) != 2:
+                raise ValueError("%s, line %i: expected 2 tab-separated columns" % (path, i + 1))
+            a, b = inverse and (a[1], a[0]) or a
+            if a.startswith("*") and b.startswith("*"):
+                suffixes[a[1:]] = b[1:]
+            else:
+                exact[a] = b
+    return Overrides(exact, suffixes)
+
+#### REGISTRY ######################################################################################
+
+_EMPTY = Overrides()
+
+_registry = {} # "grammar.english.pluralize" => Overrides
+
+OWNER = "overrides"
+
+def wrap(f, name, g):
+    """ Returns a wrapper for the given function g of the given Memoized function f,
+        that returns the override of a word in the registry (if any), unless a custom argument is given.
+    """
+    i = f._index.get("custom", len(f._index))
+    registry = _registry
+    def override(*args, **kwargs):
+        r = registry.get(name)
+        if r is not None and (args[i] if len(args) > i else kwargs.get("custom")) is None:
+            w = args and args[0]
+            x = type(w) is str and (r.exact.get(w) or r._index and r._get(w))
+            if x:
+                return x
+        return g(*args, **kwargs)
+    override.__wrapped__ = g
+    return override
+
+def get(lang, op=PLURALIZE):
+    """ Returns the Overrides for the given language and function, or None.
+    """
+    function(lang, op) # Raises ValueError.
+    return _registry.get("%s.%s" % (module(lang).__name__, op))
+
+def _replace(f, name, overrides):
+    words, suffixes = (_registry.get(name) or _EMPTY).changes(overrides or _EMPTY)
+    if overrides is None:
+        _registry.pop(name, None)
+    else:
+        _registry[name] = overrides
+    if not words and not suffixes:
+        return 0
+    return f.cache_discard(lambda w: w in words or isinstance(w, str) and w.endswith(suffixes))
+
+def install(overrides, lang, op=PLURALIZE):
+    """ Sets (or replaces) the Overrides for the given language and function,
+        and removes the cached results of the words whose override changed.
+        Returns the number of cached results removed.
+    """
+    f = function(lang, op)
+    name = "%s.%s" % (module(lang).__name__, op)
+    if not hooks.installed(f, "function", OWNER):
+        hooks.install(f, "function", OWNER, lambda g: wrap(f, name, g))
+    return _replace(f, name, overrides)
+
+def uninstall(lang, op=None):
+    """ Removes the Overrides for the given language and function (or both functions).
+    """
+    for op in op and (op,) or (PLURALIZE, SINGULARIZE):
+        f = function(lang, op)
+        _replace(f, "%s.%s" % (module(lang).__name__, op), None)
+        # If another layer was installed later (e.g., grammar.instrument), it is kept.
+        hooks.uninstall(f, "function", OWNER)
+
+def load(path, lang, op=PLURALIZE, inverse=False, encoding="utf-8"):
+    """ Reads the Overrides in the given file, and installs them (see install()).
+        Returns the Overrides.
+    """
+    r = read(path, inverse, encoding)
+    install(r, lang, op)
+    return r
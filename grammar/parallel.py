@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+# Parallel inflection of large word lists, using a pool of worker processes (or threads).
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# The input is split into chunks of words, which are inflected in worker processes
+# with pluralize_many() or singularize_many() (so each unique word in a chunk is inflected once).
+# Each worker imports the language module (and compiles its rules) only once.
+# The output is returned in input order. At most a few chunks per worker are in flight,
+# so memory use is bounded when the input is a generator (e.g., lines in a file):
+#
+#   from grammar.parallel import inflect
+#   inflect(["Katzen", "Hunde"], lang="de", op="singularize", workers=4) # ["Katze", "Hund"]
+#
+# With threads=True, the words are inflected in a pool of threads in this process,
+# so chunks are not pickled, and all threads share the rules and the cache of each function.
+# The language modules are safe for concurrent use. With the GIL, only one thread runs Python code
+# at a time, so threads only scale on a free-threaded build (e.g., python3.13t);
+# see benchmarks/bench.py --threads.
+
+import os
+import time
+import importlib
+
+from itertools import islice
+from collections import deque
+
+LANGUAGES = {
+    "en": "english",
+    "de": "german",
+    "nl": "dutch",
+    "fr": "french"
+}
+
+PLURALIZE, SINGULARIZE = \
+    "pluralize", "singularize"
+
+def module(lang):
+    """ Returns the language module for the given language code (e.g., "de") or name (e.g., "german").
+    """
+    name = LANGUAGES.get(lang, lang)
+    if name not in LANGUAGES.values():
+        raise ValueError("unknown language: %r" % lang)
+    return importlib.import_module("grammar." + name)
+
+def function(lang, op=PLURALIZE, many=False):
+    """ Returns the pluralize() or singularize() function (or pluralize_many(), ...)
+        for the given language.
+    """
+    if op not in (PLURALIZE, SINGULARIZE):
+        raise ValueError("unknown operation: %r" % op)
+    return getattr(module(lang), many and op + "_many" or op)
+
+def chunks(iterable, n=10000):
+    """ Yields lists of at most n items from the given iterable.
+    """
+    iterable = iter(iterable)
+    while True:
+        a = list(islice(iterable, n))
+        if not a:
+            break
+        yield a
+
+#### WORKER ########################################################################################
+
+_worker = None
+
+def _init(lang, op, kwargs, cache=0):
+    global _worker
+    f = function(lang, op, many=True)
+    if cache:
+        function(lang, op).cache_enable(cache)
+    _worker = (f, kwargs)
+
+def _inflect(words):
+    f, kwargs = _worker
+    return f(words, **kwargs)
+
+#### INFLECTOR #####################################################################################
+
+class Inflector(object):
+
+    def __init__(self, lang="en", op=PLURALIZE, workers=None, chunksize=10000, cache=0, threads=False, **kwargs):
+        """ Inflects iterables of words in parallel, with the given number of worker processes
+            (by default, one per CPU; with 1, words are inflected in this process),
+            or worker threads if threads=True.
+            Optional keyword arguments are passed to pluralize() or singularize(), e.g., pos.
+            With cache > 0, each worker caches that number of words (see grammar.cache),
+            or the threads share one cache of that size.
+        """
+        self.lang = lang
+        self.op = op
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.cache = cache
+        self.threads = threads
+        self.kwargs = kwargs
+        self._function = function(lang, op, many=True) # Raises ValueError.
+        self._pool = None
+        self._saved = None # The (cache, maxsize) of the function before cache_enable().
+        self.reset()
+
+    def reset(self):
+        """ Resets the throughput statistics.
+        """
+        self.words = 0
+        self.chunks = 0
+        self.seconds = 0.0
+
+    @property
+    def stats(self):
+        """ Returns a dict with the number of words and chunks inflected,
+            the time spent, and the number of words per second.
+        """
+        return {
+                       "words": self.words,
+                      "chunks": self.chunks,
+                     "workers": self.workers,
+                     "threads": self.threads,
+                     "seconds": self.seconds,
+            "words_per_second": self.seconds and self.words / self.seconds or 0.0
+        }
+
+    @property
+    def pool(self):
+        if self._pool is None and self.threads:
+            from concurrent.futures import ThreadPoolExecutor
+            self._cache_enable()
+            self._pool = ThreadPoolExecutor(self.workers)
+        if self._pool is None:
+            # Imported when first needed (multiprocessing is slow to import).
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(self.workers,
+                initializer = _init,
+                   initargs = (self.lang, self.op, self.kwargs, self.cache))
+        return self._pool
+
+    def _cache_enable(self):
+        # The cache of the function in this process is shared with the caller,
+        # so its previous state is restored on close().
+        if self.cache and self._saved is None:
+            f = function(self.lang, self.op)
+            self._saved = (f.cache, f.cache is not None and f.cache.maxsize)
+            f.cache_enable(self.cache)
+
+    def _chunks(self, words):
+        for chunk in chunks(words, self.chunksize):
+            self.words += len(chunk)
+            self.chunks += 1
+            yield chunk
+
+    def imap(self, words):
+        """ Yields the inflection of each word in the given iterable, in the same order.
+        """
+        t = time.perf_counter()
+        try:
+            if self.workers <= 1:
+                self._cache_enable()
+                for chunk in self._chunks(words):
+                    for w in self._function(chunk, **self.kwargs):
+                        yield w
+                return
+            pending = deque()
+            for chunk in self._chunks(words):
+                if self.threads:
+                    pending.append(self.pool.submit(self._function, chunk, **self.kwargs))
+                else:
+                    pending.append(self.pool.submit(_inflect, chunk))
+                if len(pending) >= self.workers * 2:
+                    for w in pending.popleft().result():
+                        yield w
+            while pending:
+                for w in pending.popleft().result():
+                    yield w
+        finally:
+            self.seconds += time.perf_counter() - t
+
+    def map(self, words):
+        """ Returns a list with the inflection of each word in the given iterable.
+        """
+        return list(self.imap(words))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._saved is not None:
+            f = function(self.lang, self.op)
+            c, n = self._saved
+            if c is None:
+                f.cache_disable()
+            else:
+                f.cache = c
+                c.resize(n)
+            self._saved = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def inflect(words, lang="en", op=PLURALIZE, workers=None, chunksize=10000, threads=False, **kwargs):
+    """ Returns a list with the plural or singular of each word in the given iterable,
+        using the given number of worker processes (or threads).
+    """
+    with Inflector(lang, op, workers, chunksize, threads=threads, **kwargs) as f:
+        return f.map(words)
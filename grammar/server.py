@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+# HTTP server (TCP or Unix domain socket) and client for pluralize() and singularize().
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# Instead of importing the language modules (and warming their caches) in many processes,
+# one server process can inflect words for all of them, with one large cache (see grammar.cache):
+#
+#   python -m grammar.server --port 8080 --unix /tmp/grammar.sock --cache-size 1000000
+#
+# Requests (HTTP/1.1, with keep-alive):
+# - GET  /pluralize?word=child&lang=en         => "children"
+# - POST /singularize?lang=de&pos=NN           => one JSON string per line in the body,
+#                                                 one JSON string per line in the response,
+# - GET  /stats                                => {"en.pluralize": {"hits": ..., ...}, ...}
+# Optional parameters are passed to pluralize() or singularize(): pos, gender, role, classical.
+#
+#   from grammar.server import Client
+#   client = Client("/tmp/grammar.sock") # or Client("http://localhost:8080")
+#   client.pluralize_many(["Katze", "Hund"], lang="de") # ["Katzen", "Hunde"]
+
+import os
+import sys
+import stat
+import json
+import socket
+import argparse
+import threading
+
+from http import HTTPStatus
+from http.client import HTTPConnection, HTTPException
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from urllib.parse import urlsplit, urlencode, parse_qsl, quote
+from queue import LifoQueue, Empty, Full
+
+from .parallel import module, function, LANGUAGES, PLURALIZE, SINGULARIZE
+from . import cache
+
+ARGUMENTS = ("pos", "gender", "role", "classical")
+
+def arguments(query):
+    """ Returns a dict of optional arguments for pluralize() or singularize() in the given query.
+    """
+    kwargs = {}
+    for k, v in query.items():
+        if k == "classical":
+            kwargs[k] = v.lower() not in ("0", "false", "no")
+        elif k in ARGUMENTS:
+            kwargs[k] = v
+    return kwargs
+
+def stats():
+    """ Returns a dict of "language.function" => cache statistics, for the loaded language modules.
+    """
+    r = {}
+    for lang, name in sorted(LANGUAGES.items()):
+        if "grammar." + name in sys.modules:
+            for k, v in sorted(cache.info(module(lang)).items()):
+                r["%s.%s" % (lang, k)] = v and v._asdict()
+    return r
+
+#### SERVER ########################################################################################
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1" # keep-alive
+    server_version = "grammar"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+    def address_string(self):
+        return self.client_address and self.client_address[0] or self.server.server_address
+
+    def send(self, status, body, content_type="application/json"):
+        body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type + "; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def error(self, status, message):
+        self.send(status, json.dumps({"error": message}) + "\n")
+
+    def route(self):
+        """ Returns a (function, query, kwargs)-tuple for the request path, or None.
+        """
+        url = urlsplit(self.path)
+        op = url.path.strip("/")
+        query = dict(parse_qsl(url.query, keep_blank_values=True))
+        if op == "stats":
+            self.send(HTTPStatus.OK, json.dumps(stats()) + "\n")
+            return
+        if op not in (PLURALIZE, SINGULARIZE):
+            self.error(HTTPStatus.NOT_FOUND, "unknown path: %s" % url.path)
+            return
+        try:
+            f = function(query.get("lang", "en"), op, many=True)
+        except ValueError as e:
+            self.error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        return f, query, arguments(query)
+
+    def inflect(self, f, words, kwargs):
+        try:
+            return f(words, **kwargs)
+        except (TypeError, AttributeError) as e:
+            self.error(HTTPStatus.BAD_REQUEST, str(e))
+
+    def do_GET(self):
+        r = self.route()
+        if r is not None:
+            f, query, kwargs = r
+            if "word" not in query:
+                self.error(HTTPStatus.BAD_REQUEST, "missing parameter: word")
+                return
+            a = self.inflect(f, [query["word"]], kwargs)
+            if a is not None:
+                self.send(HTTPStatus.OK, json.dumps(a[0]) + "\n")
+
+    def do_POST(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(n).decode("utf-8")
+        r = self.route()
+        if r is not None:
+            f, query, kwargs = r
+            try:
+                words = [json.loads(s) for s in body.splitlines() if s.strip()]
+            except ValueError as e:
+                self.error(HTTPStatus.BAD_REQUEST, "invalid JSON: %s" % e)
+                return
+            a = self.inflect(f, words, kwargs)
+            if a is not None:
+                self.send(HTTPStatus.OK, "".join(json.dumps(w) + "\n" for w in a), "application/x-ndjson")
+
+class Server(ThreadingHTTPServer):
+
+    daemon_threads = True
+    verbose = False
+
+class UnixServer(ThreadingMixIn, UnixStreamServer):
+
+    daemon_threads = True
+    verbose = False
+
+def unlink(path):
+    """ Removes the Unix domain socket at the given path, if any.
+        Raises ValueError if the path is another kind of file (e.g., a typo in --unix).
+    """
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise ValueError("not a Unix domain socket: %r" % path)
+    os.remove(path)
+
+def serve(host="127.0.0.1", port=8080, unix=None, cache_size=100000, verbose=False):
+    """ Returns a list of servers (on the given TCP port and/or Unix socket path),
+        each running in a background thread. Call shutdown() and server_close() to stop them.
+        An existing socket at the given path is replaced, but not another file (ValueError).
+    """
+    if unix is not None:
+        unlink(unix)
+    for lang in LANGUAGES:
+        if cache_size:
+            cache.enable(module(lang), cache_size)
+        else:
+            cache.disable(module(lang))
+    servers = []
+    if port is not None:
+        servers.append(Server((host, port), Handler))
+    if unix is not None:
+        servers.append(UnixServer(unix, Handler))
+    for s in servers:
+        s.verbose = verbose
+        threading.Thread(target=s.serve_forever, daemon=True).start()
+    return servers
+
+#### CLIENT ########################################################################################
+
+class UnixHTTPConnection(HTTPConnection):
+
+    def __init__(self, path, timeout=None):
+        HTTPConnection.__init__(self, "localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+class Client(object):
+
+    def __init__(self, address="http://127.0.0.1:8080", connections=8, timeout=10.0):
+        """ A thread-safe client for a grammar server at the given URL or Unix socket path,
+            that reuses at most the given number of idle (keep-alive) connections.
+        """
+        self.address = address
+        self.timeout = timeout
+        self._pool = LifoQueue(connections)
+
+    def connect(self):
+        """ Returns a new connection to the server.
+        """
+        if not self.address.startswith("http://"):
+            return UnixHTTPConnection(self.address, timeout=self.timeout)
+        url = urlsplit(self.address)
+        return HTTPConnection(url.hostname, url.port or 80, timeout=self.timeout)
+
+    def request(self, method, path, body=None):
+        """ Returns the response body for the given request, reusing an idle connection if possible.
+            Raises ValueError for a bad request (e.g., an unknown language).
+        """
+        for retry in (True, False):
+            try:
+                c, reused = self._pool.get_nowait(), True
+            except Empty:
+                c, reused = self.connect(), False
+            try:
+                c.request(method, path, body, {"Content-Type": "application/x-ndjson"})
+                r = c.getresponse()
+                data = r.read().decode("utf-8")
+            except (OSError, HTTPException):
+                c.close()
+                # An idle connection may have been closed by the server.
+                if reused and retry:
+                    continue
+                raise
+            if r.will_close:
+                c.close()
+            else:
+                try:
+                    self._pool.put_nowait(c)
+                except Full:
+                    c.close()
+            if r.status != HTTPStatus.OK:
+                try:
+                    message = json.loads(data)["error"]
+                except (ValueError, KeyError, TypeError):
+                    message = data
+                if 400 <= r.status < 500:
+                    raise ValueError(message)
+                raise IOError("%s %s" % (r.status, message))
+            return data
+
+    def _path(self, op, lang, kwargs, word=None):
+        query = dict(kwargs, lang=lang)
+        if word is not None:
+            query["word"] = word
+        return "/%s?%s" % (op, urlencode(query, quote_via=quote))
+
+    def _inflect(self, op, word, lang, kwargs):
+        return json.loads(self.request("GET", self._path(op, lang, kwargs, word)))
+
+    def _inflect_many(self, op, words, lang, kwargs):
+        body = "".join(json.dumps(w) + "\n" for w in words).encode("utf-8")
+        data = self.request("POST", self._path(op, lang, kwargs), body)
+        return [json.loads(s) for s in data.splitlines()]
+
+    def pluralize(self, word, lang="en", **kwargs):
+        return self._inflect(PLURALIZE, word, lang, kwargs)
+
+    def singularize(self, word, lang="en", **kwargs):
+        return self._inflect(SINGULARIZE, word, lang, kwargs)
+
+    def pluralize_many(self, words, lang="en", **kwargs):
+        return self._inflect_many(PLURALIZE, words, lang, kwargs)
+
+    def singularize_many(self, words, lang="en", **kwargs):
+        return self._inflect_many(SINGULARIZE, words, lang, kwargs)
+
+    def stats(self):
+        return json.loads(self.request("GET", "/stats"))
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except Empty:
+                break
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m grammar.server",
+        description="Serves pluralize() and singularize() over HTTP (TCP and/or a Unix socket).")
+    p.add_argument("--host", default="127.0.0.1", help="(default: 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8080, help="TCP port, or 0 for none (default: 8080)")
+    p.add_argument("--unix", default=None, metavar="PATH", help="Unix domain socket path")
+    p.add_argument("--cache-size", type=int, default=100000, metavar="N",
+        help="cache the N most recently inflected words per function (default: 100000)")
+    p.add_argument("-v", "--verbose", action="store_true", help="log requests")
+    o = p.parse_args(argv)
+    servers = serve(o.host, o.port or None, o.unix, o.cache_size, o.verbose)
+    for s in servers:
+        print("serving on %s" % (s.server_address,), file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for s in servers:
+            s.shutdown()
+            s.server_close()
+        if o.unix:
+            unlink(o.unix)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
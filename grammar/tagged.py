@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# Inflection of part-of-speech tagged token streams (e.g., the output of a tagger).
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# A tagged document is a sequence of (token, tag)-tuples with Penn Treebank tags.
+# Only tokens with certain tags are inflected (e.g., singular nouns for pluralize()),
+# with the part-of-speech that the language module expects (e.g., "JJ" for English determiners).
+# Other tokens are passed through without calling any function.
+# The stream is read lazily, in chunks, and the tokens in a chunk are inflected in one batch
+# per part-of-speech with pluralize_many() or singularize_many(), so memory use is constant:
+#
+#   from grammar.tagged import inflect
+#   list(inflect([("this", "DT"), ("child", "NN"), ("runs", "VBZ")], lang="en"))
+#   # ["these", "children", "runs"]
+#
+# inflect_documents() inflects a stream of documents, one batch per document,
+# and inflect_arrays() inflects parallel lists of tokens and tags.
+
+from .parallel import module, function, chunks, PLURALIZE, SINGULARIZE
+
+NOUN, ADJECTIVE = "NN", "JJ"
+
+# For each language and function, the tags that are inflected => the pos argument.
+ROUTES = {
+    "english": {
+          PLURALIZE: {"NN": NOUN, "JJ": ADJECTIVE, "DT": ADJECTIVE, "PRP$": ADJECTIVE},
+        SINGULARIZE: {"NNS": NOUN, "NNPS": NOUN}
+    },
+    "german": {
+          PLURALIZE: {"NN": NOUN},
+        SINGULARIZE: {"NNS": NOUN}
+    },
+    "dutch": {
+          PLURALIZE: {"NN": NOUN},
+        SINGULARIZE: {"NNS": NOUN}
+    },
+    "french": {
+          PLURALIZE: {"NN": NOUN, "JJ": ADJECTIVE},
+        SINGULARIZE: {"NNS": NOUN, "DT": "DT", "PRP$": "PRP$"}
+    }
+}
+
+def default_routes(lang="en", op=PLURALIZE):
+    """ Returns a dict of tag => pos argument, for the tags that are inflected by default.
+    """
+    function(lang, op) # Raises ValueError.
+    return dict(ROUTES[module(lang).__name__.split(".")[-1]][op])
+
+def _inflect(tokens, tags, f, routes, kwargs):
+    """ Returns a list of inflected tokens for the given lists of tokens and tags.
+    """
+    a = list(tokens)
+    groups = {} # pos => ([index], [token])
+    for i, (w, tag) in enumerate(zip(tokens, tags)):
+        pos = routes.get(tag)
+        if pos is not None and w:
+            g = groups.get(pos)
+            if g is None:
+                g = groups[pos] = ([], [])
+            g[0].append(i)
+            g[1].append(w)
+    for pos, (indices, words) in groups.items():
+        for i, w in zip(indices, f(words, pos=pos, **kwargs)):
+            a[i] = w
+    return a
+
+def inflect(tagged, lang="en", op=PLURALIZE, routes=None, chunksize=1000, **kwargs):
+    """ Returns an iterator of the inflected token for each (token, tag)-tuple in the given iterable,
+        where tokens with tags that are not in the given dict of tag => pos are unchanged.
+        Tokens are read and inflected in batches of chunksize.
+        Optional keyword arguments are passed to pluralize() or singularize(), e.g., custom.
+    """
+    f = function(lang, op, many=True) # Raises ValueError (now, not when the stream is read).
+    r = default_routes(lang, op) if routes is None else routes
+    def stream():
+        for chunk in chunks(tagged, chunksize):
+            yield from _inflect([x[0] for x in chunk], [x[1] for x in chunk], f, r, kwargs)
+    return stream()
+
+def inflect_documents(documents, lang="en", op=PLURALIZE, routes=None, **kwargs):
+    """ Returns an iterator of a list of inflected tokens for each list of (token, tag)-tuples
+        in the given iterable of documents, see inflect().
+    """
+    f = function(lang, op, many=True)
+    r = default_routes(lang, op) if routes is None else routes
+    def stream():
+        for document in documents:
+            document = list(document)
+            yield _inflect([x[0] for x in document], [x[1] for x in document], f, r, kwargs)
+    return stream()
+
+def inflect_arrays(tokens, tags, lang="en", op=PLURALIZE, routes=None, **kwargs):
+    """ Returns a list of inflected tokens for the given lists (or arrays) of tokens and tags
+        of the same length, see inflect().
+    """
+    if len(tokens) != len(tags):
+        raise ValueError("tokens and tags must have the same length")
+    f = function(lang, op, many=True)
+    r = default_routes(lang, op) if routes is None else routes
+    return _inflect(tokens, tags, f, r, kwargs)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from grammar.aio import AsyncInflector
+
+class aio_test(unittest.IsolatedAsyncioTestCase):
+
+    async def test_batch(self):
+        f = AsyncInflector("en", "pluralize", max_batch=100, max_delay=0.01)
+        words = [u'child', u'box', u'mother-in-law', u'child'] * 5
+        self.assertEqual(await f.map(words), [u'children', u'boxes', u'mothers-in-law', u'children'] * 5)
+        self.assertEqual(await f(u'ox'), u'oxen')
+        self.assertEqual(f.stats["words"], 21)
+        self.assertEqual(f.stats["batches"], 2)
+
+    async def test_max_batch(self):
+        f = AsyncInflector("de", "singularize", max_batch=3, max_delay=10)
+        a = await asyncio.wait_for(f.map([u'katzen', u'hunde', u'zeitungen']), 1)
+        self.assertEqual(a, [u'katze', u'hund', u'zeitung'])
+        self.assertEqual(f.stats["batches"], 1)
+
+    async def test_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            async with AsyncInflector("nl", "pluralize", max_batch=2, executor=executor) as f:
+                a = await f.map([u'fiets', u'kind', u'stad'])
+            self.assertEqual(a, [u'fietsen', u'kinderen', u'steden'])
+            self.assertEqual(f.stats["batches"], 2)
+
+    async def test_error(self):
+        # An invalid word fails its own request, not the batch.
+        f = AsyncInflector("en", "pluralize")
+        a = await asyncio.gather(f(u'child'), f(None), return_exceptions=True)
+        self.assertEqual(a[0], u'children')
+        self.assertTrue(isinstance(a[1], AttributeError))
+        self.assertRaises(ValueError, AsyncInflector, "xx")
+
+if __name__ == '__main__':
+    unittest.main()
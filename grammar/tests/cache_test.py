@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import unittest
+import threading
+import grammar.cache as gc
+import grammar.english as ge
+import grammar.german as gg
+
+class cache_test(unittest.TestCase):
+
+    def tearDown(self):
+        gc.disable(ge)
+        gc.disable(gg)
+
+    def test_lru(self):
+        c = gc.LRUCache(2)
+        c.set("a", 1)
+        c.set("b", 2)
+        self.assertEqual(c.get("a"), 1)
+        c.set("c", 3) # evicts "b"
+        self.assertEqual(c.get("b"), None)
+        self.assertEqual(c.get("c"), 3)
+        self.assertEqual(c.info(), gc.CacheInfo(hits=2, misses=1, evictions=1, maxsize=2, size=2))
+        c.resize(1)
+        self.assertEqual(len(c), 1)
+        c.clear()
+        self.assertEqual(c.info(), gc.CacheInfo(0, 0, 0, 1, 0))
+
+    def test_discard(self):
+        c = gc.LRUCache(10)
+        c.set("a", 1)
+        c.set(("b", "NN"), 2)
+        self.assertEqual(c.discard(lambda k: k == "a"), 1)
+        self.assertEqual(len(c), 1)
+        # A value computed before discard() is not set.
+        c.set("a", 1, generation=0)
+        self.assertEqual(c.get("a"), None)
+        ge.pluralize.cache_enable(10)
+        ge.pluralize("cat")
+        ge.pluralize("cat", classical=False)
+        ge.pluralize("dog")
+        self.assertEqual(ge.pluralize.cache_discard(set(["cat"])), 2)
+        self.assertEqual(ge.pluralize.cache_discard(lambda w: w.startswith("d")), 1)
+
+    def test_disabled(self):
+        self.assertEqual(ge.pluralize.cache_info(), None)
+        self.assertEqual(ge.pluralize("child"), "children")
+
+    def test_memoize(self):
+        ge.pluralize.cache_enable(100)
+        self.assertEqual(ge.pluralize("child"), "children")
+        self.assertEqual(ge.pluralize("child"), "children")
+        self.assertEqual(ge.pluralize.cache_info().hits, 1)
+        # Arguments given as keywords or defaults share the same key.
+        self.assertEqual(ge.pluralize("child", pos=ge.NOUN), "children")
+        self.assertEqual(ge.pluralize.cache_info().hits, 2)
+        # Other arguments are keyed separately.
+        self.assertEqual(ge.pluralize("matrix", classical=True), "matrices")
+        self.assertEqual(ge.pluralize("matrix", classical=False), "matrixes")
+        self.assertEqual(ge.pluralize("child", custom={"child": "childs"}), "childs")
+        self.assertEqual(ge.pluralize("child", custom={}), "children")
+        self.assertEqual(ge.pluralize("child", custom={"x": "y"}), "children")
+        ge.pluralize.cache_clear()
+        self.assertEqual(ge.pluralize.cache_info().size, 0)
+
+    def test_key(self):
+        # Only the word is stored if the other arguments are defaults.
+        f = ge.pluralize
+        self.assertEqual(f.key(("child",), {}), "child")
+        self.assertEqual(f.key(("child", ge.NOUN), {"classical": True}), "child")
+        self.assertEqual(f.key(("child",), {"classical": False}), ("child", ge.NOUN, None, False))
+        self.assertEqual(f.key(("child",), {"custom": {}}), "child")
+        # Calls with a custom dict are not cached (the key would hold a copy of the dict).
+        self.assertEqual(f.key(("child",), {"custom": {"x": "y"}}), None)
+        self.assertEqual(f.key(("child",), {"custom": {"x": []}}), None)
+        f.cache_enable(100)
+        custom = dict(("w%i" % i, "x") for i in range(10000))
+        self.assertEqual(f("child", custom=custom), "children")
+        self.assertEqual(f("w1", custom=custom), "x")
+        self.assertEqual(f.cache_info().size, 0)
+        f.cache_disable()
+
+    def test_module(self):
+        gc.enable(gg, 1)
+        gg.pluralize(u"katze")
+        gg.pluralize(u"hund")
+        self.assertEqual(gc.info(gg)["pluralize"].evictions, 1)
+        self.assertEqual(gc.info(gg)["singularize"].size, 0)
+
+    def test_threads(self):
+        gc.enable(gg, 10)
+        words = [u"katze", u"hund", u"maus", u"haus"] * 100
+        errors = []
+        def f():
+            for w in words:
+                if gg.pluralize(w) != gg.pluralize.function(w):
+                    errors.append(w)
+        threads = [threading.Thread(target=f) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        info = gg.pluralize.cache_info()
+        self.assertEqual(info.hits + info.misses, 1600)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+import unittest
+import tempfile
+import grammar.dutch as gd
+import grammar.german as gg
+from grammar import cascade, instrument, hooks
+
+WORDS = [u'dag', u'fee', u'kind', u'been', u'stad', u'academicus', u'les', u'huis', u'brief', u'museum',
+         u'bacterie', u'idee', u'mogelijkheid', u'broer', u'auto', u'baby', u'motor', u'boerderij',
+         u'hand', u'fles', u'raam', u'kat', u'', u'genie', u'mens', u'bus',
+         u'katze', u'zeitung', u'gebirge', u'studien', u'kopf', u'ball', u'tag', u'mann', u'baum',
+         u'haus', u'zug', u'kino', u'firma', u'lehrerin', u'ergebnis', u'feld', u'xyz']
+
+class cascade_test(unittest.TestCase):
+
+    def tearDown(self):
+        cascade.uninstall("nl")
+        cascade.uninstall("de")
+
+    def test_compile(self):
+        f = cascade.compile([("a", {"suffixes": ("a",)}, lambda w: w + "s"), ("b", {"words": "B"}, lambda w: w)], {"B": set(["b"])})
+        self.assertEqual(f(u'pizza'), u'pizzas')
+        self.assertEqual(f(u'b'), u'b')
+        self.assertEqual(f(u'c'), None)
+
+    def test_disjoint(self):
+        rules = dict((r[0], r) for r in gd.plural_rules)
+        ns = vars(gd)
+        self.assertTrue(cascade.disjoint(rules["icus"], rules["ven"], ns))
+        self.assertTrue(cascade.disjoint(rules["icus"], rules["zen"], ns))  # -us is excluded
+        self.assertFalse(cascade.disjoint(rules["sen"], rules["zen"], ns))  # -es
+        self.assertFalse(cascade.disjoint(rules["ies"], rules["eën"], ns))
+        self.assertFalse(cascade.disjoint(rules["or"], rules["consonants"], ns))
+        self.assertTrue(cascade.disjoint(rules["irregular-en"], rules["ums"], ns))
+        self.assertFalse(cascade.disjoint(rules["irregular"], rules["ums"], ns)) # museum
+
+    def test_optimize(self):
+        # Random profiles reorder the rules, but never change the output.
+        for lang, m in (("nl", gd), ("de", gg)):
+            v1 = [m.pluralize(w) for w in WORDS]
+            for i in range(10):
+                hits = dict((r[0], random.randint(0, 100)) for r in m.plural_rules)
+                cascade.install({m.__name__.split(".")[-1]: {"plural_rules": hits}})
+                self.assertEqual([m.pluralize.function(w) for w in WORDS], v1)
+            cascade.uninstall(lang)
+        rules = cascade.optimize(gd.plural_rules, {"consonants": 100, "'s": 50}, vars(gd))
+        a = [r[0] for r in rules]
+        b = [r[0] for r in gd.plural_rules]
+        self.assertEqual(a[-1], "en")
+        self.assertTrue(a.index("'s") < b.index("'s"))
+        self.assertTrue(a.index("s") < a.index("'s")) # -e
+
+    def test_profile(self):
+        p = cascade.profile("nl", [u'hand', u'hand', u'auto', u'stad'])
+        self.assertEqual(p["dutch"]["plural_rules"]["consonants"], 2)
+        self.assertEqual(p["dutch"]["plural_rules"]["'s"], 1)
+        self.assertEqual(p["dutch"]["plural_rules"]["irregular"], 1)
+        instrument.enable("nl")
+        try:
+            for w in [u'hand', u'hand', u'auto', u'stad']:
+                gd.pluralize(w)
+            self.assertEqual(cascade.recorded("nl"), p)
+        finally:
+            instrument.disable()
+            instrument.reset()
+        self.assertRaises(ValueError, cascade.profile, "en", [])
+
+    def test_profile_layers(self):
+        # Profiling keeps the layers installed by other modules (see grammar.hooks).
+        cascade.install({"dutch": {"plural_rules": {"'s": 10}}})
+        instrument.enable("nl")
+        try:
+            f = gd._plural_rules
+            p = cascade.profile("nl", [u'hand', u'auto'])
+            self.assertEqual(p["dutch"]["plural_rules"]["'s"], 1)
+            self.assertTrue(gd._plural_rules is f)
+            self.assertEqual(hooks.owners(gd, "_plural_rules"), ["cascade", "instrument"])
+        finally:
+            instrument.disable()
+            instrument.reset()
+        self.assertEqual(hooks.owners(gd, "_plural_rules"), ["cascade"])
+
+    def test_load(self):
+        f, path = tempfile.mkstemp(suffix=".json")
+        os.close(f)
+        try:
+            f = gd._plural_rules
+            cascade.save(cascade.profile("nl", [u'auto', u'baby']), path)
+            cascade.load(path)
+            self.assertFalse(gd._plural_rules is f)
+            self.assertEqual(gd.pluralize(u'auto'), u"auto's")
+            cascade.uninstall("nl")
+            self.assertTrue(gd._plural_rules is f)
+        finally:
+            os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
+import random
 import unittest
+import threading
 import grammar.english as ge
 #import importlib
 
@@ -14,5 +16,76 @@ class eglish(unittest.TestCase):
             self.assertEqual(ge.singularize(pair[1]), pair[0])
             self.assertEqual(ge.pluralize(pair[0]), pair[1])
 
+    def test_many(self):
+        words = iter([u'child', u'cat', u'child', u'box'])
+        self.assertEqual(ge.pluralize_many(words), [u'children', u'cats', u'children', u'boxes'])
+        self.assertEqual(ge.singularize_many((u'children', u'cats', u'children')), [u'child', u'cat', u'child'])
+        self.assertEqual(ge.pluralize_many([u'matrix'], classical=False), [u'matrixes'])
+    def test_suffix_dispatch(self):
+        # The dispatch returns the same first match as a linear scan of the rules.
+        r = random.Random(0)
+        tables = [[x[0] for x in ge.plural_rules_compile(c, a)[0] if x[2] is None]
+            for c in (True, False) for a in (True, False)]
+        tables.append([x[0] for x in ge.singular_rules_compile()[0]])
+        tables.append([ge._regex(x) for x in (r"(?i)ae$", r"^ox", r"(a|b)c$", r"x\\$")])
+        for rules in tables:
+            f = ge.suffix_dispatch(rules)
+            words = set([u'', u'a\n', u'ſ'])
+            for x in rules:
+                for e in ge.suffixes(x):
+                    words.update((e, e[1:], u'x' + e, u'ab' + e + u's', e.upper()))
+            for i in range(2000):
+                words.add(u''.join(r.choice(u'aeiouybcfhlmnrstvx') for j in range(r.randint(1, 8))))
+            for w in words:
+                self.assertEqual(f(w), next((i for i, x in enumerate(rules) if x.search(w)), None), w)
+
+    def test_endswith_index(self):
+        # The indices return the same first match as a linear scan of the word lists.
+        r = random.Random(0)
+        uninflected = ge.singular_uninflected | ge.singular_uncountable
+        tables = [[x + u's' for x in ge.singular_ie], list(ge.singular_irregular), [u'ab', u'b', u'', u'cab']]
+        words = set([u''])
+        for a in tables + [uninflected]:
+            for x in a:
+                words.update((x, x[1:], x[:-1], u'x' + x, x + u's'))
+        for i in range(2000):
+            words.add(u''.join(r.choice(u'aeiosbcdhlmnrtvx') for j in range(r.randint(1, 8))))
+        for a in tables:
+            f = ge.endswith_index(a)
+            for w in words:
+                self.assertEqual(f(w), next((x for x in a if w.endswith(x)), None), w)
+        for w in words:
+            self.assertEqual(w in ge.singular_uninflected_endings, any(x.endswith(w) for x in uninflected), w)
+
+    def test_article(self):
+        for a, w in (("an", u'hour'), ("an", u'FBI'), ("a", u'bear'), ("a", u'one-liner'), ("a", u'european'),
+                     ("a", u'university'), ("a", u'uterus'), ("an", u'owl'), ("an", u'yclept'), ("a", u'year')):
+            self.assertEqual(ge.indefinite_article(w), a)
+        self.assertEqual(ge.referenced_many([u'owl', u'bear', u'owl']), [u'an owl', u'a bear', u'an owl'])
+
+    def test_threads(self):
+        # Rules compiled when first needed are compiled once, by one of the threads.
+        words = [u'child', u'cat', u'box', u'matrix', u'wolf', u'party', u'hero', u'sheep'] * 50
+        expected = ([ge.pluralize(w) for w in words], [ge.singularize(ge.pluralize(w)) for w in words])
+        ge.plural_rules_compiled.clear()
+        ge.singular_rules_compiled = None
+        ge.singular_irregular_compiled.clear()
+        barrier = threading.Barrier(8)
+        results = []
+        compiled = []
+        def f():
+            barrier.wait()
+            a = [ge.pluralize(w) for w in words]
+            results.append((a, [ge.singularize(w) for w in a]))
+            compiled.append(ge.singular_rules_compiled)
+        threads = [threading.Thread(target=f) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [expected] * 8)
+        self.assertEqual(len(set(map(id, compiled))), 1)
+        self.assertTrue(isinstance(ge.plural_rules_compiled[(True, False)][0], tuple))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import os
+import io
+import shutil
+import unittest
+import tempfile
+import contextlib
+import grammar.dutch as gd
+from grammar import evaluate, instrument
+
+ROWS = [
+    (u'fiets', u'fietsen'),
+    (u'auto', u"auto's"),
+    (u'kind', u'kinderen'),
+    (u'hand', u'handen'),
+    (u'fiets', u'fietsen'),
+    (u'xyz', u'wrong'),
+]
+
+class evaluate_test(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dir = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.dir, "corpus.csv")
+        with io.open(cls.path, "w", encoding="utf-8") as f:
+            f.write(u"id,freq,singular,plural\n")
+            for i, (sg, pl) in enumerate(ROWS):
+                f.write(u"%i,1,%s,%s\n" % (i, sg, pl))
+            f.write(u"%i,1\n" % len(ROWS)) # Missing columns.
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.dir)
+        gd.pluralize.cache_disable()
+        gd.singularize.cache_disable()
+
+    def test_pairs(self):
+        self.assertEqual(list(evaluate.pairs(self.path)), ROWS)
+        self.assertEqual(next(evaluate.pairs(self.path, 1, 2, header=False)), (u'id', u'freq'))
+
+    def test_evaluate(self):
+        r = evaluate.evaluate(evaluate.pairs(self.path), lang="nl", chunksize=4)
+        self.assertEqual(r["language"], "dutch")
+        self.assertEqual(r["pairs"], 6)
+        for op in ("pluralize", "singularize"):
+            x = r[op]
+            self.assertEqual(x["words"], 6)
+            self.assertEqual(x["correct"], sum(
+                getattr(gd, op)(a if op == "pluralize" else b) == (b if op == "pluralize" else a) for a, b in ROWS))
+            self.assertAlmostEqual(x["accuracy"], float(x["correct"]) / 6)
+            self.assertEqual(len(x["errors"]), 6 - x["correct"])
+            self.assertTrue(x["words_per_second"] > 0)
+            self.assertTrue("rules" not in x)
+        self.assertTrue((u'xyz', u'wrong', gd.pluralize(u'xyz')) in r["pluralize"]["errors"])
+
+    def test_cache(self):
+        r1 = evaluate.evaluate(evaluate.pairs(self.path), lang="nl")
+        r2 = evaluate.evaluate(evaluate.pairs(self.path), lang="nl", cache=100, errors=0)
+        self.assertEqual(r1["pluralize"]["correct"], r2["pluralize"]["correct"])
+        self.assertEqual(r2["pluralize"]["errors"], [])
+        self.assertTrue(gd.pluralize.cache_info().size > 0)
+
+    def test_rules(self):
+        r = evaluate.evaluate(evaluate.pairs(self.path), lang="nl", rules=True)
+        self.assertFalse(instrument.enabled("nl"))
+        for op in ("pluralize", "singularize"):
+            rules = r[op]["rules"]
+            self.assertEqual(sum(v["correct"] for v in rules.values()), r[op]["correct"])
+            self.assertEqual(sum(v["wrong"] for v in rules.values()), 6 - r[op]["correct"])
+        self.assertEqual(r["pluralize"]["rules"]["plural_rules[17]: consonants"]["correct"], 3) # 2x fiets, hand
+        instrument.reset()
+        # The same accuracy as without rules=True, for capitalized words.
+        pairs = [(u"Child", u"Children"), (u"Mouse", u"Mice"), (u"Cat", u"Cats"), (u"Box", u"Boxes")]
+        for kwargs in ({}, {"rules": True}):
+            r = evaluate.evaluate(pairs, lang="en", **kwargs)
+            self.assertEqual(r["pluralize"]["accuracy"], 1.0)
+            self.assertEqual(r["singularize"]["accuracy"], 1.0)
+        instrument.reset()
+
+    def test_main(self):
+        f = io.StringIO()
+        with contextlib.redirect_stdout(f):
+            evaluate.main([self.path, "-l", "nl", "--rules"])
+        s = f.getvalue()
+        self.assertTrue(s.startswith("dutch: 6 pairs"))
+        self.assertTrue("plural_rules[17]: consonants" in s)
+        instrument.reset()
+
+if __name__ == '__main__':
+    unittest.main()
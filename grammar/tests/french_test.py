@@ -27,3 +27,7 @@ class french_test(unittest.TestCase):
             self.assertEqual(gf.singularize(pair[1]), pair[0], "Singular form for " + pair[1] + " is incorrect.")
             self.assertEqual(gf.pluralize(pair[0]), pair[1], "Plural form for " + pair[0] + " is incorrect.")
 
+    def test_many(self):
+        words = iter([ 'jeu', 'chaise', 'jeu' ])
+        self.assertEqual(gf.pluralize_many(words), [ 'jeux', 'chaises', 'jeux' ])
+        self.assertEqual(gf.singularize_many([ 'jeux', 'chaises' ]), [ 'jeu', 'chaise' ])
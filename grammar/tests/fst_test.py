@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import unittest
+import tempfile
+import grammar.german as gg
+import grammar.french as gf
+from grammar import fst
+
+WORDS = [u'katze', u'zeitung', u'hund', u'bahn', u'bad', u'auto', u'pizza', u'Haustür', u'',
+         u'katzen', u'zeitungen', u'hunde', u'bäder', u'autos', u'xyz',
+         u'cheval', u'bijou', u'pneu', u'bleu', u'chevaux', u'studii', u'maxima', u'danseuses']
+
+class fst_test(unittest.TestCase):
+
+    def tearDown(self):
+        fst.uninstall("de")
+        fst.uninstall("fr")
+
+    def test_transducer(self):
+        f = fst.Transducer([(u'en', u''), (u'nen', u'n'), (u'e', u''), (u'', u'x')])
+        self.assertEqual(f(u'katzen'), u'katz')  # first rule wins over longer suffix
+        self.assertEqual(f(u'katze'), u'katz')
+        self.assertEqual(f(u'hund'), u'hundx')
+        self.assertEqual(fst.Transducer([(u'e', u'')])(u'hund'), None)
+
+    def test_install(self):
+        for lang, m in (("de", gg), ("fr", gf)):
+            v1 = [(m.pluralize(w), m.singularize(w)) for w in WORDS]
+            fst.install(lang)
+            self.assertTrue(isinstance(m._plural_suffix, fst.Transducer))
+            v2 = [(m.pluralize(w), m.singularize(w)) for w in WORDS]
+            fst.uninstall(lang)
+            self.assertFalse(isinstance(m._plural_suffix, fst.Transducer))
+            self.assertEqual(v1, v2)
+        self.assertRaises(ValueError, fst.compile, "nl")
+
+    def test_save(self):
+        f, path = tempfile.mkstemp(suffix=".fst")
+        os.close(f)
+        try:
+            fst.save("de", path)
+            fst.install("de", path)
+            self.assertEqual(gg.pluralize(u'katze'), u'katzen')
+            self.assertEqual(gg.singularize(u'zeitungen'), u'zeitung')
+            # The file is JSON (not pickle), with a format version.
+            with open(path, encoding="utf-8") as f:
+                a = json.load(f)
+            self.assertEqual(a["_plural_suffix"][0], fst.FORMAT)
+            a["_plural_suffix"][0] = fst.FORMAT + 1
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(a, f)
+            self.assertRaises(ValueError, fst.load, path)
+        finally:
+            os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import random
 import unittest
 import grammar.german as gg
 #import importlib
@@ -14,5 +15,64 @@ class german(unittest.TestCase):
             self.assertEqual(gg.singularize(pair[1]), pair[0])
             self.assertEqual(gg.pluralize(pair[0]), pair[1])
 
+    def test_many(self):
+        words = iter([u'katze', u'hund', u'katze'])
+        self.assertEqual(gg.pluralize_many(words), [u'katzen', u'hunde', u'katzen'])
+        self.assertEqual(gg.singularize_many([u'katzen', u'katzen']), [u'katze', u'katze'])
+
+    def test_compound(self):
+        self.assertEqual(gg.pluralize(u'Haustürschlüssel'), u'Haustürschlüssel')
+        self.assertEqual(gg.pluralize(u'Bundesverfassungsgericht'), u'Bundesverfassungsgerichte')
+        self.assertEqual(gg.pluralize(u'Zeitraum'), u'Zeiträume')
+        self.assertEqual(gg.pluralize(u'Tür'), u'Türen')
+        self.assertEqual(gg.singularize(u'Kaufhäuser'), u'Kaufhaus')
+        self.assertEqual(gg.singularize(u'Bundesverfassungsgerichte'), u'Bundesverfassungsgericht')
+        # The head must be preceded by at least 2 letters (Last is not L + Ast).
+        f = gg.compound_index({u'raum': u'räume'})
+        self.assertEqual(f(u'zeitraum'), u'zeiträume')
+        self.assertEqual(f(u'raum'), u'räume')
+        self.assertEqual(f(u'traum'), None)
+        try:
+            gg.compound_heads[u'ast'] = u'äste'
+            gg.index_compound_heads()
+            self.assertEqual(gg.pluralize.function(u'baumast'), u'baumäste')
+            self.assertEqual(gg.pluralize.function(u'last'), u'laste') # Not läste.
+        finally:
+            del gg.compound_heads[u'ast']
+            gg.index_compound_heads()
+
+    def test_suffix_index(self):
+        # The index returns the same first match as a linear scan of the rules.
+        def scan(inflections, w):
+            for a, b in inflections:
+                if w.endswith(a):
+                    return w[:len(w)-len(a)] + b
+        r = random.Random(0)
+        for inflections in (gg.plural_inflections, gg.singular_inflections):
+            f = gg.suffix_index(inflections)
+            words = set([u''])
+            for a, b in inflections:
+                words.update((a, a[1:], u'x' + a, u'ge' + a + u'n'))
+            for i in range(2000):
+                words.add(u''.join(r.choice(u'abeghilmnorstuäöü') for j in range(r.randint(1, 8))))
+            for w in words:
+                self.assertEqual(f(w), scan(inflections, w), w)
+
+    def test_compound_heads(self):
+        f = gg.compound_index({u'fisch': None, u'tür': u'türen'}, lambda h: h + u'e')
+        self.assertEqual(f(u'thunfisch'), u'thunfische')
+        self.assertEqual(f(u'haustür'), u'haustüren')
+        self.assertEqual(f(u'tür'), u'türen')
+        self.assertEqual(f(u'stür'), None)
+        self.assertEqual(f(u'katze'), None)
+        try:
+            gg.compound_heads[u'fisch'] = None
+            gg.index_compound_heads()
+            self.assertEqual(gg.pluralize.function(u'thunfisch'), u'thunfische')
+            self.assertEqual(gg.pluralize.function(u'schwertfisch'), u'schwertfische')
+        finally:
+            del gg.compound_heads[u'fisch']
+            gg.index_compound_heads()
+
 if __name__ == '__main__':
     unittest.main()
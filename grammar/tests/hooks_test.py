@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import unittest
+import grammar.english as ge
+import grammar.german as gg
+import grammar.dutch as gd
+from grammar import hooks, overrides, instrument, fst, cascade
+
+class hooks_test(unittest.TestCase):
+
+    def tearDown(self):
+        overrides.uninstall("en")
+        instrument.disable()
+        instrument.reset()
+        fst.uninstall("de")
+        cascade.uninstall("nl")
+
+    def test_layers(self):
+        class X(object):
+            f = 0
+        x = X()
+        hooks.install(x, "f", "a", lambda v: v + 1)
+        hooks.install(x, "f", "b", lambda v: v * 10)
+        self.assertEqual(x.f, 10)
+        self.assertEqual(hooks.owners(x, "f"), ["a", "b"])
+        hooks.install(x, "f", "a", lambda v: v + 2) # Replaced in place.
+        self.assertEqual(x.f, 20)
+        self.assertTrue(hooks.uninstall(x, "f", "a"))
+        self.assertFalse(hooks.uninstall(x, "f", "a"))
+        self.assertEqual(x.f, 0)
+        self.assertTrue(hooks.installed(x, "f", "b"))
+        hooks.uninstall(x, "f", "b")
+        self.assertEqual(x.f, 0)
+        self.assertEqual(hooks.owners(x, "f"), [])
+
+    def test_overrides_instrument(self):
+        f = ge.pluralize.function
+        # instrument => overrides => instrument off => overrides off
+        instrument.enable("en")
+        overrides.install(overrides.Overrides({u"iPhone": u"iPhonex"}), "en")
+        instrument.disable("en")
+        self.assertEqual(hooks.owners(ge.pluralize, "function"), ["overrides"])
+        self.assertEqual(ge.pluralize(u"iPhone"), u"iPhonex")
+        overrides.uninstall("en")
+        self.assertTrue(ge.pluralize.function is f)
+        # overrides => instrument => overrides off => instrument off
+        overrides.install(overrides.Overrides({u"iPhone": u"iPhonex"}), "en")
+        instrument.enable("en")
+        overrides.uninstall("en")
+        self.assertTrue(instrument.enabled("en"))
+        self.assertEqual(ge.pluralize(u"iPhone"), u"iPhones")
+        instrument.disable("en")
+        self.assertTrue(ge.pluralize.function is f)
+
+    def test_fst_instrument(self):
+        f = gg._plural_suffix
+        # fst => instrument => fst off => instrument off
+        fst.install("de")
+        instrument.enable("de")
+        fst.uninstall("de")
+        self.assertEqual(hooks.owners(gg, "_plural_suffix"), ["instrument"])
+        instrument.disable("de")
+        self.assertTrue(gg._plural_suffix is f)
+        # instrument => fst => instrument off => fst off
+        instrument.enable("de")
+        fst.install("de")
+        instrument.disable("de")
+        self.assertTrue(isinstance(gg._plural_suffix, fst.Transducer))
+        self.assertEqual(gg.pluralize.function(u"katze"), u"katzen")
+        fst.uninstall("de")
+        self.assertTrue(gg._plural_suffix is f)
+
+    def test_cascade_instrument(self):
+        f = gd._plural_rules
+        p = {"dutch": {"plural_rules": {"'s": 10}}}
+        # cascade => instrument => cascade off => instrument off
+        cascade.install(p)
+        instrument.enable("nl")
+        cascade.uninstall("nl")
+        self.assertEqual(hooks.owners(gd, "_plural_rules"), ["instrument"])
+        instrument.disable("nl")
+        self.assertTrue(gd._plural_rules is f)
+        # instrument => cascade => instrument off => cascade off
+        instrument.enable("nl")
+        cascade.install(p)
+        instrument.disable("nl")
+        self.assertEqual(hooks.owners(gd, "_plural_rules"), ["cascade"])
+        self.assertEqual(gd.pluralize.function(u"auto"), u"auto's")
+        cascade.uninstall("nl")
+        self.assertTrue(gd._plural_rules is f)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+import subprocess
+import grammar
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class init_test(unittest.TestCase):
+
+    def run_python(self, code):
+        return subprocess.check_output([sys.executable, "-c", code], cwd=ROOT).decode("utf-8").strip()
+
+    def test_lazy_import(self):
+        # Importing the package does not import the language modules.
+        self.assertEqual(self.run_python(
+            "import sys, grammar; print(sorted(m for m in sys.modules if m.startswith('grammar')))"),
+            "['grammar']")
+        self.assertEqual(self.run_python(
+            "import sys, grammar; grammar.german; print('grammar.german' in sys.modules)"), "True")
+        # Each submodule is available as an attribute of the package.
+        for f in sorted(os.listdir(os.path.join(ROOT, "grammar"))):
+            if f.endswith(".py") and not f.startswith("_"):
+                self.assertTrue(f[:-3] in grammar.__all__, f)
+        self.assertEqual(self.run_python(
+            "import grammar; print(grammar.cascade.__name__)"), "grammar.cascade")
+
+    def test_lazy_rules(self):
+        # Importing a language module does not compile its rules.
+        self.assertEqual(self.run_python(
+            "import grammar.english as en; print(len(en.plural_rules_compiled), en.singular_rules_compiled)"),
+            "0 None")
+
+    def test_getattr(self):
+        self.assertEqual(grammar.german.pluralize(u'katze'), u'katzen')
+        self.assertEqual(grammar.english.singularize(u'children'), u'child')
+        self.assertTrue("dutch" in dir(grammar))
+        self.assertRaises(AttributeError, getattr, grammar, "spanish")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import unittest
+import grammar
+import grammar.english as ge
+import grammar.german as gg
+import grammar.dutch as gd
+from grammar import instrument
+
+class instrument_test(unittest.TestCase):
+
+    def setUp(self):
+        instrument.reset()
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def rules(self, name):
+        return dict((r["rule"], r) for r in grammar.stats()[name]["rules"])
+
+    def test_english(self):
+        instrument.enable("en")
+        self.assertEqual(ge.pluralize(u'child'), u'children')
+        self.assertEqual(ge.pluralize(u'cat'), u'cats')
+        self.assertEqual(ge.pluralize(u'dog'), u'dogs')
+        self.assertEqual(ge.singularize(u'wolves'), u'wolf')
+        r = self.rules("english.pluralize")
+        self.assertEqual(r[u'plural_rules[5]: child$ => children']["hits"], 1)
+        self.assertEqual(r[u'plural_rules[14]: $ => s']["hits"], 2)
+        self.assertTrue(r[u'plural_rules[14]: $ => s']["evaluated"] > 1)
+        self.assertEqual(grammar.stats()["english.pluralize"]["calls"], 3)
+        r = self.rules("english.singularize")
+        self.assertTrue(any(k.startswith("singular_rules[") for k in r))
+
+    def test_cascade(self):
+        instrument.enable("nl", "de")
+        self.assertEqual(gd.pluralize(u'hand'), u'handen')
+        self.assertEqual(gd.singularize(u'handen'), u'hand')
+        self.assertEqual(gg.singularize(u'zeitungen'), u'zeitung')
+        r = self.rules("dutch.pluralize")
+        self.assertEqual(list(r), [u'plural_rules[17]: consonants'])
+        self.assertEqual(r[u'plural_rules[17]: consonants']["evaluated"], 20.0) # 2 conditions + 18 rules
+        r = list(self.rules("dutch.singularize"))
+        self.assertEqual(len(r), 1)
+        self.assertTrue(r[0].startswith("line "))
+        r = list(self.rules("german.singularize"))
+        self.assertTrue(r[0].startswith("singular_inflections["))
+
+    def test_disable(self):
+        f1, f2 = ge.pluralize.function, gg._plural_suffix
+        instrument.enable()
+        self.assertTrue(instrument.enabled("en"))
+        self.assertFalse(ge.pluralize.function is f1)
+        instrument.disable()
+        self.assertFalse(instrument.enabled("en"))
+        self.assertTrue(ge.pluralize.function is f1)
+        self.assertTrue(gg._plural_suffix is f2)
+        ge.pluralize(u'child')
+        self.assertEqual(grammar.stats(), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import unittest
+import grammar.english as ge
+import grammar.german as gg
+from grammar.inverse import Inverse, edit, vocabulary
+
+class inverse_test(unittest.TestCase):
+
+    def test_edit(self):
+        self.assertEqual(edit(u"wolf", u"wolves"), (u"f", u"ves"))
+        self.assertEqual(edit(u"cat", u"cats"), (u"", u"s"))
+        self.assertEqual(edit(u"Kopf", u"Köpfe"), (u"opf", u"öpfe"))
+        self.assertEqual(edit(u"sheep", u"sheep"), (u"", u""))
+
+    def test_vocabulary(self):
+        v = vocabulary(ge)
+        self.assertTrue(u"child" in v)
+        self.assertTrue(u"y" in v)    # "([^aeiouy]|qu)y$"
+        self.assertTrue(u"by" in v)   # Ending after a stem.
+
+    def test_candidates(self):
+        f = Inverse("en")
+        self.assertTrue(u"wolf" in f.candidates(u"wolves"))
+        self.assertTrue(u"party" in f.candidates(u"parties"))
+        self.assertEqual(f.candidates(u"xyz"), [])
+
+    def test_singularize(self):
+        # pluralize(singularize(w)) != w for these words, but not for the inverse.
+        f = Inverse("en")
+        for w1, w2 in ((u"agenda", u"agendum"), (u"afreeti", u"afreet"), (u"bemata", u"bema")):
+            self.assertNotEqual(ge.pluralize(ge.singularize(w1)), w1)
+            self.assertEqual(f(w1), w2)
+            self.assertEqual(ge.pluralize(f(w1)), w1)
+        # Same as singularize() if it round-trips.
+        for w in (u"wolves", u"children", u"cats", u"parties", u"mice"):
+            self.assertEqual(f(w), ge.singularize(w))
+        f = Inverse("de")
+        self.assertEqual(f(u"Köpfe"), u"Kopf")
+        self.assertEqual(f.singularize_many([u"Katzen", u"hunde"]), [u"Katze", u"hund"])
+
+    def test_cache(self):
+        f = Inverse("en", cache=2)
+        f(u"wolves")
+        f(u"wolves")
+        self.assertEqual(f.cache.info()[:2], (1, 1))
+        f(u"cats")
+        f(u"mice")
+        self.assertEqual(len(f.cache), 2)
+
+    def test_learn(self):
+        f = Inverse("de")
+        w = gg.pluralize(u"xyzbum")
+        f.learn([u"xyzbum"])
+        self.assertEqual(gg.pluralize(f(w)), w)
+        self.assertEqual(len(f.cache), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import os
+import unittest
+import tempfile
+import unicodedata
+import grammar.german as gg
+from grammar.lexicon import build, Lexicon
+
+class lexicon_test(unittest.TestCase):
+
+    def setUp(self):
+        f, self.path = tempfile.mkstemp(suffix=".lex")
+        os.close(f)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_lexicon(self):
+        words = [u'katze', u'hund', u'haus', u'mädchen', u'katze']
+        self.assertEqual(build(words, self.path, lang="de", op="pluralize"), 4)
+        with Lexicon(self.path) as lexicon:
+            self.assertEqual(len(lexicon), 4)
+            self.assertEqual(sorted(lexicon), sorted(set(words)))
+            for w in words:
+                self.assertEqual(lexicon[w], gg.pluralize(w))
+                self.assertTrue(w in lexicon)
+            # Unknown words are inflected with the rules.
+            self.assertFalse(u'zeitung' in lexicon)
+            self.assertEqual(lexicon.get(u'zeitung'), None)
+            self.assertEqual(lexicon(u'zeitung'), u'zeitungen')
+            self.assertRaises(KeyError, lambda: lexicon[u'zeitung'])
+
+    def test_normalize(self):
+        # Words are stored normalized, and looked up in any case or Unicode form.
+        build([u'Katze', u'katze', u'KÄSE'], self.path, lang="de", op="pluralize")
+        with Lexicon(self.path) as lexicon:
+            self.assertEqual(sorted(lexicon), [u'katze', u'käse'])
+            self.assertEqual(lexicon[u'Katze'], u'Katzen')
+            self.assertEqual(lexicon[u'katze'], u'katzen')
+            self.assertEqual(lexicon.get(unicodedata.normalize("NFD", u'Käse')), gg.pluralize(u'Käse'))
+            self.assertTrue(u'KATZE' in lexicon)
+
+    def test_arguments(self):
+        build([u'my'], self.path, lang="en", op="pluralize", pos="JJ")
+        with Lexicon(self.path) as lexicon:
+            self.assertEqual(lexicon.kwargs, {"pos": "JJ"})
+            self.assertEqual(lexicon(u'my'), u'our')
+            self.assertEqual(lexicon(u'cat'), u'cat') # adjective
+
+    def test_empty(self):
+        build([], self.path)
+        with Lexicon(self.path) as lexicon:
+            self.assertEqual(len(lexicon), 0)
+            self.assertEqual(lexicon(u'child'), u'children')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import unittest
+import tempfile
+from grammar.__main__ import main
+
+class main_test(unittest.TestCase):
+
+    def inflect(self, text, *args):
+        f = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8")
+        f.write(text)
+        f.close()
+        try:
+            out = io.StringIO()
+            self.assertEqual(main(list(args) + [f.name], stdout=out), 0)
+            return out.getvalue()
+        finally:
+            os.remove(f.name)
+
+    def test_lines(self):
+        self.assertEqual(self.inflect(u"child\n\nbox\n", "pluralize"), u"children\n\nboxes\n")
+        self.assertEqual(self.inflect(u"katzen\n", "singularize", "-l", "de"), u"katze\n")
+
+    def test_column(self):
+        self.assertEqual(
+            self.inflect(u"1\tchild\tx\n2\n", "pluralize", "--column", "2"), u"1\tchildren\tx\n2\n")
+        self.assertEqual(
+            self.inflect(u"fiets,1\n", "pluralize", "-l", "nl", "-c", "1", "-d", ","), u"fietsen,1\n")
+
+    def test_workers(self):
+        words = u"child\ncat\n" * 50
+        self.assertEqual(
+            self.inflect(words, "pluralize", "--workers", "2", "--chunk-size", "7", "--cache-size", "10"),
+            u"children\ncats\n" * 50)
+        self.assertEqual(
+            self.inflect(words, "pluralize", "--workers", "2", "--threads", "--chunk-size", "7"),
+            u"children\ncats\n" * 50)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import sys
+import io
+import unittest
+import contextlib
+import grammar.english as ge
+import grammar.german as gg
+from grammar import memory
+
+class memory_test(unittest.TestCase):
+
+    def tearDown(self):
+        ge.pluralize.cache_disable()
+
+    def test_sizeof(self):
+        s = u"katzen"
+        self.assertEqual(memory.sizeof(s), sys.getsizeof(s))
+        self.assertEqual(memory.sizeof([s, s]), sys.getsizeof([s, s]) + sys.getsizeof(s))
+        # Objects that were seen are not counted again.
+        seen = set()
+        memory.sizeof(s, seen)
+        self.assertEqual(memory.sizeof((s,), seen), sys.getsizeof((s,)))
+        # Closures are only counted for functions in the given module.
+        f = gg._plural_suffix
+        self.assertEqual(memory.sizeof(f), 0)
+        self.assertTrue(memory.sizeof(f, name="grammar.german") > memory.sizeof(gg.plural_inflections))
+
+    def test_report(self):
+        r = memory.report("en")
+        self.assertEqual(r["language"], "english")
+        self.assertEqual(r["total"], sum(r["tables"].values()))
+        self.assertTrue("plural_category_index" in r["tables"])
+        self.assertEqual(r["caches"]["pluralize"], 0)
+        ge.pluralize.cache_enable(10)
+        ge.pluralize("cat")
+        self.assertTrue(memory.report("en")["caches"]["pluralize"] > 0)
+
+    def test_shared(self):
+        # Words with the same categories share one frozenset.
+        index = ge.plural_category_index
+        self.assertTrue(index["bison"] is index["trout"])
+        self.assertEqual(index["news"], frozenset(("uninflected", "uncountable")))
+
+    def test_main(self):
+        f = io.StringIO()
+        with contextlib.redirect_stdout(f):
+            memory.main(["-l", "de", "-n", "3"])
+        self.assertTrue(f.getvalue().startswith("german: "))
+
+if __name__ == '__main__':
+    unittest.main()
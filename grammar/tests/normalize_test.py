@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import unittest
+import unicodedata
+import grammar.english as ge
+import grammar.dutch as gd
+import grammar.german as gg
+from grammar.normalize import fold, restore
+
+class normalize_test(unittest.TestCase):
+
+    def tearDown(self):
+        gg.pluralize.cache_disable()
+
+    def test_fold(self):
+        self.assertEqual(fold(u"cats"), u"cats")
+        self.assertEqual(fold(u"CATS"), u"cats")
+        self.assertEqual(fold(unicodedata.normalize("NFD", u"Käse")), u"käse")
+        self.assertEqual(fold(u"Straße"), u"straße") # Not casefold().
+
+    def test_restore(self):
+        self.assertEqual(restore(u"katzen", u"katze"), u"katzen")
+        self.assertEqual(restore(u"katzen", u"Katze"), u"Katzen")
+        self.assertEqual(restore(u"katzen", u"KATZE"), u"KATZEn")
+        self.assertEqual(restore(u"mice", u"MOUSE"), u"MICE")
+        self.assertEqual(restore(u"köpfe", unicodedata.normalize("NFD", u"Kopf")), u"Köpfe")
+        self.assertEqual(restore(u"macbooks", u"MacBook"), u"MacBooks")
+        self.assertEqual(restore(u"mothers-in-law", u"Mother-In-Law"), u"Mothers-In-Law")
+        self.assertEqual(restore(u"", u"A"), u"")
+
+    def test_inflect(self):
+        self.assertEqual(gg.pluralize(u"Katze"), u"Katzen")
+        self.assertEqual(gg.pluralize(u"KOPF"), u"KÖPFe")
+        self.assertEqual(gg.singularize(unicodedata.normalize("NFD", u"Köpfe")), u"Kopf")
+        self.assertEqual(ge.pluralize(u"Child"), u"Children")
+        self.assertEqual(ge.singularize(u"WOLVES"), u"WOLF")
+        self.assertEqual(ge.pluralize_many([u"Child", u"child"]), [u"Children", u"children"])
+        # A capitalized word is inflected as the lowercase word, unless it is a proper noun
+        # given in the custom dict (or as an override).
+        self.assertEqual(ge.pluralize(u"Party"), u"Parties")
+        self.assertEqual(ge.pluralize(u"Mary", custom={u"Mary": u"Marys"}), u"Marys")
+        # Nationalities in -ese do not inflect, in any case.
+        for w in (u"Chinese", u"Japanese", u"japanese", u"PORTUGUESE"):
+            self.assertEqual(ge.pluralize(w), w)
+        self.assertEqual(ge.pluralize(u"I"), u"we")
+
+    def test_custom(self):
+        # A custom dict is matched on the word as given, then on the normalized word,
+        # and its value is returned as is.
+        self.assertEqual(gg.pluralize(u"Katze", custom={u"Katze": u"Katzis"}), u"Katzis")
+        self.assertEqual(gg.pluralize(u"Katze", custom={u"katze": u"katzis"}), u"katzis")
+        self.assertEqual(gd.pluralize(u"Stad", custom={u"stad": u"stedenX"}), u"stedenX")
+        self.assertEqual(gd.pluralize(word=u"STAD", custom={u"stad": u"x"}), u"x")
+        self.assertEqual(ge.pluralize(u"Dog", custom={u"Dog": u"A", u"dog": u"b"}), u"A")
+
+    def test_acronyms(self):
+        # The letters of the word keep its case, added letters stay lowercase.
+        for w1, w2 in ((u"FBI", u"FBIs"), (u"CD", u"CDs"), (u"DVD", u"DVDs"), (u"URL", u"URLs"),
+                       (u"NASA", u"NASAs"), (u"ATM", u"ATMs"), (u"OS", u"OSs")):
+            self.assertEqual(ge.pluralize(w1), w2)
+        self.assertEqual(gd.pluralize(u"NASA"), u"NASA's")
+        self.assertEqual(ge.singularize(u"DVDs"), u"DVD")
+
+    def test_keywords(self):
+        self.assertEqual(gd.pluralize(word=u"Stad"), u"Steden")
+        self.assertEqual(ge.singularize(word=u"Children"), u"Child")
+        self.assertEqual(gg.pluralize(word=u"Kopf", pos="NN"), u"Köpfe")
+        gg.pluralize.cache_enable(10)
+        gg.pluralize(word=u"Katze")
+        gg.pluralize(u"katze")
+        self.assertEqual(gg.pluralize.cache_info().hits, 1) # Keyed on the normalized word.
+
+    def test_cache(self):
+        gg.pluralize.cache_enable(10)
+        for w in (u"katze", u"Katze", u"KATZE", u"käse", unicodedata.normalize("NFD", u"Käse")):
+            gg.pluralize(w)
+        info = gg.pluralize.cache_info()
+        self.assertEqual((info.hits, info.misses, info.size), (3, 2, 2))
+
+if __name__ == "__main__":
+    unittest.main()
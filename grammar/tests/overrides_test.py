@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import os
+import io
+import shutil
+import unittest
+import tempfile
+import grammar.english as ge
+import grammar.dutch as gd
+from grammar import overrides, instrument, hooks
+
+class overrides_test(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        overrides.uninstall("en")
+        overrides.uninstall("nl")
+        ge.pluralize.cache_disable()
+
+    def write(self, s):
+        path = os.path.join(self.dir, "overrides.tsv")
+        with io.open(path, "w", encoding="utf-8") as f:
+            f.write(s)
+        return path
+
+    def test_overrides(self):
+        r = overrides.Overrides({u"iPhone": u"iPhones"}, {u"-pro": u"-pros", u"o": u"oz"})
+        self.assertEqual(r.get(u"iPhone"), u"iPhones")
+        self.assertEqual(r.get(u"MacBook-pro"), u"MacBook-pros") # Longest suffix.
+        self.assertEqual(r.get(u"Lego"), u"Legoz")
+        self.assertEqual(r.get(u"cat"), None)
+        self.assertEqual(len(r), 3)
+        words, suffixes = r.changes(overrides.Overrides({u"iPhone": u"iPhone", u"iPad": u"iPads"}, {u"o": u"oz"}))
+        self.assertEqual(words, set([u"iphone", u"ipad"]))
+        self.assertEqual(suffixes, (u"-pro",))
+
+    def test_read(self):
+        path = self.write(u"# brands\niPhone\tiPhones\n\n*-pro\t*-pros\n")
+        r = overrides.read(path)
+        self.assertEqual(r.exact, {u"iphone": u"iPhones"}) # Normalized.
+        self.assertEqual(r.suffixes, {u"-pro": u"-pros"})
+        r = overrides.read(path, inverse=True)
+        self.assertEqual(r.exact, {u"iphones": u"iPhone"})
+        self.assertRaises(ValueError, overrides.read, self.write(u"iPhone\n"))
+
+    def test_load(self):
+        path = self.write(u"iPhone\tiPhonez\nfiets\tfietsjes\n")
+        overrides.load(path, "en")
+        overrides.load(path, "en", "singularize", inverse=True)
+        self.assertEqual(ge.pluralize(u"iPhone"), u"iPhonez")
+        self.assertEqual(ge.singularize(u"iPhonez"), u"iPhone")
+        self.assertEqual(ge.pluralize(u"child"), u"children")
+        # A custom argument takes precedence.
+        self.assertEqual(ge.pluralize(u"iPhone", custom={u"iPhone": u"x"}), u"x")
+        self.assertEqual(ge.pluralize(u"iPhone", ge.NOUN, {u"iPhone": u"x"}), u"x")
+        self.assertEqual(gd.pluralize(u"fiets"), u"fietsen")
+        overrides.load(path, "nl")
+        self.assertEqual(gd.pluralize(u"fiets"), u"fietsjes")
+        self.assertEqual(overrides.get("nl").exact[u"fiets"], u"fietsjes")
+        overrides.uninstall("nl")
+        self.assertEqual(gd.pluralize(u"fiets"), u"fietsen")
+        self.assertEqual(overrides.get("nl"), None)
+        self.assertEqual(hooks.owners(gd.pluralize, "function"), [])
+
+    def test_reload(self):
+        # Only the cached results of changed words are removed.
+        ge.pluralize.cache_enable(100)
+        overrides.install(overrides.Overrides({u"iPhone": u"iPhonez"}, {u"-pro": u"-proz"}), "en")
+        for w in (u"iPhone", u"child", u"MacBook-pro", u"cat"):
+            ge.pluralize(w)
+        ge.pluralize(u"cat", classical=False)
+        self.assertEqual(ge.pluralize(u"MacBook-pro"), u"MacBook-proz")
+        n = overrides.install(overrides.Overrides({u"iPhone": u"iPhonex"}), "en")
+        self.assertEqual(n, 2) # iPhone, MacBook-pro
+        self.assertEqual(ge.pluralize.cache_info().size, 3)
+        self.assertEqual(ge.pluralize(u"iPhone"), u"iPhonex")
+        self.assertEqual(ge.pluralize(u"MacBook-pro"), u"MacBook-pros")
+        n = overrides.install(overrides.Overrides({u"iPhone": u"iPhonex", u"cat": u"kats"}), "en")
+        self.assertEqual(n, 2) # cat, cat (classical=False)
+        self.assertEqual(ge.pluralize(u"cat", classical=False), u"kats")
+
+    def test_stale(self):
+        # A result computed before a reload is not cached after it.
+        ge.pluralize.cache_enable(100)
+        overrides.install(overrides.Overrides({u"iPhone": u"iPhonex"}), "en")
+        g = ge.pluralize.cache.generation
+        overrides.install(overrides.Overrides({u"iPhone": u"iPhonez"}), "en")
+        ge.pluralize.cache.set(u"iPhone", u"iPhonex", g)
+        self.assertEqual(ge.pluralize(u"iPhone"), u"iPhonez")
+
+    def test_proper_nouns(self):
+        # Names are given as overrides (capitalized words are inflected as the lowercase word).
+        self.assertEqual(ge.pluralize(u"Mary"), u"Maries")
+        overrides.install(overrides.Overrides({u"Mary": u"Marys"}), "en")
+        self.assertEqual(ge.pluralize(u"Mary"), u"Marys")
+        self.assertEqual(ge.pluralize(u"Party"), u"Parties")
+
+    def test_instrument(self):
+        overrides.install(overrides.Overrides({u"iPhone": u"iPhonex"}), "en")
+        instrument.enable("en")
+        try:
+            self.assertEqual(ge.pluralize(u"iPhone"), u"iPhonex")
+            overrides.uninstall("en")
+            self.assertEqual(ge.pluralize(u"iPhone"), u"iPhones")
+            overrides.install(overrides.Overrides({u"iPhone": u"iPhonez"}), "en")
+            self.assertEqual(ge.pluralize(u"iPhone"), u"iPhonez")
+        finally:
+            instrument.disable("en")
+            instrument.reset()
+        self.assertEqual(ge.pluralize(u"iPhone"), u"iPhonez")
+
+if __name__ == '__main__':
+    unittest.main()
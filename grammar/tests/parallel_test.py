@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import unittest
+import grammar.parallel as gp
+import grammar.german as gg
+
+class parallel_test(unittest.TestCase):
+
+    words = [u'katzen', u'hunde', u'häuser', u'katzen', u'zeitungen'] * 50
+
+    def test_inflect(self):
+        expected = [gg.singularize(w) for w in self.words]
+        self.assertEqual(gp.inflect(self.words, lang="de", op="singularize", workers=1), expected)
+        self.assertEqual(gp.inflect(iter(self.words), lang="german", op="singularize", workers=2, chunksize=7), expected)
+
+    def test_threads(self):
+        expected = [gg.singularize(w) for w in self.words]
+        with gp.Inflector("de", "singularize", workers=4, chunksize=7, threads=True, cache=10) as f:
+            self.assertEqual(f.map(self.words), expected)
+            self.assertEqual(gg.singularize.cache_info().maxsize, 10) # One cache, shared by the threads.
+        self.assertEqual(gg.singularize.cache_info(), None) # Restored.
+
+    def test_cache(self):
+        # The cache of the caller is restored on close().
+        try:
+            gg.singularize.cache_enable(5)
+            c = gg.singularize.cache
+            for workers, threads in ((1, False), (2, True)):
+                with gp.Inflector("de", "singularize", workers=workers, threads=threads, cache=100) as f:
+                    f.map(self.words)
+                    self.assertEqual(gg.singularize.cache_info().maxsize, 100)
+                self.assertTrue(gg.singularize.cache is c)
+                self.assertEqual(gg.singularize.cache_info().maxsize, 5)
+        finally:
+            gg.singularize.cache_disable()
+
+    def test_stats(self):
+        with gp.Inflector("en", "pluralize", workers=2, chunksize=100) as f:
+            self.assertEqual(f.map([u'child'] * 250), [u'children'] * 250)
+            self.assertEqual(f.stats["words"], 250)
+            self.assertEqual(f.stats["chunks"], 3)
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, gp.Inflector, "xx")
+        self.assertRaises(ValueError, gp.Inflector, "en", "conjugate")
+
+if __name__ == '__main__':
+    unittest.main()
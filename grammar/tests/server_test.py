@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import os
+import unittest
+import tempfile
+import grammar.cache
+from grammar.parallel import module, LANGUAGES
+from grammar.server import serve, unlink, Client
+
+class server_test(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.unix = os.path.join(tempfile.mkdtemp(), "grammar.sock")
+        cls.servers = serve(port=0, unix=cls.unix, cache_size=1000)
+        host, port = cls.servers[0].server_address
+        cls.clients = [Client("http://%s:%s" % (host, port)), Client(cls.unix)]
+
+    @classmethod
+    def tearDownClass(cls):
+        for c in cls.clients:
+            c.close()
+        for s in cls.servers:
+            s.shutdown()
+            s.server_close()
+        os.remove(cls.unix)
+        os.rmdir(os.path.dirname(cls.unix))
+        for lang in LANGUAGES:
+            grammar.cache.disable(module(lang))
+
+    def test_unlink(self):
+        # Only a socket is removed, not a regular file at the given path.
+        d = os.path.dirname(self.unix)
+        path = os.path.join(d, "words.txt")
+        with open(path, "w") as f:
+            f.write("child")
+        try:
+            self.assertRaises(ValueError, serve, port=None, unix=path)
+            self.assertRaises(ValueError, unlink, path)
+            self.assertTrue(os.path.exists(path))
+        finally:
+            os.remove(path)
+        unlink(os.path.join(d, "missing.sock"))
+
+    def test_inflect(self):
+        for c in self.clients:
+            self.assertEqual(c.pluralize(u'child'), u'children')
+            self.assertEqual(c.singularize(u'Häuser', lang="de"), u'Haus')
+            self.assertEqual(c.pluralize(u'my', pos="JJ"), u'our')
+            self.assertEqual(c.pluralize(u'matrix', classical=False), u'matrixes')
+
+    def test_many(self):
+        for c in self.clients:
+            self.assertEqual(c.pluralize_many([u'fiets', u'kind', u'fiets'], lang="nl"),
+                [u'fietsen', u'kinderen', u'fietsen'])
+            self.assertEqual(c.singularize_many([], lang="fr"), [])
+
+    def test_keep_alive(self):
+        c = self.clients[1]
+        c.pluralize(u'cat')
+        c1 = c._pool.queue[-1]
+        c.pluralize(u'dog')
+        self.assertTrue(c._pool.queue[-1] is c1)
+
+    def test_errors(self):
+        for c in self.clients:
+            self.assertRaises(ValueError, c.pluralize, u'cat', lang="xx")
+            self.assertRaises(ValueError, c.request, "GET", "/conjugate?word=be")
+            self.assertRaises(ValueError, c.pluralize_many, [None])
+            # The connection is still usable.
+            self.assertEqual(c.pluralize(u'ox'), u'oxen')
+
+    def test_stats(self):
+        c = self.clients[0]
+        c.pluralize(u'mouse')
+        c.pluralize(u'mouse')
+        self.assertTrue(c.stats()["en.pluralize"]["hits"] >= 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import unittest
+import itertools
+import grammar.english as ge
+from grammar import tagged
+
+SENTENCE = [(u'this', u'DT'), (u'child', u'NN'), (u'runs', u'VBZ'), (u'to', u'TO'), (u'my', u'PRP$'),
+            (u'old', u'JJ'), (u'house', u'NN'), (u'', u'NN'), (u'.', u'.')]
+
+class tagged_test(unittest.TestCase):
+
+    def test_inflect(self):
+        a = list(tagged.inflect(SENTENCE, lang="en", chunksize=4))
+        self.assertEqual(a, [u'these', u'children', u'runs', u'to', u'our', u'old', u'houses', u'', u'.'])
+        a = list(tagged.inflect([(u'children', u'NNS'), (u'run', u'VBP')], lang="en", op="singularize"))
+        self.assertEqual(a, [u'child', u'run'])
+        a = list(tagged.inflect([(u'Katze', u'NN'), (u'schnell', u'JJ')], lang="de"))
+        self.assertEqual(a, [u'Katzen', u'schnell'])
+        a = list(tagged.inflect([(u'les', u'DT'), (u'chaises', u'NNS'), (u'très', u'RB')], lang="fr", op="singularize"))
+        self.assertEqual(a, [u'le', u'chaise', u'très'])
+
+    def test_lazy(self):
+        # The stream is read one chunk at a time.
+        stream = itertools.cycle([(u'child', u'NN'), (u'runs', u'VBZ')])
+        a = list(itertools.islice(tagged.inflect(stream, lang="en", chunksize=3), 5))
+        self.assertEqual(a, [u'children', u'runs', u'children', u'runs', u'children'])
+        self.assertRaises(ValueError, tagged.inflect, [], lang="xx")
+
+    def test_routes(self):
+        self.assertEqual(tagged.default_routes("nl", "pluralize"), {"NN": "NN"})
+        a = list(tagged.inflect(SENTENCE[:3], lang="en", routes={"NN": "NN"}))
+        self.assertEqual(a, [u'this', u'children', u'runs'])
+        ge.pluralize.cache_enable(10)
+        try:
+            # Untouched tags are not inflected at all.
+            list(tagged.inflect([(u'runs', u'VBZ')] * 10, lang="en"))
+            self.assertEqual(ge.pluralize.cache_info().misses, 0)
+        finally:
+            ge.pluralize.cache_disable()
+
+    def test_documents(self):
+        a = list(tagged.inflect_documents([SENTENCE[:2], [], iter(SENTENCE[5:7])], lang="en"))
+        self.assertEqual(a, [[u'these', u'children'], [], [u'old', u'houses']])
+
+    def test_arrays(self):
+        tokens, tags = zip(*SENTENCE)
+        self.assertEqual(tagged.inflect_arrays(tokens, tags, lang="en"), list(tagged.inflect(SENTENCE)))
+        self.assertRaises(ValueError, tagged.inflect_arrays, [u'a'], [], lang="en")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import unittest
+import grammar.vectorized as gv
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+class vectorized_test(unittest.TestCase):
+
+    def test_list(self):
+        self.assertEqual(gv.pluralize(['fiets', None, 'fiets'], lang="nl"), ['fietsen', None, 'fietsen'])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_ndarray(self):
+        a = np.array([['katzen', 'hunde'], ['katzen', 'katzen']])
+        r = gv.singularize(a, lang="de")
+        self.assertEqual(r.shape, (2, 2))
+        self.assertEqual(r.tolist(), [['katze', 'hund'], ['katze', 'katze']])
+        a = np.array(['child', None, float('nan')], dtype=object)
+        r = gv.pluralize(a)
+        self.assertEqual(r[0], 'children')
+        self.assertEqual(r[1], None)
+        self.assertTrue(r[2] != r[2])
+
+    @unittest.skipIf(pd is None, "pandas is not installed")
+    def test_series(self):
+        s = pd.Series(['jeu', 'chaise', None, 'jeu'], index=[3, 2, 1, 0], name="nouns")
+        r = gv.pluralize(s, lang="fr")
+        self.assertEqual(r[[3, 2, 0]].tolist(), ['jeux', 'chaises', 'jeux'])
+        self.assertTrue(r.isna()[1])
+        self.assertEqual(r.dtype, s.dtype)
+        self.assertEqual(r.index.tolist(), [3, 2, 1, 0])
+        self.assertEqual(r.name, "nouns")
+        self.assertEqual(gv.singularize(s.iloc[:0], lang="fr").tolist(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Inflection of NumPy arrays and pandas Series.
+# License: BSD (see LICENSE.txt for details).
+
+####################################################################################################
+# Columns of words in real data contain many duplicates.
+# Instead of calling pluralize() for each element (e.g., with Series.map()),
+# the values are factorized into unique values + an array of indices into them,
+# each unique value is inflected once, and the results are scattered back with take():
+#
+#   import pandas as pd
+#   from grammar import vectorized
+#   vectorized.singularize(pd.Series(["fietsen", "fietsen", None]), lang="nl") # ["fiets", "fiets", None]
+#
+# Values that are not strings (e.g., None, NaN) are returned unchanged.
+# NumPy and pandas are optional: lists (and other iterables) are returned as lists.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from .cache import many
+from .parallel import function, PLURALIZE, SINGULARIZE
+
+def factorize(values):
+    """ Returns a (codes, uniques)-tuple for the given 1-dimensional object array,
+        where values == uniques[codes], and missing values (None, NaN) have code -1.
+    """
+    if pd is not None:
+        return pd.factorize(values)
+    index = {}
+    codes = np.empty(len(values), dtype=np.intp)
+    for i, v in enumerate(values):
+        if v is None or v != v: # NaN
+            codes[i] = -1
+        else:
+            codes[i] = index.setdefault(v, len(index))
+    return codes, list(index)
+
+def inflect(values, lang="en", op=PLURALIZE, **kwargs):
+    """ Returns the plural or singular of each value in the given Series, array or list,
+        as a Series (with the same index and name), an array (with the same shape) or a list.
+    """
+    f = function(lang, op)
+    def inflect1(v):
+        return f(v, **kwargs) if isinstance(v, str) else v
+    if pd is not None and isinstance(values, pd.Series):
+        a = inflect(values.to_numpy(dtype=object), lang, op, **kwargs)
+        a = pd.Series(a, index=values.index, name=values.name)
+        if isinstance(values.dtype, pd.StringDtype):
+            a = a.astype(values.dtype)
+        return a
+    if np is not None and isinstance(values, np.ndarray):
+        a = values.astype(object).ravel()
+        codes, uniques = factorize(a)
+        # The result for code -1 is stored at the end of the array, but replaced below.
+        r = np.empty(len(uniques) + 1, dtype=object)
+        for i, v in enumerate(uniques):
+            r[i] = inflect1(v)
+        r = r.take(codes)
+        r[codes == -1] = a[codes == -1]
+        r = r.reshape(values.shape)
+        if values.dtype.kind == "U":
+            r = r.astype(str)
+        return r
+    return many(inflect1, values)
+
+def pluralize(values, lang="en", **kwargs):
+    """ Returns the plural of each value in the given Series, array or list (see inflect()).
+    """
+    return inflect(values, lang, PLURALIZE, **kwargs)
+
+def singularize(values, lang="en", **kwargs):
+    """ Returns the singular of each value in the given Series, array or list (see inflect()).
+    """
+    return inflect(values, lang, SINGULARIZE, **kwargs)